@@ -0,0 +1,6 @@
+-- Migration: Store the YouTube channel ID (UC...) on sources
+-- Needed to poll the per-channel Atom upload feed, which is keyed by channel ID, not handle
+
+ALTER TABLE sources ADD COLUMN IF NOT EXISTS youtube_channel_id VARCHAR(50);
+
+COMMENT ON COLUMN sources.youtube_channel_id IS 'YouTube channel ID (UC...), used for the uploads Atom feed';
@@ -0,0 +1,8 @@
+-- Migration: Alternative names for people
+-- Lets the scraper resolve name variants ("Dr. Jane Doe", "Jane D. Doe") to one person instead of creating duplicates
+
+ALTER TABLE people ADD COLUMN IF NOT EXISTS aliases TEXT[] DEFAULT '{}';
+
+CREATE INDEX IF NOT EXISTS idx_people_updated_at ON people(updated_at);
+
+COMMENT ON COLUMN people.aliases IS 'Alternative names this person has been extracted under';
@@ -0,0 +1,10 @@
+-- Migration: Transcript hash and length
+-- Long transcripts (100-200 KB) dominate the videos table and every select that includes them.
+-- The scraper records a content hash and length next to each transcript, so queue queries and
+-- change checks (summary provenance, 00025) don't need to select the transcript itself.
+
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS transcript_sha256 CHAR(64);
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS transcript_length INTEGER;
+
+COMMENT ON COLUMN videos.transcript_sha256 IS 'SHA-256 of the transcript text';
+COMMENT ON COLUMN videos.transcript_length IS 'Transcript length in characters';
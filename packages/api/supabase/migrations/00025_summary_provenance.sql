@@ -0,0 +1,45 @@
+-- Migration: Summary provenance
+-- Records what each summary was generated from (prompt version, model, transcript), so the scraper can
+-- refresh exactly the stale summaries after a prompt change or transcript upgrade instead of redoing all of them
+
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS summary_prompt_version VARCHAR(16);
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS summary_model VARCHAR(100);
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS summary_transcript_sha256 CHAR(64);
+
+-- Keep transcript_sha256/length current for every writer of transcripts (the trigger package too),
+-- not only the scraper; a cleared transcript clears both
+CREATE OR REPLACE FUNCTION set_transcript_hash()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.transcript IS NOT NULL THEN
+        NEW.transcript_sha256 = encode(sha256(convert_to(NEW.transcript, 'UTF8')), 'hex');
+        NEW.transcript_length = char_length(NEW.transcript);
+    ELSE
+        NEW.transcript_sha256 = NULL;
+        NEW.transcript_length = NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER set_videos_transcript_hash
+    BEFORE INSERT OR UPDATE OF transcript ON videos
+    FOR EACH ROW
+    EXECUTE FUNCTION set_transcript_hash();
+
+-- True when the transcript changed after the summary was generated (PostgREST can't compare two columns)
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS summary_transcript_changed BOOLEAN
+    GENERATED ALWAYS AS (
+        summary IS NOT NULL
+        AND summary_transcript_sha256 IS NOT NULL
+        AND summary_transcript_sha256 IS DISTINCT FROM transcript_sha256
+    ) STORED;
+
+-- Refresh planner: summarized videos, newest first
+CREATE INDEX IF NOT EXISTS idx_videos_summarized_published
+    ON videos(published_at DESC) WHERE summary IS NOT NULL;
+
+COMMENT ON COLUMN videos.summary_prompt_version IS 'Hash of the prompts the summary was generated with (scraper.summarize.prompt_version)';
+COMMENT ON COLUMN videos.summary_model IS 'Model that generated the summary, or manual for summaries saved by hand';
+COMMENT ON COLUMN videos.summary_transcript_sha256 IS 'transcript_sha256 of the transcript the summary was generated from';
+COMMENT ON COLUMN videos.summary_transcript_changed IS 'The transcript changed after the summary was generated';
@@ -0,0 +1,12 @@
+-- Migration: Partial summaries
+-- With streaming (summarize --stream) the scraper checkpoints a summary while it is being generated.
+-- The partial text lives in its own column: writing it to videos.summary would fire the new-summary
+-- notification (00006) with a half-written summary. The final write sets summary and clears the partial.
+
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS summary_partial TEXT;
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS summary_partial_key VARCHAR(16);
+ALTER TABLE videos ADD COLUMN IF NOT EXISTS summary_partial_updated_at TIMESTAMPTZ;
+
+COMMENT ON COLUMN videos.summary_partial IS 'Summary being generated (streamed so far), shown while summary is pending; NULL once it is written';
+COMMENT ON COLUMN videos.summary_partial_key IS 'Hash of the prompt version, model and transcript the partial summary was generated with (resumes only continue a matching partial)';
+COMMENT ON COLUMN videos.summary_partial_updated_at IS 'When summary_partial was last checkpointed';
@@ -14,7 +14,8 @@ Usage:
 
 import sys
 import json
-from src.scraper.db import get_client
+from src.scraper.db import get_client, get_video_transcript
+from src.scraper.summarize import MANUAL_MODEL
 
 
 def get_next_video():
@@ -22,8 +23,8 @@ def get_next_video():
     client = get_client()
     result = (
         client.table("videos")
-        .select("id, title, transcript")
-        .not_.is_("transcript", "null")
+        .select("id, title")
+        .eq("has_transcript", True)
         .is_("summary", "null")
         .limit(1)
         .execute()
@@ -33,7 +34,7 @@ def get_next_video():
         print("No more videos to summarize!")
         return None
 
-    video = result.data[0]
+    video = {**result.data[0], "transcript": get_video_transcript(result.data[0]["id"]) or ""}
     print(f"VIDEO_ID: {video['id']}")
     print(f"TITLE: {video['title']}")
     print(f"TRANSCRIPT_LENGTH: {len(video['transcript'])} chars")
@@ -48,7 +49,11 @@ def save_summary(video_id: str, summary: str):
     client = get_client()
     client.table("videos").update({
         "summary": summary,
-        "summary_generated_at": "now()"
+        "summary_generated_at": "now()",
+        # Written by hand: never replaced by summarize --refresh
+        "summary_model": MANUAL_MODEL,
+        "summary_prompt_version": None,
+        "summary_transcript_sha256": None,
     }).eq("id", video_id).execute()
     print(f"Saved summary for video {video_id} ({len(summary)} chars)")
 
@@ -58,13 +63,13 @@ def get_progress():
     client = get_client()
 
     # Count videos with transcripts
-    with_transcript = client.table("videos").select("id", count="exact").not_.is_("transcript", "null").execute()
+    with_transcript = client.table("videos").select("id", count="exact").eq("has_transcript", True).execute()
 
     # Count videos with summaries
     with_summary = client.table("videos").select("id", count="exact").not_.is_("summary", "null").execute()
 
     # Count remaining
-    remaining = client.table("videos").select("id", count="exact").not_.is_("transcript", "null").is_("summary", "null").execute()
+    remaining = client.table("videos").select("id", count="exact").eq("has_transcript", True).is_("summary", "null").execute()
 
     print(f"Videos with transcripts: {with_transcript.count}")
     print(f"Videos with summaries: {with_summary.count}")
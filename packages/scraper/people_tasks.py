@@ -23,6 +23,9 @@ Usage:
     # Save a guest to a video
     uv run python people_tasks.py save-guest <video_id> "Person Name" [--wikipedia-url URL] [--photo-url URL]
 
+    # Save several guests to a video at once (Wikipedia resolved automatically)
+    uv run python people_tasks.py save-guests <video_id> "Person One" "Person Two"
+
     # Save a host to a channel
     uv run python people_tasks.py save-host <source_id> "Person Name" [--wikipedia-url URL] [--photo-url URL]
 
@@ -37,78 +40,22 @@ Usage:
 """
 
 import sys
-import re
 import argparse
 from datetime import datetime, timezone
-from urllib.parse import quote
-
-import httpx
-from src.scraper.db import get_client
-
 
-def slugify(name: str) -> str:
-    """Convert name to URL-safe slug: 'John Doe' -> 'john-doe'."""
-    slug = name.lower().strip()
-    slug = re.sub(r"[^a-z0-9\s-]", "", slug)
-    slug = re.sub(r"[\s_]+", "-", slug)
-    slug = re.sub(r"-+", "-", slug)
-    return slug.strip("-")
+from src.scraper.db import get_client, link_people, mark_people_extracted, slugify_person, upsert_people
+from src.scraper.wikipedia import resolve_wikipedia_batch
 
 
 def search_wikipedia(name: str) -> tuple[str | None, str | None]:
-    """Search Wikipedia API for person's page URL and image.
+    """Look up a person's Wikipedia page URL and image.
+
+    Backed by the batched resolver and its local cache (see wikipedia.py).
 
     Returns:
         Tuple of (wikipedia_url, image_url)
     """
-    headers = {
-        "User-Agent": "DecompressScraper/1.0 (podcast-video-scraper; contact@example.com)"
-    }
-    wikipedia_url = None
-    image_url = None
-
-    try:
-        # First, search for the page
-        url = "https://en.wikipedia.org/w/api.php"
-        params = {
-            "action": "query",
-            "list": "search",
-            "srsearch": name,
-            "format": "json",
-            "srlimit": 1,
-        }
-        response = httpx.get(url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        results = response.json().get("query", {}).get("search", [])
-
-        if not results:
-            return None, None
-
-        title = results[0]["title"]
-        wikipedia_url = f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
-
-        # Now fetch the page image using pageimages API
-        image_params = {
-            "action": "query",
-            "titles": title,
-            "prop": "pageimages",
-            "pithumbsize": 500,  # Get a reasonable size thumbnail
-            "format": "json",
-        }
-        image_response = httpx.get(url, params=image_params, headers=headers, timeout=10)
-        image_response.raise_for_status()
-        pages = image_response.json().get("query", {}).get("pages", {})
-
-        # Get the first (and only) page result
-        for page_data in pages.values():
-            if "thumbnail" in page_data:
-                image_url = page_data["thumbnail"].get("source")
-                break
-
-    except Exception as e:
-        print(f"Wikipedia search failed for {name}: {e}")
-
-    return wikipedia_url, image_url
+    return resolve_wikipedia_batch([name], verbose=True).get(name.strip(), (None, None))
 
 
 def get_status():
@@ -285,194 +232,84 @@ def upsert_person(
     photo_url: str | None = None,
 ) -> dict:
     """Get or create person record."""
-    client = get_client()
-    slug = slugify(name)
-
-    # Try to find existing person by slug
-    result = client.table("people").select("*").eq("slug", slug).execute()
-
-    if result.data:
-        person = result.data[0]
-        # Update social_links if URLs provided and not already set
-        social_links = person.get("social_links") or {}
-        updates = {}
-
-        if wikipedia_url and not social_links.get("wikipedia"):
-            social_links["wikipedia"] = wikipedia_url
-            updates["social_links"] = social_links
-        if photo_url and not person.get("photo_url"):
-            updates["photo_url"] = photo_url
-
-        if updates:
-            updates["updated_at"] = datetime.now(timezone.utc).isoformat()
-            client.table("people").update(updates).eq("id", person["id"]).execute()
-            person["social_links"] = social_links
-            if "photo_url" in updates:
-                person["photo_url"] = photo_url
-        return person
-
-    # Create new person
-    social_links = {}
-    if wikipedia_url:
-        social_links["wikipedia"] = wikipedia_url
+    people = upsert_people([{"name": name, "wikipedia_url": wikipedia_url, "photo_url": photo_url}])
+    return people[slugify_person(name)]
 
-    new_person = {
-        "name": name,
-        "slug": slug,
-        "social_links": social_links,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
-    if photo_url:
-        new_person["photo_url"] = photo_url
 
-    result = client.table("people").insert(new_person).execute()
-    return result.data[0]
+def save_guests(video_id: str, guests: list[dict]) -> list[dict]:
+    """Save guests ({"name", "wikipedia_url", "photo_url"}) to a video in bulk."""
+    results = link_people([{**guest, "video_id": video_id, "role": "guest"} for guest in guests])
 
+    for guest, result in zip(guests, results):
+        if not result["person_id"]:
+            print(f"ERROR: Could not save guest '{guest['name']}'")
+            continue
+        if not result["linked"]:
+            print(f"Guest '{guest['name']}' already linked to video")
+            continue
+        print(f"SAVED: Guest '{guest['name']}' linked to video")
+        print(f"PERSON_ID: {result['person_id']}")
+        if guest.get("wikipedia_url"):
+            print(f"WIKIPEDIA: {guest['wikipedia_url']}")
+        if guest.get("photo_url"):
+            print(f"PHOTO: {guest['photo_url']}")
 
-def save_guest(video_id: str, name: str, wikipedia_url: str | None = None, photo_url: str | None = None):
-    """Save a guest to a video."""
-    client = get_client()
+    return results
 
-    # Get or create person
-    person = upsert_person(name, wikipedia_url, photo_url)
-    person_id = person["id"]
-
-    # Check if link already exists
-    existing = (
-        client.table("video_people")
-        .select("*")
-        .eq("video_id", video_id)
-        .eq("person_id", person_id)
-        .eq("role", "guest")
-        .execute()
-    )
 
-    if existing.data:
-        print(f"Guest '{name}' already linked to video")
-        return existing.data[0]
+def save_guest(video_id: str, name: str, wikipedia_url: str | None = None, photo_url: str | None = None):
+    """Save a guest to a video."""
+    return save_guests(video_id, [{"name": name, "wikipedia_url": wikipedia_url, "photo_url": photo_url}])[0]
 
-    # Get current max display_order for this video
-    max_order = (
-        client.table("video_people")
-        .select("display_order")
-        .eq("video_id", video_id)
-        .order("display_order", desc=True)
-        .limit(1)
-        .execute()
-    )
-    display_order = (max_order.data[0]["display_order"] + 1) if max_order.data else 0
-
-    # Create link
-    link = {
-        "video_id": video_id,
-        "person_id": person_id,
-        "role": "guest",
-        "display_order": display_order,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    }
-    result = client.table("video_people").insert(link).execute()
-
-    print(f"SAVED: Guest '{name}' linked to video")
-    print(f"PERSON_ID: {person_id}")
-    if wikipedia_url:
-        print(f"WIKIPEDIA: {wikipedia_url}")
-    if photo_url:
-        print(f"PHOTO: {photo_url}")
 
-    return result.data[0] if result.data else None
+def save_guests_cmd(video_id: str, names: list[str], lookup_wikipedia: bool = True):
+    """Save several guests to a video, resolving Wikipedia in one batch."""
+    wikipedia = resolve_wikipedia_batch(names) if lookup_wikipedia else {}
+    guests = []
+    for name in names:
+        wikipedia_url, photo_url = wikipedia.get(name.strip(), (None, None))
+        guests.append({"name": name.strip(), "wikipedia_url": wikipedia_url, "photo_url": photo_url})
+    return save_guests(video_id, guests)
 
 
 def save_host(source_id: str, name: str, wikipedia_url: str | None = None, photo_url: str | None = None, verified: bool = True):
     """Save a host to a channel."""
-    client = get_client()
+    result = link_people([{
+        "name": name,
+        "wikipedia_url": wikipedia_url,
+        "photo_url": photo_url,
+        "source_id": source_id,
+        "role": "host",
+        "is_primary": True,
+        "verified": verified,
+    }])[0]
 
-    # Get or create person
-    person = upsert_person(name, wikipedia_url, photo_url)
-    person_id = person["id"]
+    if not result["person_id"]:
+        print(f"ERROR: Could not save host '{name}'")
+        return result
 
-    # Check if link already exists
-    existing = (
-        client.table("source_people")
-        .select("*")
-        .eq("source_id", source_id)
-        .eq("person_id", person_id)
-        .eq("role", "host")
-        .execute()
-    )
-
-    if existing.data:
-        # Update verified status if needed
-        if verified and not existing.data[0].get("verified"):
-            client.table("source_people").update({"verified": True}).eq("id", existing.data[0]["id"]).execute()
+    if not result["linked"]:
+        if verified:
             print(f"Host '{name}' verified for channel")
         else:
             print(f"Host '{name}' already linked to channel")
-        return existing.data[0]
-
-    # Create link
-    link = {
-        "source_id": source_id,
-        "person_id": person_id,
-        "role": "host",
-        "is_primary": True,
-        "verified": verified,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    }
-    result = client.table("source_people").insert(link).execute()
+        return result
 
     print(f"SAVED: Host '{name}' linked to channel")
-    print(f"PERSON_ID: {person_id}")
+    print(f"PERSON_ID: {result['person_id']}")
     print(f"VERIFIED: {verified}")
     if wikipedia_url:
         print(f"WIKIPEDIA: {wikipedia_url}")
     if photo_url:
         print(f"PHOTO: {photo_url}")
 
-    return result.data[0] if result.data else None
+    return result
 
 
 def mark_processed(video_id: str):
     """Mark a video as processed (even if no guests found)."""
-    client = get_client()
-
-    # Also link verified hosts to this video
-    video = client.table("videos").select("source_id").eq("id", video_id).single().execute()
-    if video.data:
-        source_id = video.data["source_id"]
-
-        # Get verified hosts for this channel
-        hosts = (
-            client.table("source_people")
-            .select("person_id")
-            .eq("source_id", source_id)
-            .eq("role", "host")
-            .eq("verified", True)
-            .execute()
-        )
-
-        for i, host in enumerate(hosts.data or []):
-            # Check if already linked
-            existing = (
-                client.table("video_people")
-                .select("id")
-                .eq("video_id", video_id)
-                .eq("person_id", host["person_id"])
-                .execute()
-            )
-            if not existing.data:
-                client.table("video_people").insert({
-                    "video_id": video_id,
-                    "person_id": host["person_id"],
-                    "role": "host",
-                    "display_order": i,
-                    "created_at": datetime.now(timezone.utc).isoformat(),
-                }).execute()
-
-    # Mark video as processed
-    client.table("videos").update({
-        "people_extracted_at": datetime.now(timezone.utc).isoformat()
-    }).eq("id", video_id).execute()
+    # Also links the channel's verified hosts to this video
+    mark_people_extracted([video_id])
 
     print(f"Video {video_id} marked as processed")
 
@@ -582,6 +419,12 @@ def main():
     guest_parser.add_argument("--wikipedia-url", help="Wikipedia URL")
     guest_parser.add_argument("--photo-url", help="Photo URL")
 
+    # save-guests command
+    guests_parser = subparsers.add_parser("save-guests", help="Save several guests to a video at once")
+    guests_parser.add_argument("video_id", help="Video ID (UUID)")
+    guests_parser.add_argument("names", nargs="+", help="Guest names")
+    guests_parser.add_argument("--no-wikipedia", action="store_true", help="Skip Wikipedia lookups")
+
     # save-host command
     host_parser = subparsers.add_parser("save-host", help="Save a host to a channel")
     host_parser.add_argument("source_id", help="Source/Channel ID (UUID)")
@@ -617,6 +460,8 @@ def main():
         search_wikipedia_cmd(args.name)
     elif args.command == "save-guest":
         save_guest(args.video_id, args.name, args.wikipedia_url, args.photo_url)
+    elif args.command == "save-guests":
+        save_guests_cmd(args.video_id, args.names, lookup_wikipedia=not args.no_wikipedia)
     elif args.command == "save-host":
         save_host(args.source_id, args.name, args.wikipedia_url, args.photo_url, verified=not args.unverified)
     elif args.command == "mark-processed":
@@ -19,10 +19,15 @@ from .db import (
     upsert_videos_batch,
     get_videos_without_transcript,
     update_video_transcript,
+    get_video_transcript,
+    get_video_transcripts,
     get_or_create_tag,
     add_video_tags,
     create_scrape_log,
     complete_scrape_log,
+    upsert_people,
+    link_people,
+    mark_people_extracted,
 )
 
 from .extract_people import (
@@ -35,6 +40,9 @@ from .extract_people import (
     get_verified_hosts,
 )
 
+from .people_index import PersonIndex, get_person_index
+from .wikipedia import resolve_wikipedia_batch
+
 __all__ = [
     # Channel scraping
     "add_transcripts",
@@ -53,10 +61,15 @@ __all__ = [
     "upsert_videos_batch",
     "get_videos_without_transcript",
     "update_video_transcript",
+    "get_video_transcript",
+    "get_video_transcripts",
     "get_or_create_tag",
     "add_video_tags",
     "create_scrape_log",
     "complete_scrape_log",
+    "upsert_people",
+    "link_people",
+    "mark_people_extracted",
     # People extraction
     "extract_hosts_for_channel",
     "extract_guests_for_video",
@@ -65,4 +78,7 @@ __all__ = [
     "link_person_to_source",
     "link_person_to_video",
     "get_verified_hosts",
+    "resolve_wikipedia_batch",
+    "PersonIndex",
+    "get_person_index",
 ]
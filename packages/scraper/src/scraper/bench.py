@@ -0,0 +1,466 @@
+"""
+Offline benchmark of the scraper pipeline.
+
+Runs the real pipeline code (scrape_channel_to_db, fetch_transcript,
+upsert_videos_batch, extract_guests_for_video) against the local stand-ins in
+standins.py, with recorded fixtures instead of YouTube, Supadata, Wikipedia,
+the LLM APIs and Supabase. Service latency and error rates are injectable, so
+the effect of a change (or of a slow dependency) can be measured without
+network access or API keys.
+
+Each scenario reports throughput, latency percentiles per operation and per
+stage (metrics.py), and request counts per service endpoint. Results can be
+written as JSON and compared against a baseline, failing on regressions, for
+CI.
+
+Scenarios:
+    scrape      Fresh database, scrape one channel (listing, metadata, transcripts)
+    poll        Re-poll an already scraped channel (skip_existing + feed check)
+    transcript  fetch_transcript per video (Supadata)
+    upsert      upsert_videos_batch in batches
+    extract     extract_guests_for_video per video (heuristics, LLM, Wikipedia)
+
+Usage:
+    uv run python -m scraper.bench
+    uv run python -m scraper.bench --scenarios scrape,extract -n 50
+    uv run python -m scraper.bench --latency supadata=5 --error-rate openai=0.2
+    uv run python -m scraper.bench --scenarios scrape --cpu youtube=0.2 --metadata-executor process --metadata-workers 4
+    uv run python -m scraper.bench --output bench.json --baseline fixtures/bench_baseline.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from . import db, feed, llm_cache, summarize, templates, transcript, wikipedia
+from .circuit import reset_circuits
+from .db import get_or_create_source, upsert_videos_batch
+from .extraction import EXECUTORS, set_metadata_executor, shutdown_extraction
+from .extract_people import extract_guests_for_video
+from .llm_metrics import get_llm_calls
+from .metrics import Histogram, get_stage_stats, reset_metrics
+from .retry import reset_retries
+from .scrape_to_db import scrape_channel_to_db
+from .standins import (
+    DEFAULT_LATENCY,
+    DEFAULT_LABELS_PATH,
+    DEFAULT_VIDEOS_PATH,
+    SERVICES,
+    STANDIN_SECRET_KEY,
+    BenchFixtures,
+    Fault,
+    ReplayYoutubeDL,
+    StandinServer,
+    install_replay,
+)
+from .transcript import fetch_transcript
+
+SCENARIOS = ["scrape", "poll", "transcript", "upsert", "extract"]
+
+
+def _parse_service_values(items: list[str], flag: str) -> dict[str, float]:
+    """Parse repeated service=value flags."""
+    values = {}
+    for item in items:
+        service, _, value = item.partition("=")
+        if service not in SERVICES:
+            raise SystemExit(f"{flag}: unknown service {service!r} (one of {', '.join(SERVICES)})")
+        values[service] = float(value)
+    return values
+
+
+def configure(server: StandinServer, cache_dir: Path) -> None:
+    """Point every client and cache at the stand-ins and a throwaway cache dir."""
+    os.environ["SUPABASE_URL"] = server.service_url("postgrest")
+    os.environ["SUPABASE_SECRET_KEY"] = STANDIN_SECRET_KEY
+    os.environ["SUPADATA_API_KEY"] = "bench"
+    os.environ["OPENAI_API_KEY"] = "bench"
+    os.environ["OPENAI_BASE_URL"] = server.service_url("openai")
+    os.environ["ANTHROPIC_API_KEY"] = "bench"
+    os.environ["ANTHROPIC_BASE_URL"] = server.service_url("anthropic")
+
+    transcript.SUPADATA_API_URL = server.service_url("supadata")
+    wikipedia.API_URL = server.service_url("wikipedia")
+    feed.FEED_URL = server.service_url("youtube_feed")
+
+    # Clients and caches are created lazily from the settings above
+    db._client = None
+    summarize._openai_client = None
+    summarize._anthropic_client = None
+    for module in (wikipedia, templates, llm_cache, feed):
+        module.CACHE_DIR = cache_dir
+        module._db = None
+    feed._feed_cache.clear()
+    llm_cache.set_llm_cache_enabled(False)
+
+
+# =============================================================================
+# Scenarios
+# =============================================================================
+
+def _seed_videos(fixtures: BenchFixtures, n: int) -> tuple[str, list[dict]]:
+    """Create the fixture channel with n videos (not counted in the results)."""
+    source = get_or_create_source(
+        external_id=fixtures.channel_handle.lstrip("@"),
+        name=fixtures.channel_name,
+        handle=fixtures.channel_handle,
+        youtube_channel_id=fixtures.channel_id,
+    )
+    videos = [
+        {**v, "url": f"https://www.youtube.com/watch?v={v['id']}", "transcript": None}
+        for v in fixtures.videos[:n]
+    ]
+    rows = upsert_videos_batch(source["id"], videos)
+    return source["id"], rows
+
+
+def _scrape(fixtures: BenchFixtures, n: int, **kwargs: Any) -> dict:
+    return scrape_channel_to_db(
+        fixtures.channel_name,
+        fixtures.channel_handle,
+        video_limit=n,
+        verbose=False,
+        transcript_providers=["supadata"],
+        **kwargs,
+    )
+
+
+def scenario_scrape(fixtures: BenchFixtures, n: int, options: dict) -> list[Callable[[], Any]]:
+    return [lambda: _scrape(fixtures, n)]
+
+
+def scenario_poll(fixtures: BenchFixtures, n: int, options: dict) -> list[Callable[[], Any]]:
+    # Steady state, as in the daemon: the whole channel is stored, only the feed is new
+    _seed_videos(fixtures, len(fixtures.videos))
+    return [
+        lambda: _scrape(fixtures, n, skip_existing=True, use_feed=True, fetch_channel_metadata=False)
+        for _ in range(options["rounds"])
+    ]
+
+
+def _fetch_transcript(video_id: str) -> str:
+    result = fetch_transcript(video_id, providers=["supadata"])
+    if not result.content:
+        raise RuntimeError(result.error)
+    return result.content
+
+
+def scenario_transcript(fixtures: BenchFixtures, n: int, options: dict) -> list[Callable[[], Any]]:
+    return [(lambda video_id=v["id"]: _fetch_transcript(video_id)) for v in fixtures.videos[:n]]
+
+
+def scenario_upsert(fixtures: BenchFixtures, n: int, options: dict) -> list[Callable[[], Any]]:
+    source_id, _ = _seed_videos(fixtures, 0)
+    videos = [
+        {**v, "url": f"https://www.youtube.com/watch?v={v['id']}"}
+        for v in fixtures.videos[:n]
+    ]
+    size = options["batch_size"]
+    return [
+        (lambda batch=videos[i:i + size]: upsert_videos_batch(source_id, batch))
+        for i in range(0, len(videos), size)
+    ]
+
+
+def scenario_extract(fixtures: BenchFixtures, n: int, options: dict) -> list[Callable[[], Any]]:
+    _, rows = _seed_videos(fixtures, n)
+    return [
+        (lambda video_id=row["id"]: extract_guests_for_video(video_id, provider=options["provider"], verbose=False))
+        for row in rows
+    ]
+
+
+SCENARIO_SETUP = {
+    "scrape": scenario_scrape,
+    "poll": scenario_poll,
+    "transcript": scenario_transcript,
+    "upsert": scenario_upsert,
+    "extract": scenario_extract,
+}
+
+
+def run_scenario(
+    name: str,
+    server: StandinServer,
+    fixtures: BenchFixtures,
+    n: int,
+    options: dict,
+) -> dict[str, Any]:
+    """
+    Run one scenario on a fresh database.
+
+    Returns:
+        Dict with ops, errors, elapsed, throughput (ops/min), latency
+        percentiles, requests per endpoint, LLM calls and stage stats
+    """
+    server.db.reset()
+    reset_circuits()
+    reset_retries()
+    ops = SCENARIO_SETUP[name](fixtures, n, options)
+
+    # Setup traffic (seeding, the initial scrape for poll) is not measured
+    server.reset_counts()
+    ReplayYoutubeDL.counts = {}
+    reset_metrics()
+    llm_calls_before = len(get_llm_calls())
+
+    latency = Histogram()
+    errors = 0
+    start = time.perf_counter()
+    for op in ops:
+        op_start = time.perf_counter()
+        try:
+            op()
+        except Exception as e:
+            errors += 1
+            logging.getLogger(__name__).debug(f"{name} op failed: {e}")
+            continue
+        latency.observe(time.perf_counter() - op_start)
+    elapsed = time.perf_counter() - start
+
+    requests = dict(server.counts)
+    requests.update({f"youtube {kind}": count for kind, count in ReplayYoutubeDL.counts.items()})
+
+    return {
+        "ops": len(ops),
+        "errors": errors,
+        "elapsed": elapsed,
+        "throughput": len(ops) / elapsed * 60 if elapsed else 0.0,
+        "latency": {
+            "p50": latency.percentile(0.5),
+            "p95": latency.percentile(0.95),
+            "p99": latency.percentile(0.99),
+            "max": latency.max,
+        },
+        "requests": dict(sorted(requests.items())),
+        "llm_calls": len(get_llm_calls()) - llm_calls_before,
+        "stages": get_stage_stats(),
+    }
+
+
+# =============================================================================
+# Reporting
+# =============================================================================
+
+def format_scenario(name: str, result: dict) -> str:
+    lat = result["latency"]
+    lines = [
+        f"\n{name}: {result['ops']} ops in {result['elapsed']:.2f}s "
+        f"({result['throughput']:.1f} ops/min), {result['errors']} errors",
+        f"  latency p50 / p95 / p99 / max: "
+        f"{lat['p50']:.3f}s / {lat['p95']:.3f}s / {lat['p99']:.3f}s / {lat['max']:.3f}s",
+    ]
+    for row in result["stages"]:
+        label = row["stage"]
+        if row["labels"]:
+            label += " [" + ", ".join(f"{k}={v}" for k, v in sorted(row["labels"].items())) + "]"
+        lines.append(f"  {label}: {row['count']}, {row['p50']:.3f}s / {row['p95']:.3f}s / {row['max']:.3f}s")
+    lines.append("  requests: " + ", ".join(f"{k} {v}" for k, v in result["requests"].items()))
+    if result["llm_calls"]:
+        lines.append(f"  LLM calls: {result['llm_calls']}")
+    return "\n".join(lines)
+
+
+def compare_to_baseline(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Regressions of results against a baseline run.
+
+    A scenario regresses when p95 latency, failed operations or any endpoint's
+    request (or error) count grows, or throughput drops, by more than the
+    tolerance (a fraction).
+
+    Returns:
+        One message per regression
+    """
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+
+        p95, base_p95 = result["latency"]["p95"], base["latency"]["p95"]
+        if base_p95 and p95 > base_p95 * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base_p95:.3f}s -> {p95:.3f}s")
+
+        throughput, base_throughput = result["throughput"], base["throughput"]
+        if base_throughput and throughput < base_throughput * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base_throughput:.1f} -> {throughput:.1f} ops/min")
+
+        if result["errors"] > base["errors"] * (1 + tolerance):
+            regressions.append(f"{name}: errors {base['errors']} -> {result['errors']}")
+
+        for endpoint, count in result["requests"].items():
+            base_count = base["requests"].get(endpoint, 0)
+            if count > base_count * (1 + tolerance):
+                regressions.append(f"{name}: {endpoint} {base_count} -> {count}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper pipeline against local stand-ins")
+    parser.add_argument(
+        "--scenarios",
+        default=",".join(SCENARIOS),
+        help=f"Comma-separated scenarios to run (default: all of {','.join(SCENARIOS)})",
+    )
+    parser.add_argument("-n", type=int, default=20, help="Videos per scenario (default: 20)")
+    parser.add_argument("--rounds", type=int, default=5, help="Polls in the poll scenario (default: 5)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Videos per upsert batch (default: 50)")
+    parser.add_argument(
+        "--provider",
+        choices=["openai", "anthropic"],
+        default="openai",
+        help="LLM provider for the extract scenario (default: openai)",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=0.02,
+        help="Multiplier for the default service latencies (default: 0.02, 1 = production-like)",
+    )
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="SERVICE=SECONDS",
+        help=f"Override a service's latency before scaling (services: {', '.join(SERVICES)})",
+    )
+    parser.add_argument(
+        "--error-rate",
+        action="append",
+        default=[],
+        metavar="SERVICE=RATE",
+        help="Fail this fraction of a service's requests (e.g. supadata=0.1)",
+    )
+    parser.add_argument(
+        "--cpu",
+        action="append",
+        default=[],
+        metavar="SERVICE=SECONDS",
+        help="CPU time per yt-dlp call, not scaled (only youtube; e.g. youtube=0.2 to model parsing)",
+    )
+    parser.add_argument(
+        "--metadata-executor",
+        choices=EXECUTORS,
+        default="thread",
+        help="Where yt-dlp metadata extraction runs (default: thread)",
+    )
+    parser.add_argument(
+        "--metadata-workers",
+        type=int,
+        default=1,
+        help="Videos whose metadata is extracted at once (default: 1)",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for jitter and injected errors")
+    parser.add_argument("--videos", type=Path, default=DEFAULT_VIDEOS_PATH, help="Recorded channel fixture")
+    parser.add_argument("--labels", type=Path, default=DEFAULT_LABELS_PATH, help="Guest label fixture")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Compare against a previous --output; exit 1 on regressions")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed regression against the baseline as a fraction (default: 0.25)",
+    )
+    args = parser.parse_args()
+
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+
+    # The pipeline logs every injected failure; keep the report readable
+    logging.disable(logging.WARNING)
+
+    latencies = {**DEFAULT_LATENCY, **_parse_service_values(args.latency, "--latency")}
+    error_rates = _parse_service_values(args.error_rate, "--error-rate")
+    cpu = _parse_service_values(args.cpu, "--cpu")
+    faults = {
+        service: Fault(
+            latency=latencies[service] * args.time_scale,
+            jitter=latencies[service] * args.time_scale * 0.5,
+            error_rate=error_rates.get(service, 0.0),
+            cpu=cpu.get(service, 0.0),
+        )
+        for service in SERVICES
+    }
+
+    fixtures = BenchFixtures(args.videos, args.labels)
+    install_replay(fixtures, faults["youtube"])
+    # Worker processes need the yt-dlp stand-in too
+    set_metadata_executor(
+        args.metadata_executor,
+        args.metadata_workers,
+        initializer=install_replay,
+        initargs=(fixtures, faults["youtube"]),
+    )
+    options = {"rounds": args.rounds, "batch_size": args.batch_size, "provider": args.provider}
+
+    print(f"Benchmarking {', '.join(scenarios)} ({args.n} videos, time scale {args.time_scale})")
+
+    results: dict[str, Any] = {
+        "config": {
+            "n": args.n,
+            "time_scale": args.time_scale,
+            "latency": latencies,
+            "error_rate": error_rates,
+            "cpu": cpu,
+            "metadata_executor": args.metadata_executor,
+            "metadata_workers": args.metadata_workers,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+
+    with tempfile.TemporaryDirectory(prefix="scraper-bench-") as cache_dir:
+        with StandinServer(fixtures, faults, seed=args.seed) as server:
+            configure(server, Path(cache_dir))
+            for name in scenarios:
+                result = run_scenario(name, server, fixtures, args.n, options)
+                results["scenarios"][name] = result
+                print(format_scenario(name, result))
+    shutdown_extraction()
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    regressions = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("config") != results["config"]:
+            print("\nWarning: baseline was recorded with a different configuration")
+        regressions = compare_to_baseline(results, baseline, args.tolerance)
+
+    print(f"\n{'=' * 50}")
+    print("SUMMARY")
+    print(f"{'=' * 50}")
+    for name, result in results["scenarios"].items():
+        print(
+            f"{name}: {result['throughput']:.1f} ops/min, p95 {result['latency']['p95']:.3f}s, "
+            f"{sum(v for k, v in result['requests'].items() if not k.endswith(' errors'))} requests, {result['errors']} errors"
+        )
+    if args.output:
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        if regressions:
+            print(f"\nRegressions against {args.baseline} (tolerance {args.tolerance:.0%}):")
+            for message in regressions:
+                print(f"  {message}")
+        else:
+            print(f"No regressions against {args.baseline}")
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Live benchmark of the yt-dlp metadata profiles (full vs lite).
+
+Fetches the same videos from YouTube with each profile (see
+channel.METADATA_PROFILES), alternating the order per video so caching and
+network drift affect both alike, and reports:
+- wall-clock latency per video (p50 / p95 / max)
+- CPU time per video (extraction runs in this process, one video at a time)
+- field coverage: how many stored fields each profile filled, and the fields
+  where a profile disagreed with the first one
+
+Unlike scraper.bench (offline stand-ins), this needs network access to
+YouTube: the point is to measure yt-dlp itself.
+
+Usage:
+    uv run python -m scraper.bench_metadata @triggerpod -n 10
+    uv run python -m scraper.bench_metadata --videos AUOQ9Ub632I dQw4w9WgXcQ
+    uv run python -m scraper.bench_metadata @triggerpod --output metadata_profiles.json
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+from .channel import METADATA_PROFILES, VIDEO_METADATA_FIELDS, get_channel_video_ids, get_video_metadata
+from .extraction import set_metadata_executor
+from .metrics import Histogram
+
+
+def compare_profiles(video_ids: list[str], profiles: list[str], verbose: bool = True) -> dict[str, Any]:
+    """
+    Extract every video with every profile.
+
+    Args:
+        video_ids: YouTube video IDs
+        profiles: Profiles to compare; the first is the reference for
+                  field differences
+        verbose: Print per-video timings
+
+    Returns:
+        Dict with per-profile latency/CPU stats, fields filled, and
+        per-field difference counts against the reference profile
+    """
+    # One extraction at a time in this process, so process_time() is the extraction's CPU
+    set_metadata_executor("thread", 1)
+
+    wall = {p: Histogram() for p in profiles}
+    cpu = {p: 0.0 for p in profiles}
+    filled = {p: 0 for p in profiles}
+    differences: dict[str, dict[str, int]] = {p: {} for p in profiles[1:]}
+
+    for i, video_id in enumerate(video_ids):
+        results = {}
+        for profile in profiles if i % 2 == 0 else list(reversed(profiles)):
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            results[profile] = get_video_metadata(video_id, profile=profile)
+            elapsed = time.perf_counter() - wall_start
+            wall[profile].observe(elapsed)
+            cpu[profile] += time.process_time() - cpu_start
+
+        reference = results[profiles[0]]
+        for profile in profiles:
+            filled[profile] += sum(1 for field in VIDEO_METADATA_FIELDS if results[profile].get(field) is not None)
+            if profile == profiles[0]:
+                continue
+            for field in VIDEO_METADATA_FIELDS:
+                if results[profile].get(field) != reference.get(field):
+                    differences[profile][field] = differences[profile].get(field, 0) + 1
+
+        if verbose:
+            timings = ", ".join(f"{p} {wall[p].samples[-1]:.2f}s" for p in profiles)
+            print(f"  [{i + 1}/{len(video_ids)}] {video_id}: {timings}", flush=True)
+
+    return {
+        "videos": len(video_ids),
+        "fields": len(VIDEO_METADATA_FIELDS),
+        "profiles": {
+            p: {
+                "p50": wall[p].percentile(0.5),
+                "p95": wall[p].percentile(0.95),
+                "max": wall[p].max,
+                "cpu_per_video": cpu[p] / len(video_ids) if video_ids else 0.0,
+                "fields_filled": filled[p],
+            }
+            for p in profiles
+        },
+        "differences": differences,
+    }
+
+
+def format_comparison(result: dict[str, Any]) -> str:
+    """Table of the compare_profiles() result."""
+    possible = result["videos"] * result["fields"]
+    lines = [f"{'profile':<10} {'p50':>8} {'p95':>8} {'max':>8} {'cpu/video':>10} {'fields filled':>14}"]
+    for profile, stats in result["profiles"].items():
+        lines.append(
+            f"{profile:<10} {stats['p50']:>7.2f}s {stats['p95']:>7.2f}s {stats['max']:>7.2f}s "
+            f"{stats['cpu_per_video']:>9.2f}s {stats['fields_filled']:>7}/{possible}"
+        )
+    for profile, fields in result["differences"].items():
+        if fields:
+            diffs = ", ".join(f"{field} {n}/{result['videos']}" for field, n in sorted(fields.items()))
+            lines.append(f"{profile} differs in: {diffs}")
+        else:
+            lines.append(f"{profile}: all stored fields identical")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare yt-dlp metadata profiles on live YouTube videos")
+    parser.add_argument("channel", nargs="?", help="Channel handle or URL to take the latest videos from")
+    parser.add_argument("-n", type=int, default=10, help="Videos from the channel (default: 10)")
+    parser.add_argument("--videos", nargs="+", default=[], help="Video IDs (instead of a channel)")
+    parser.add_argument(
+        "--profiles",
+        default=",".join(METADATA_PROFILES),
+        help=f"Comma-separated profiles, the first being the reference (default: {','.join(METADATA_PROFILES)})",
+    )
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    profiles = [p.strip() for p in args.profiles.split(",") if p.strip()]
+    unknown = [p for p in profiles if p not in METADATA_PROFILES]
+    if unknown:
+        parser.error(f"unknown profiles: {', '.join(unknown)}")
+
+    video_ids = list(args.videos)
+    if args.channel:
+        channel_url = args.channel if args.channel.startswith("http") else f"https://www.youtube.com/{args.channel}"
+        _, videos = get_channel_video_ids(channel_url)
+        video_ids += [v["id"] for v in videos[:args.n] if v.get("id")]
+    if not video_ids:
+        parser.error("no videos: pass a channel or --videos")
+
+    print(f"Comparing {', '.join(profiles)} on {len(video_ids)} videos")
+    result = compare_profiles(video_ids, profiles)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2), encoding="utf-8")
+
+    print(f"\n{'=' * 50}")
+    print("SUMMARY")
+    print(f"{'=' * 50}")
+    print(format_comparison(result))
+    if args.output:
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
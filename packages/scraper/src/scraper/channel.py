@@ -2,23 +2,74 @@
 
 import json
 import logging
+import os
 import re
 from pathlib import Path
 from typing import Any
 
-import yt_dlp
+from dotenv import load_dotenv
 from youtube_transcript_api import YouTubeTranscriptApi
 
+from .circuit import CircuitOpenError, get_breaker
+from .extraction import run_extraction
+from .retry import THROTTLING_MESSAGES, RetryableError, call_with_retry
+
+load_dotenv()
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
 
-class _NullLogger:
-    """Suppress all yt-dlp logging output."""
-    def debug(self, msg): pass
-    def info(self, msg): pass
-    def warning(self, msg): pass
-    def error(self, msg): pass
+def _extract_info(
+    url: str,
+    ydl_opts: dict[str, Any],
+    fields: list[str] | None = None,
+    use_pool: bool = True,
+    process: bool = True,
+    raise_throttled: bool = False,
+) -> dict[str, Any] | None:
+    """
+    yt-dlp extract_info behind the shared "youtube" circuit breaker, retried
+    with backoff (retry.py) while YouTube is throttling us.
+
+    Runs on the configured executor (extraction.py); fields, use_pool and
+    process are passed through to run_extraction().
+
+    Returns None once throttling retries are used up, unless raise_throttled
+    is set: then the RetryableError is raised, marked as exhausted so an
+    enclosing call_with_retry() doesn't retry it again.
+
+    Raises:
+        CircuitOpenError: If YouTube is failing and the request was not made
+        RetryableError: With raise_throttled, if still throttled after retries
+    """
+    breaker = get_breaker("youtube")
+
+    def attempt() -> dict[str, Any] | None:
+        breaker.check()
+        try:
+            info, errors = run_extraction(url, ydl_opts, fields=fields, use_pool=use_pool, process=process)
+        except Exception:
+            # Report it, or a half-open breaker keeps its probe slot forever
+            breaker.record(success=False)
+            raise
+
+        throttled = [m for m in errors if THROTTLING_MESSAGES.search(m)]
+        breaker.record(success=not throttled)
+        if throttled:
+            # ignoreerrors turned the failure into None; raise so it is retried
+            raise RetryableError(throttled[-1], reason="throttled")
+        if info is None and errors:
+            logger.debug(f"yt-dlp errors for {url}: {errors[-1]}")
+        return info
+
+    try:
+        return call_with_retry(attempt, "youtube")
+    except RetryableError as e:
+        logger.warning(f"yt-dlp still throttled for {url}: {e}")
+        if raise_throttled:
+            raise
+        return None
 
 
 # Rich metadata fields we extract for each video
@@ -36,8 +87,33 @@ VIDEO_METADATA_FIELDS = [
     "categories",
     "url",
     "live_status",  # is_live, was_live, not_live, is_upcoming
+    "chapters",  # [{start_time, end_time, title}], stored in video_chapters
 ]
 
+# Metadata profiles for get_video_metadata():
+# - full: yt-dlp's complete extraction, as for a download
+# - lite: everything in VIDEO_METADATA_FIELDS, without the work that only
+#   matters for downloading: DASH/HLS manifests, the player JS (signature
+#   solving), per-client player configs, extra player clients and format
+#   sorting/selection (extract_info process=False). The web client's
+#   watch page carries all the stored fields.
+METADATA_PROFILES = ("full", "lite")
+
+LITE_OPTIONS: dict[str, Any] = {
+    "extractor_args": {
+        "youtube": {
+            "player_client": ["web"],
+            "player_skip": ["js", "configs"],
+            "skip": ["dash", "hls", "translated_subs"],
+        },
+    },
+    # Without the player JS most formats are missing; we don't need any
+    "ignore_no_formats_error": True,
+    "check_formats": False,
+}
+
+_metadata_profile = os.getenv("SCRAPER_METADATA_PROFILE", "full")
+
 
 def get_channel_video_ids(channel_url: str) -> tuple[str, list[dict[str, Any]]]:
     """
@@ -49,6 +125,10 @@ def get_channel_video_ids(channel_url: str) -> tuple[str, list[dict[str, Any]]]:
 
     Returns:
         Tuple of (channel_title, list of video dicts with basic info)
+
+    Raises:
+        CircuitOpenError: If YouTube is failing (see circuit.py); other errors
+                          are logged and give an empty result
     """
     ydl_opts = {
         "quiet": True,
@@ -63,31 +143,32 @@ def get_channel_video_ids(channel_url: str) -> tuple[str, list[dict[str, Any]]]:
     logger.info(f"Fetching video list from: {channel_url}")
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            result = ydl.extract_info(channel_url, download=False)
+        result = _extract_info(channel_url, ydl_opts, use_pool=False)
 
-            if result is None:
-                logger.error(f"yt-dlp returned None for channel: {channel_url}")
-                return "", []
+        if result is None:
+            logger.error(f"yt-dlp returned None for channel: {channel_url}")
+            return "", []
 
-            entries = result.get("entries", [])
-            channel_title = result.get("channel", result.get("uploader", "Unknown"))
+        entries = result.get("entries", [])
+        channel_title = result.get("channel", result.get("uploader", "Unknown"))
 
-            logger.info(f"Found {len(entries)} videos from: {channel_title}")
+        logger.info(f"Found {len(entries)} videos from: {channel_title}")
 
-            videos = []
-            for entry in entries:
-                if entry is None:
-                    continue
-                videos.append({
-                    "id": entry.get("id"),
-                    "title": entry.get("title"),
-                    "url": entry.get("url"),
-                    "duration": entry.get("duration"),
-                })
+        videos = []
+        for entry in entries:
+            if entry is None:
+                continue
+            videos.append({
+                "id": entry.get("id"),
+                "title": entry.get("title"),
+                "url": entry.get("url"),
+                "duration": entry.get("duration"),
+            })
 
-            return channel_title, videos
+        return channel_title, videos
 
+    except CircuitOpenError:
+        raise
     except Exception as e:
         logger.error(f"yt-dlp error fetching channel {channel_url}: {e}")
         return "", []
@@ -102,13 +183,16 @@ def get_channel_metadata(channel_url: str) -> dict[str, Any]:
 
     Returns:
         Channel metadata dict with name, description, subscriber_count, etc.
+
+    Raises:
+        CircuitOpenError: If YouTube is failing (see circuit.py); other errors
+                          are logged and give an empty result
     """
     ydl_opts = {
         "quiet": True,
         "no_warnings": True,
         "extract_flat": True,
         "ignoreerrors": True,
-        "logger": _NullLogger(),
     }
 
     # Use /about page which has more channel info
@@ -116,39 +200,65 @@ def get_channel_metadata(channel_url: str) -> dict[str, Any]:
         channel_url = channel_url.rstrip("/").replace("/videos", "") + "/about"
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            result = ydl.extract_info(channel_url, download=False)
+        result = _extract_info(channel_url, ydl_opts)
+
+        if result is None:
+            logger.warning(f"yt-dlp returned None for channel metadata: {channel_url}")
+            return {}
+
+        # Get the best thumbnail URL from the thumbnails list
+        thumbnails = result.get("thumbnails", [])
+        thumbnail_url = thumbnails[-1].get("url") if thumbnails else None
+
+        return {
+            "name": result.get("channel", result.get("uploader", "")),
+            "description": result.get("description", ""),
+            "subscriber_count": result.get("channel_follower_count"),
+            "channel_id": result.get("channel_id"),
+            "thumbnail_url": thumbnail_url,
+        }
+
+    except CircuitOpenError:
+        raise
+    except Exception as e:
+        logger.error(f"yt-dlp error fetching channel metadata {channel_url}: {e}")
+        return {}
 
-            if result is None:
-                logger.warning(f"yt-dlp returned None for channel metadata: {channel_url}")
-                return {}
 
-            # Get the best thumbnail URL from the thumbnails list
-            thumbnails = result.get("thumbnails", [])
-            thumbnail_url = thumbnails[-1].get("url") if thumbnails else None
+def set_metadata_profile(profile: str) -> None:
+    """
+    Set the default metadata profile for get_video_metadata().
 
-            return {
-                "name": result.get("channel", result.get("uploader", "")),
-                "description": result.get("description", ""),
-                "subscriber_count": result.get("channel_follower_count"),
-                "channel_id": result.get("channel_id"),
-                "thumbnail_url": thumbnail_url,
-            }
+    Raises:
+        ValueError: If profile is unknown
+    """
+    global _metadata_profile
 
-    except Exception as e:
-        logger.error(f"yt-dlp error fetching channel metadata {channel_url}: {e}")
-        return {}
+    if profile not in METADATA_PROFILES:
+        raise ValueError(f"Unknown metadata profile {profile!r} (one of {', '.join(METADATA_PROFILES)})")
+    _metadata_profile = profile
 
 
-def get_video_metadata(video_id: str) -> dict[str, Any]:
+def get_video_metadata(
+    video_id: str, profile: str | None = None, raise_throttled: bool = False
+) -> dict[str, Any]:
     """
     Get rich metadata for a single video.
 
     Args:
         video_id: YouTube video ID
+        profile: "full" or "lite" (default: set_metadata_profile(), else
+                 SCRAPER_METADATA_PROFILE, else full)
+        raise_throttled: Raise instead of returning an empty result when
+                         YouTube is still throttling after retries
 
     Returns:
         Video metadata dictionary
+
+    Raises:
+        CircuitOpenError: If YouTube is failing (see circuit.py); other errors
+                          are logged and give an empty result
+        RetryableError: With raise_throttled (see _extract_info)
     """
     ydl_opts = {
         "quiet": True,
@@ -157,23 +267,32 @@ def get_video_metadata(video_id: str) -> dict[str, Any]:
         "ignoreerrors": True,
         "extract_flat": False,
         "noprogress": True,
-        "logger": _NullLogger(),
     }
+    lite = (profile or _metadata_profile) == "lite"
+    if lite:
+        ydl_opts.update(LITE_OPTIONS)
 
     video_url = f"https://www.youtube.com/watch?v={video_id}"
 
     try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(video_url, download=False)
+        info = _extract_info(
+            video_url,
+            ydl_opts,
+            fields=VIDEO_METADATA_FIELDS + ["webpage_url"],
+            process=not lite,
+            raise_throttled=raise_throttled,
+        )
 
-            if info is None:
-                logger.warning(f"yt-dlp returned None for video: {video_id}")
-                return {"id": video_id}
+        if info is None:
+            logger.warning(f"yt-dlp returned None for video: {video_id}")
+            return {"id": video_id}
 
-            data = {field: info.get(field) for field in VIDEO_METADATA_FIELDS}
-            data["url"] = info.get("webpage_url")  # Normalize URL field
-            return data
+        data = {field: info.get(field) for field in VIDEO_METADATA_FIELDS}
+        data["url"] = info.get("webpage_url")  # Normalize URL field
+        return data
 
+    except (CircuitOpenError, RetryableError):
+        raise
     except Exception as e:
         logger.error(f"yt-dlp error fetching video metadata {video_id}: {e}")
         return {"id": video_id}
@@ -255,7 +374,12 @@ def fetch_channel_videos(
 
         for i, video in enumerate(videos[:limit]):
             print(f"  [{i + 1}/{limit}] {video.get('title', 'Unknown')[:50]}...", flush=True)
-            metadata = get_video_metadata(video["id"])
+            try:
+                metadata = get_video_metadata(video["id"])
+            except CircuitOpenError as e:
+                # Every remaining video would be refused too; rerun later to continue
+                print(f"  >> Stopping: {e}", flush=True)
+                break
             video.update(metadata)
 
             # Save progress every N videos
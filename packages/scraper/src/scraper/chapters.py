@@ -0,0 +1,205 @@
+"""
+Video chapters and chapter-based transcript chunking.
+
+yt-dlp returns a video's chapters (from the description timestamps or
+YouTube's chapter markers) as start/end times and titles.
+normalize_chapters() turns them into video_chapters rows, and
+chunk_transcript() cuts a transcript along them so summarization and
+retrieval can work chapter by chapter instead of on one monolithic text.
+
+Stored transcripts are plain text without timestamps, so a chapter's time
+range is mapped to a text range proportionally (speech runs at a roughly
+even rate) and the cut is moved to the nearest sentence end or space.
+Chapters too short to stand alone are merged into the next one, and long
+ones are split, so every chunk fits one LLM call. Videos without chapters
+are cut into evenly sized parts the same way.
+
+Usage:
+    rows = normalize_chapters(info["chapters"], info["duration"])
+    for chunk in chunk_transcript(transcript, rows, duration):
+        print(chunk["title"], chunk["start_seconds"], len(chunk["text"]))
+"""
+
+import re
+from typing import Any
+
+# Chunk size bounds in characters (~150 words per minute of speech,
+# ~4 characters per token): a max-size chunk is ~6k tokens, ~25 minutes
+MAX_CHUNK_CHARS = 24000
+MIN_CHUNK_CHARS = 2000
+
+# How far a cut may move to land on a sentence end
+SNAP_CHARS = 300
+
+# video_chapters.title is VARCHAR(255)
+MAX_TITLE_LENGTH = 255
+
+_SENTENCE_END = re.compile(r"[.!?]\s+")
+
+
+def normalize_chapters(chapters: list[dict[str, Any]] | None, duration: float | None = None) -> list[dict[str, Any]]:
+    """
+    Convert yt-dlp chapters to video_chapters rows (without video_id).
+
+    Missing end times are taken from the next chapter's start, and the last
+    chapter ends at the video's duration. Chapters starting at or after the
+    duration (stale description timestamps) are dropped, and end times are
+    capped at it.
+
+    Args:
+        chapters: yt-dlp "chapters" ({"start_time", "end_time", "title"})
+        duration: Video duration in seconds
+
+    Returns:
+        Rows with title, start_seconds, end_seconds and display_order,
+        ordered by start time
+    """
+    usable = sorted(
+        (
+            c for c in chapters or []
+            if c.get("start_time") is not None and (not duration or c["start_time"] < duration)
+        ),
+        key=lambda c: c["start_time"],
+    )
+
+    rows = []
+    for i, chapter in enumerate(usable):
+        end = chapter.get("end_time")
+        if not end:
+            end = usable[i + 1]["start_time"] if i + 1 < len(usable) else duration
+        if end is not None and duration:
+            end = min(end, duration)
+        title = (chapter.get("title") or "").strip() or f"Chapter {i + 1}"
+        rows.append({
+            "title": title[:MAX_TITLE_LENGTH],
+            "start_seconds": int(chapter["start_time"]),
+            "end_seconds": int(round(end)) if end is not None else None,
+            "display_order": i,
+        })
+    return rows
+
+
+def _snap(text: str, position: int) -> int:
+    """Move a cut to the nearest sentence end, else the nearest space."""
+    if position <= 0 or position >= len(text):
+        return max(0, min(position, len(text)))
+
+    lo, hi = max(0, position - SNAP_CHARS), min(len(text), position + SNAP_CHARS)
+    ends = [m.end() for m in _SENTENCE_END.finditer(text, lo, hi)]
+    if ends:
+        return min(ends, key=lambda e: abs(e - position))
+
+    before = text.rfind(" ", lo, position)
+    after = text.find(" ", position, hi)
+    candidates = [p + 1 for p in (before, after) if p != -1]
+    return min(candidates, key=lambda p: abs(p - position)) if candidates else position
+
+
+def _split(chunk: dict[str, Any], max_chars: int) -> list[dict[str, Any]]:
+    """Split an over-long chunk into near-equal parts, with proportional times."""
+    text = chunk["text"]
+    parts = -(-len(text) // max_chars)
+    if parts <= 1:
+        return [chunk]
+
+    start, end = chunk["start_seconds"], chunk["end_seconds"]
+    cuts = [0] + [_snap(text, len(text) * i // parts) for i in range(1, parts)] + [len(text)]
+    pieces = []
+    for i, (a, b) in enumerate(zip(cuts, cuts[1:])):
+        piece = {
+            "title": f"{chunk['title']} (part {i + 1})",
+            "start_seconds": start,
+            "end_seconds": end,
+            "text": text[a:b].strip(),
+        }
+        if start is not None and end is not None:
+            piece["start_seconds"] = start + (end - start) * a // len(text)
+            piece["end_seconds"] = start + (end - start) * b // len(text)
+        pieces.append(piece)
+    return [p for p in pieces if p["text"]]
+
+
+def chunk_transcript(
+    transcript: str,
+    chapters: list[dict[str, Any]] | None = None,
+    duration: float | None = None,
+    max_chars: int = MAX_CHUNK_CHARS,
+    min_chars: int = MIN_CHUNK_CHARS,
+) -> list[dict[str, Any]]:
+    """
+    Cut a transcript into chapter chunks.
+
+    Args:
+        transcript: Plain transcript text
+        chapters: video_chapters rows (see normalize_chapters); None or a
+                  single chapter gives evenly sized parts
+        duration: Video duration in seconds; needed to place chapters in the
+                  text (without it chapters are ignored)
+        max_chars: Longer chunks are split
+        min_chars: Shorter chapters are merged into the next one
+
+    Returns:
+        Chunks in order, each with title, start_seconds, end_seconds (None
+        when unknown) and text
+    """
+    transcript = transcript.strip()
+    if not transcript:
+        return []
+
+    rows = sorted(chapters or [], key=lambda c: c["start_seconds"])
+    if len(rows) < 2 or not duration:
+        whole = {"title": "Part", "start_seconds": 0 if duration else None,
+                 "end_seconds": int(duration) if duration else None, "text": transcript}
+        parts = _split(whole, max_chars)
+        if len(parts) == 1:
+            parts[0]["title"] = "Full transcript"
+        else:
+            for i, part in enumerate(parts):
+                part["title"] = f"Part {i + 1}"
+        return parts
+
+    # Chapter i covers [cut_i, cut_i+1); the first starts at the beginning
+    cuts = [0]
+    for row in rows[1:]:
+        position = _snap(transcript, int(len(transcript) * min(row["start_seconds"] / duration, 1.0)))
+        cuts.append(max(cuts[-1], position))
+    cuts.append(len(transcript))
+
+    chunks: list[dict[str, Any]] = []
+    pending: dict[str, Any] | None = None
+    for i, row in enumerate(rows):
+        end = row.get("end_seconds")
+        if end is None:
+            end = rows[i + 1]["start_seconds"] if i + 1 < len(rows) else int(duration)
+        chunk = {
+            "title": row["title"],
+            "start_seconds": row["start_seconds"],
+            "end_seconds": end,
+            "text": transcript[cuts[i]:cuts[i + 1]].strip(),
+        }
+        if pending is not None:
+            chunk = {
+                "title": f"{pending['title']} / {chunk['title']}",
+                "start_seconds": pending["start_seconds"],
+                "end_seconds": chunk["end_seconds"],
+                "text": f"{pending['text']} {chunk['text']}".strip(),
+            }
+            pending = None
+        if len(chunk["text"]) < min_chars:
+            pending = chunk
+            continue
+        chunks.append(chunk)
+
+    if pending is not None:
+        if chunks:
+            last = chunks[-1]
+            chunks[-1] = {
+                "title": f"{last['title']} / {pending['title']}",
+                "start_seconds": last["start_seconds"],
+                "end_seconds": pending["end_seconds"],
+                "text": f"{last['text']} {pending['text']}".strip(),
+            }
+        else:
+            chunks.append(pending)
+
+    return [piece for chunk in chunks for piece in _split(chunk, max_chars)]
@@ -0,0 +1,215 @@
+"""
+Circuit breakers for external providers (Supadata, YouTube via yt-dlp, ...).
+
+When a provider is down or throttling us, every request would otherwise
+wait out its full timeout before failing. A breaker per provider tracks the
+failure rate over a sliding window and, past a threshold, opens: calls are
+refused immediately so callers can fall back to another provider or defer
+the work. After a cooldown one probe request is let through (half-open); if it
+succeeds the circuit closes, otherwise it opens again with a longer cooldown.
+
+Only provider-health failures count (timeouts, connection errors, HTTP 429 and
+5xx); "this video has no transcript" is an answer, not a failure.
+
+Usage:
+    breaker = get_breaker("supadata")
+    if breaker.allow():
+        ok = do_request()
+        breaker.record(success=ok)
+    else:
+        ...  # fall back or defer
+
+    breaker.check()  # or raise CircuitOpenError
+"""
+
+import os
+import threading
+import time
+from collections import deque
+
+from dotenv import load_dotenv
+
+from .metrics import count, set_gauge
+
+load_dotenv()
+
+# Open when at least this share of the calls in the window failed...
+FAILURE_RATE = 0.5
+# ...and the window holds at least this many calls
+MIN_CALLS = 5
+
+# The window: the last WINDOW_CALLS calls, no older than WINDOW_SECONDS
+WINDOW_CALLS = 20
+WINDOW_SECONDS = 300.0
+
+# First cooldown before a probe; doubled after each failed probe up to MAX_COOLDOWN
+COOLDOWN = float(os.getenv("SCRAPER_CIRCUIT_COOLDOWN", "60"))
+MAX_COOLDOWN = 15 * 60.0
+
+_enabled = os.getenv("SCRAPER_CIRCUITS", "1") != "0"
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised when a provider's circuit is open and the call was not made."""
+
+    def __init__(self, provider: str, retry_in: float):
+        super().__init__(f"{provider} circuit open (retry in {retry_in:.0f}s)")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """Closed / open / half-open breaker over a sliding failure-rate window."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate: float = FAILURE_RATE,
+        min_calls: int = MIN_CALLS,
+        window_calls: int = WINDOW_CALLS,
+        window_seconds: float = WINDOW_SECONDS,
+        cooldown: float = COOLDOWN,
+        max_cooldown: float = MAX_COOLDOWN,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+
+        self.state = CLOSED
+        self.cooldown = cooldown
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.skipped = 0
+        self._probe_in_flight = False
+        self._outcomes: deque[tuple[float, bool]] = deque(maxlen=window_calls)
+        self._lock = threading.Lock()
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        count("circuit_transitions", provider=self.name, state=state)
+        set_gauge("circuit_open", 1 if state != CLOSED else 0, provider=self.name)
+
+    def _open(self, now: float) -> None:
+        self.opened_at = now
+        self.times_opened += 1
+        self._probe_in_flight = False
+        self._set_state(OPEN)
+
+    def retry_in(self) -> float:
+        """Seconds until the next probe is allowed (0 when closed)."""
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Whether a call may be made now.
+
+        In half-open state only one probe is allowed at a time; callers that
+        get True must report the outcome with record().
+        """
+        if not _enabled:
+            return True
+
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+
+            if self.state == OPEN and time.monotonic() >= self.opened_at + self.cooldown:
+                self._set_state(HALF_OPEN)
+
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+
+            self.skipped += 1
+            count("circuit_skips", provider=self.name)
+            return False
+
+    def check(self) -> None:
+        """
+        Like allow(), but raises instead of returning False.
+
+        Raises:
+            CircuitOpenError: If the call should not be made
+        """
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+
+    def record(self, success: bool) -> None:
+        """Report the outcome of a call that allow() let through."""
+        if not _enabled:
+            return
+
+        now = time.monotonic()
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if success:
+                    self.cooldown = self.base_cooldown
+                    self._outcomes.clear()
+                    self._probe_in_flight = False
+                    self._set_state(CLOSED)
+                else:
+                    self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                    self._open(now)
+                return
+
+            if self.state == OPEN:
+                # A call that started before the circuit opened; nothing to decide
+                return
+
+            self._outcomes.append((now, not success))
+            while self._outcomes and self._outcomes[0][0] < now - self.window_seconds:
+                self._outcomes.popleft()
+
+            failures = sum(1 for _, failed in self._outcomes if failed)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                self._open(now)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """The shared breaker for a provider (created on first use)."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def set_circuits_enabled(enabled: bool) -> None:
+    """Turn circuit breaking on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+def reset_circuits() -> None:
+    """Forget all breakers (closed, empty windows), e.g. between benchmark rounds."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def format_circuit_stats() -> str | None:
+    """Breakers that opened or refused calls, for SUMMARY blocks, or None if all stayed closed."""
+    with _breakers_lock:
+        breakers = [b for b in _breakers.values() if b.times_opened or b.skipped]
+    if not breakers:
+        return None
+
+    lines = ["Circuit breakers:"]
+    for b in sorted(breakers, key=lambda b: b.name):
+        line = f"  {b.name}: {b.state}, opened {b.times_opened}x, {b.skipped} calls skipped"
+        if b.state != CLOSED:
+            line += f", next probe in {b.retry_in():.0f}s"
+        lines.append(line)
+    return "\n".join(lines)
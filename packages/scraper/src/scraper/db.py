@@ -1,22 +1,42 @@
 """
 Supabase database client for the scraper.
 
-Uses the secret key to bypass RLS for write operations.
+Uses the secret key to bypass RLS for write operations. Idempotent operations
+retry transient PostgREST errors (timeouts, 5xx, deadlocks) via retry.py.
 """
 
+import hashlib
 import os
+import re
 from datetime import datetime, timezone
 from typing import Any
 
 from dotenv import load_dotenv
+from postgrest.exceptions import APIError
 from supabase import create_client, Client
 
+from .chapters import normalize_chapters
+from .retry import call_with_retry, retrying
+
 # Load environment variables
 load_dotenv()
 
+# Postgres error code for duplicate keys
+UNIQUE_VIOLATION = "23505"
+
+# PostgREST's max-rows: longer results come back truncated, so bulk reads page
+PAGE_SIZE = 1000
+
 _client: Client | None = None
 
 
+def _unique_violation(error: BaseException) -> str | None:
+    """retry_if for get-or-create: a concurrent insert won the race, so look again."""
+    if isinstance(error, APIError) and error.code == UNIQUE_VIOLATION:
+        return "conflict"
+    return None
+
+
 def get_client() -> Client:
     """Get or create the Supabase client."""
     global _client
@@ -40,6 +60,7 @@ def get_client() -> Client:
 # =============================================================================
 
 
+@retrying("db")
 def get_or_create_source(
     external_id: str,
     name: str,
@@ -98,6 +119,7 @@ def get_or_create_source(
     return result.data[0]
 
 
+@retrying("db")
 def update_source_scraped_at(source_id: str) -> None:
     """Update the last_scraped_at timestamp for a source."""
     client = get_client()
@@ -111,6 +133,7 @@ def update_source_scraped_at(source_id: str) -> None:
 # =============================================================================
 
 
+@retrying("db")
 def upsert_video(source_id: str, video_data: dict) -> dict:
     """
     Insert or update a video.
@@ -162,8 +185,7 @@ def upsert_video(source_id: str, video_data: dict) -> dict:
 
     # Handle transcript if present
     if video_data.get("transcript"):
-        db_video["transcript"] = video_data["transcript"]
-        db_video["has_transcript"] = True
+        db_video.update(_transcript_columns(video_data["transcript"]))
         db_video["transcript_scraped_at"] = datetime.now(timezone.utc).isoformat()
 
     # Upsert based on source_id + external_id
@@ -173,9 +195,13 @@ def upsert_video(source_id: str, video_data: dict) -> dict:
         .execute()
     )
 
+    if video_data.get("chapters") is not None:
+        _replace_chapters({result.data[0]["id"]: normalize_chapters(video_data["chapters"], duration)})
+
     return result.data[0]
 
 
+@retrying("db")
 def upsert_videos_batch(
     source_id: str,
     videos: list[dict],
@@ -242,8 +268,7 @@ def upsert_videos_batch(
 
         # Handle transcript if present
         if video_data.get("transcript"):
-            db_video["transcript"] = video_data["transcript"]
-            db_video["has_transcript"] = True
+            db_video.update(_transcript_columns(video_data["transcript"]))
             db_video["transcript_scraped_at"] = now
             if video_data.get("transcript_language") is not None:
                 db_video["transcript_language"] = video_data["transcript_language"]
@@ -256,9 +281,19 @@ def upsert_videos_batch(
         .execute()
     )
 
+    ids = {row["external_id"]: row["id"] for row in result.data}
+
+    # Chapters come with rich metadata; videos without that keep theirs
+    _replace_chapters({
+        ids[video_data["id"]]: normalize_chapters(video_data["chapters"], video_data.get("duration"))
+        for video_data in videos
+        if video_data.get("chapters") is not None
+    })
+
     return result.data
 
 
+@retrying("db")
 def get_videos_without_transcript(source_id: str, limit: int = 100) -> list[dict]:
     """Get videos that don't have transcripts yet."""
     client = get_client()
@@ -275,10 +310,54 @@ def get_videos_without_transcript(source_id: str, limit: int = 100) -> list[dict
     return result.data
 
 
+@retrying("db")
+def get_existing_external_ids(source_id: str) -> set[str]:
+    """Get the YouTube IDs of all videos already stored for a source."""
+    client = get_client()
+    ids: set[str] = set()
+    start = 0
+
+    while True:
+        result = (
+            client.table("videos")
+            .select("external_id")
+            .eq("source_id", source_id)
+            .order("id")
+            .range(start, start + PAGE_SIZE - 1)
+            .execute()
+        )
+        ids.update(v["external_id"] for v in result.data)
+        if len(result.data) < PAGE_SIZE:
+            return ids
+        start += PAGE_SIZE
+
+
+@retrying("db")
+def get_recent_published_at(source_id: str, limit: int = 20) -> list[str]:
+    """Get published_at timestamps of a source's most recent videos (newest first)."""
+    client = get_client()
+
+    result = (
+        client.table("videos")
+        .select("published_at")
+        .eq("source_id", source_id)
+        .not_.is_("published_at", "null")
+        .order("published_at", desc=True)
+        .limit(limit)
+        .execute()
+    )
+
+    return [v["published_at"] for v in result.data]
+
+
+@retrying("db")
 def video_has_transcript(external_id: str) -> bool:
     """
     Check if a video already has a transcript in the database.
 
+    Only the flag and length are checked, so the transcript itself is never
+    transferred.
+
     Args:
         external_id: YouTube video ID
 
@@ -289,41 +368,189 @@ def video_has_transcript(external_id: str) -> bool:
 
     result = (
         client.table("videos")
-        .select("transcript")
+        .select("id")
         .eq("external_id", external_id)
         .eq("has_transcript", True)
-        .not_.is_("transcript", "null")
+        # Rows written before transcript_length existed only have the text
+        .or_("transcript_length.gt.0,transcript.neq.")
         .limit(1)
         .execute()
     )
 
-    # Also verify transcript is not empty
-    if result.data and result.data[0].get("transcript"):
-        return len(result.data[0]["transcript"]) > 0
-    return False
+    return bool(result.data)
 
 
+@retrying("db")
 def update_video_transcript(video_id: str, transcript: str, language: str = "en") -> None:
     """Update the transcript for a video."""
     client = get_client()
 
     client.table("videos").update(
         {
-            "transcript": transcript,
+            **_transcript_columns(transcript),
             "transcript_language": language,
-            "has_transcript": True,
             "transcript_scraped_at": datetime.now(timezone.utc).isoformat(),
         }
     ).eq("id", video_id).execute()
 
 
+# =============================================================================
+# TRANSCRIPT OPERATIONS
+# =============================================================================
+
+# Writers above keep transcript_sha256 and transcript_length next to the
+# text, so queue queries and change checks never need to select the
+# transcript itself; readers that need the text go through
+# get_video_transcripts().
+
+# Video IDs per request when loading transcripts or chapters (keeps the in.() filter URL short)
+FETCH_CHUNK = 50
+
+
+def transcript_hash(text: str) -> str:
+    """SHA-256 hex of a transcript (videos.transcript_sha256)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _transcript_columns(transcript: str) -> dict:
+    """videos columns for a new transcript."""
+    return {
+        "transcript": transcript,
+        "has_transcript": True,
+        "transcript_sha256": transcript_hash(transcript),
+        "transcript_length": len(transcript),
+    }
+
+
+@retrying("db")
+def get_video_transcripts(video_ids: list[str]) -> dict[str, str]:
+    """
+    Load transcripts for a batch of videos, FETCH_CHUNK per request.
+
+    Args:
+        video_ids: Video UUIDs
+
+    Returns:
+        Dict of video UUID -> transcript text, for videos that have one
+    """
+    client = get_client()
+    transcripts: dict[str, str] = {}
+
+    for i in range(0, len(video_ids), FETCH_CHUNK):
+        chunk = video_ids[i:i + FETCH_CHUNK]
+        videos = (
+            client.table("videos")
+            .select("id, transcript")
+            .in_("id", chunk)
+            .eq("has_transcript", True)
+            .execute()
+        ).data
+        for video in videos:
+            if video.get("transcript"):
+                transcripts[video["id"]] = video["transcript"]
+
+    return transcripts
+
+
+def get_video_transcript(video_id: str) -> str | None:
+    """Load one video's transcript (see get_video_transcripts), or None if it has none."""
+    return get_video_transcripts([video_id]).get(video_id)
+
+
+# =============================================================================
+# CHAPTER OPERATIONS
+# =============================================================================
+
+
+def _replace_chapters(chapters_by_video: dict[str, list[dict]]) -> None:
+    """
+    Replace the video_chapters rows of these videos.
+
+    The new rows are inserted before the old ones are deleted by id, so a
+    failed request leaves a video with its old chapters (or both sets for a
+    moment), never with none.
+    """
+    if not chapters_by_video:
+        return
+    client = get_client()
+
+    video_ids = list(chapters_by_video)
+    old_ids = [
+        row["id"]
+        for i in range(0, len(video_ids), FETCH_CHUNK)
+        for row in client.table("video_chapters")
+        .select("id")
+        .in_("video_id", video_ids[i:i + FETCH_CHUNK])
+        .execute()
+        .data
+    ]
+
+    rows = [
+        {**chapter, "video_id": video_id}
+        for video_id, chapters in chapters_by_video.items()
+        for chapter in chapters
+    ]
+    if rows:
+        client.table("video_chapters").insert(rows).execute()
+
+    for i in range(0, len(old_ids), FETCH_CHUNK):
+        client.table("video_chapters").delete().in_("id", old_ids[i:i + FETCH_CHUNK]).execute()
+
+
+@retrying("db")
+def replace_video_chapters(chapters_by_video: dict[str, list[dict]]) -> None:
+    """
+    Store chapters for a batch of videos, replacing any they had.
+
+    Args:
+        chapters_by_video: Video UUID -> rows from normalize_chapters(); an
+                           empty list deletes the video's chapters
+    """
+    _replace_chapters(chapters_by_video)
+
+
+@retrying("db")
+def get_video_chapters(video_ids: list[str]) -> dict[str, list[dict]]:
+    """
+    Load chapters for a batch of videos.
+
+    Args:
+        video_ids: Video UUIDs
+
+    Returns:
+        Dict of video UUID -> chapter rows in display order (videos
+        without chapters are absent)
+    """
+    client = get_client()
+    chapters: dict[str, list[dict]] = {}
+
+    for i in range(0, len(video_ids), FETCH_CHUNK):
+        result = (
+            client.table("video_chapters")
+            .select("video_id, title, start_seconds, end_seconds, display_order")
+            .in_("video_id", video_ids[i:i + FETCH_CHUNK])
+            .order("display_order")
+            .execute()
+        )
+        for row in result.data:
+            chapters.setdefault(row["video_id"], []).append(row)
+
+    return chapters
+
+
 # =============================================================================
 # TAG OPERATIONS
 # =============================================================================
 
 
+@retrying("db", retry_if=_unique_violation)
 def get_or_create_tag(name: str, tag_type: str = "general") -> dict:
-    """Get an existing tag or create a new one."""
+    """
+    Get an existing tag or create a new one.
+
+    A concurrent insert of the same tag fails with a unique violation; the
+    retry then finds that tag.
+    """
     client = get_client()
     slug = _slugify(name)
 
@@ -352,12 +579,15 @@ def add_video_tags(video_id: str, tag_names: list[str], source: str = "youtube")
 
         # Insert ignore duplicates
         try:
-            client.table("video_tags").insert(
-                {"video_id": video_id, "tag_id": tag["id"], "source": source}
-            ).execute()
-        except Exception:
-            # Ignore duplicate key errors
-            pass
+            call_with_retry(
+                lambda: client.table("video_tags").insert(
+                    {"video_id": video_id, "tag_id": tag["id"], "source": source}
+                ).execute(),
+                "db",
+            )
+        except APIError as e:
+            if e.code != UNIQUE_VIOLATION:
+                raise
 
 
 # =============================================================================
@@ -366,7 +596,7 @@ def add_video_tags(video_id: str, tag_names: list[str], source: str = "youtube")
 
 
 def create_scrape_log(source_id: str) -> dict:
-    """Create a new scrape log entry."""
+    """Create a new scrape log entry (not retried: a lost response would leave a duplicate row)."""
     client = get_client()
 
     result = (
@@ -384,6 +614,7 @@ def create_scrape_log(source_id: str) -> dict:
     return result.data[0]
 
 
+@retrying("db")
 def complete_scrape_log(
     log_id: str,
     status: str = "completed",
@@ -409,6 +640,343 @@ def complete_scrape_log(
     ).eq("id", log_id).execute()
 
 
+# =============================================================================
+# PEOPLE OPERATIONS
+# =============================================================================
+
+
+def slugify_person(name: str) -> str:
+    """Convert a person's name to the people.slug form: 'John Doe' -> 'john-doe'."""
+    slug = name.lower().strip()
+    slug = re.sub(r"[^a-z0-9\s-]", "", slug)
+    slug = re.sub(r"[\s_]+", "-", slug)
+    slug = re.sub(r"-+", "-", slug)
+    return slug.strip("-")
+
+
+@retrying("db")
+def _fill_person_row(current: dict, details: dict, now: str) -> dict | None:
+    """
+    people row that fills in the links and photo a person is missing.
+
+    Args:
+        current: Person record (name, slug, social_links, photo_url)
+        details: Dict with optional wikipedia_url, website_url, photo_url
+
+    Returns:
+        The row to upsert, or None if nothing is missing
+    """
+    social_links = dict(current.get("social_links") or {})
+    changed = False
+
+    if details.get("wikipedia_url") and not social_links.get("wikipedia"):
+        social_links["wikipedia"] = details["wikipedia_url"]
+        changed = True
+    if details.get("website_url") and not social_links.get("website"):
+        social_links["website"] = details["website_url"]
+        changed = True
+
+    photo_url = current.get("photo_url")
+    if details.get("photo_url") and not photo_url:
+        photo_url = details["photo_url"]
+        changed = True
+
+    if not changed:
+        return None
+    # Same keys on every row so PostgREST can upsert them in one statement
+    return {
+        "name": current["name"],
+        "slug": current["slug"],
+        "social_links": social_links,
+        "photo_url": photo_url,
+        "updated_at": now,
+    }
+
+
+def upsert_people(people: list[dict], known: dict[str, dict] | None = None) -> dict[str, dict]:
+    """
+    Get or create many person records in at most two requests.
+
+    Existing people keep their name; wikipedia/website links and photo_url
+    are only filled in when not already set.
+
+    Args:
+        people: Dicts with name and optional wikipedia_url, website_url, photo_url
+                (duplicates by slug are merged, first value wins)
+        known: Person records already in memory, by slug (e.g. from the
+               PersonIndex); these slugs are not looked up again
+
+    Returns:
+        Dict mapping slug to the person record
+    """
+    client = get_client()
+
+    wanted: dict[str, dict] = {}
+    for person in people:
+        slug = slugify_person(person["name"])
+        if not slug:
+            continue
+        merged = wanted.setdefault(slug, {"name": person["name"]})
+        for key in ("wikipedia_url", "website_url", "photo_url"):
+            if person.get(key) and not merged.get(key):
+                merged[key] = person[key]
+
+    if not wanted:
+        return {}
+
+    known = known or {}
+    existing = {slug: known[slug] for slug in wanted if slug in known}
+    missing = [slug for slug in wanted if slug not in existing]
+    if missing:
+        for row in client.table("people").select("*").in_("slug", missing).execute().data or []:
+            existing[row["slug"]] = row
+
+    now = datetime.now(timezone.utc).isoformat()
+    rows = []
+    for slug, person in wanted.items():
+        current = existing.get(slug)
+        row = _fill_person_row(current or {"name": person["name"], "slug": slug}, person, now)
+        if row or current is None:
+            rows.append(row or {
+                "name": person["name"],
+                "slug": slug,
+                "social_links": {},
+                "photo_url": None,
+                "updated_at": now,
+            })
+
+    result = {slug: existing[slug] for slug in wanted if slug in existing}
+    if rows:
+        upserted = client.table("people").upsert(rows, on_conflict="slug").execute()
+        for row in upserted.data or []:
+            result[row["slug"]] = row
+
+    return result
+
+
+@retrying("db")
+def link_people(links: list[dict], known: dict[str, dict] | None = None) -> list[dict]:
+    """
+    Upsert people and link them to videos and/or sources in bulk.
+
+    Each link dict has either a name (with optional wikipedia_url,
+    website_url, photo_url) or an existing person_id, a role, and a video_id
+    or source_id. Optional keys: display_order (video links; defaults to
+    after the video's current people), is_primary, verified and
+    ai_confidence (source links).
+
+    Existing links are left untouched, except that verified=True marks an
+    existing source link as verified.
+
+    Args:
+        links: Link dicts as above
+        known: Person records already in memory, by slug (see upsert_people)
+
+    Returns:
+        One dict per input link with person (record or None when only
+        person_id was given), person_id and linked (True if a new link row
+        was created)
+    """
+    client = get_client()
+    now = datetime.now(timezone.utc).isoformat()
+
+    people = upsert_people([link for link in links if not link.get("person_id")], known=known)
+
+    person_ids = []
+    for link in links:
+        if link.get("person_id"):
+            person_ids.append(link["person_id"])
+        else:
+            person = people.get(slugify_person(link["name"]))
+            person_ids.append(person["id"] if person else None)
+
+    # Next free display_order per video, for links that don't specify one
+    next_order: dict[str, int] = {}
+    unordered_videos = list(dict.fromkeys(
+        link["video_id"] for link in links
+        if link.get("video_id") and link.get("display_order") is None
+    ))
+    if unordered_videos:
+        current = (
+            client.table("video_people")
+            .select("video_id, display_order")
+            .in_("video_id", unordered_videos)
+            .execute()
+        )
+        for row in current.data or []:
+            order = (row.get("display_order") or 0) + 1
+            next_order[row["video_id"]] = max(next_order.get(row["video_id"], 0), order)
+
+    video_rows: dict[tuple[str, str, str], dict] = {}
+    source_rows: dict[tuple[str, str, str], dict] = {}
+    verify: dict[tuple[str, str], set[str]] = {}
+
+    for link, person_id in zip(links, person_ids):
+        if not person_id:
+            continue
+
+        if link.get("video_id"):
+            key = (link["video_id"], person_id, link["role"])
+            if key not in video_rows:
+                display_order = link.get("display_order")
+                if display_order is None:
+                    display_order = next_order.get(link["video_id"], 0)
+                    next_order[link["video_id"]] = display_order + 1
+                video_rows[key] = {
+                    "video_id": link["video_id"],
+                    "person_id": person_id,
+                    "role": link["role"],
+                    "display_order": display_order,
+                    "created_at": now,
+                }
+
+        if link.get("source_id"):
+            key = (link["source_id"], person_id, link["role"])
+            source_rows.setdefault(key, {
+                "source_id": link["source_id"],
+                "person_id": person_id,
+                "role": link["role"],
+                "is_primary": link.get("is_primary", True),
+                "verified": link.get("verified", False),
+                "ai_confidence": link.get("ai_confidence"),
+                "created_at": now,
+            })
+            if link.get("verified"):
+                verify.setdefault((link["source_id"], link["role"]), set()).add(person_id)
+
+    created: set[tuple[str, str, str]] = set()
+
+    if video_rows:
+        result = client.table("video_people").upsert(
+            list(video_rows.values()),
+            on_conflict="video_id,person_id,role",
+            ignore_duplicates=True,
+        ).execute()
+        created.update((r["video_id"], r["person_id"], r["role"]) for r in result.data or [])
+
+    if source_rows:
+        result = client.table("source_people").upsert(
+            list(source_rows.values()),
+            on_conflict="source_id,person_id,role",
+            ignore_duplicates=True,
+        ).execute()
+        created.update((r["source_id"], r["person_id"], r["role"]) for r in result.data or [])
+
+        # Verify links that already existed (new ones were inserted verified)
+        for (source_id, role), ids in verify.items():
+            client.table("source_people").update({"verified": True}).eq(
+                "source_id", source_id
+            ).eq("role", role).in_("person_id", list(ids)).execute()
+
+    results = []
+    for link, person_id in zip(links, person_ids):
+        target = link.get("video_id") or link.get("source_id")
+        results.append({
+            "person": people.get(slugify_person(link["name"])) if not link.get("person_id") else None,
+            "person_id": person_id,
+            "linked": (target, person_id, link["role"]) in created,
+        })
+
+    return results
+
+
+@retrying("db")
+def fill_person_details(people: list[tuple[dict, dict]]) -> list[dict]:
+    """
+    Fill in missing wikipedia/website links and photo_url of existing people
+    in one request (the rule upsert_people applies to existing people).
+
+    Args:
+        people: (person record, dict with optional wikipedia_url,
+                website_url, photo_url) pairs
+
+    Returns:
+        The updated person records
+    """
+    now = datetime.now(timezone.utc).isoformat()
+    rows: dict[str, dict] = {}
+    for person, details in people:
+        # Several links to one person: fill from the first that has a value
+        row = _fill_person_row(rows.get(person["slug"]) or person, details, now)
+        if row:
+            rows[person["slug"]] = row
+
+    if not rows:
+        return []
+
+    client = get_client()
+    result = client.table("people").upsert(list(rows.values()), on_conflict="slug").execute()
+    return result.data or []
+
+
+@retrying("db")
+def add_person_aliases(aliases: list[tuple[dict, list[str]]]) -> list[dict]:
+    """
+    Append alternative names to people.aliases in one request.
+
+    Args:
+        aliases: (person record, new alias names) pairs
+
+    Returns:
+        The updated person records
+    """
+    rows = []
+    for person, names in aliases:
+        current = list(person.get("aliases") or [])
+        merged = current + [n for n in names if n not in current]
+        if merged != current:
+            rows.append({"name": person["name"], "slug": person["slug"], "aliases": merged})
+
+    if not rows:
+        return []
+
+    client = get_client()
+    result = client.table("people").upsert(rows, on_conflict="slug").execute()
+    return result.data or []
+
+
+@retrying("db")
+def mark_people_extracted(video_ids: list[str], link_hosts: bool = True) -> None:
+    """
+    Mark videos as processed for people extraction.
+
+    Args:
+        video_ids: Video IDs (UUIDs)
+        link_hosts: Also link each channel's verified hosts to its videos
+    """
+    if not video_ids:
+        return
+
+    client = get_client()
+
+    if link_hosts:
+        videos = client.table("videos").select("id, source_id").in_("id", video_ids).execute()
+        source_ids = list(dict.fromkeys(v["source_id"] for v in videos.data or []))
+
+        if source_ids:
+            hosts = (
+                client.table("source_people")
+                .select("source_id, person_id")
+                .in_("source_id", source_ids)
+                .eq("role", "host")
+                .eq("verified", True)
+                .execute()
+            )
+            hosts_by_source: dict[str, list[str]] = {}
+            for host in hosts.data or []:
+                hosts_by_source.setdefault(host["source_id"], []).append(host["person_id"])
+
+            link_people([
+                {"person_id": person_id, "role": "host", "video_id": video["id"], "display_order": i}
+                for video in videos.data or []
+                for i, person_id in enumerate(hosts_by_source.get(video["source_id"], []))
+            ])
+
+    client.table("videos").update({
+        "people_extracted_at": datetime.now(timezone.utc).isoformat()
+    }).in_("id", video_ids).execute()
+
+
 # =============================================================================
 # HELPERS
 # =============================================================================
@@ -10,112 +10,54 @@ Supports:
 
 import argparse
 import json
-import os
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from typing import Any, Literal
-from urllib.parse import quote
 
-import httpx
-import openai
-import anthropic
 from dotenv import load_dotenv
 
-from .db import get_client
+from .db import (
+    add_person_aliases,
+    fill_person_details,
+    get_client,
+    link_people,
+    mark_people_extracted,
+    slugify_person,
+    upsert_people,
+)
 from .channel import get_channel_metadata
+from .heuristics import extract_guests_heuristic
+from .http_client import format_http_stats
+from .llm_cache import cached_completion, format_llm_cache_stats, set_llm_cache_enabled
+from .llm_metrics import call_llm, format_llm_usage, write_llm_metrics
+from .people_index import canonicalize_links, get_person_index
+from .retry import format_retry_stats
+from .summarize import get_anthropic_client, get_openai_client
+from .templates import broken_templates, get_channel_templates
+from .wikipedia import resolve_wikipedia_batch
 
 load_dotenv()
 
 Provider = Literal["openai", "anthropic"]
 
-
-# =============================================================================
-# AI Client Setup
-# =============================================================================
-
-def get_openai_client() -> openai.OpenAI:
-    """Get OpenAI client."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("Missing OPENAI_API_KEY environment variable")
-    return openai.OpenAI(api_key=api_key)
-
-
-def get_anthropic_client() -> anthropic.Anthropic:
-    """Get Anthropic client."""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("Missing ANTHROPIC_API_KEY environment variable")
-    return anthropic.Anthropic(api_key=api_key)
+OPENAI_MODEL = "gpt-4o-mini"
+ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
 
 
 # =============================================================================
 # Utility Functions
 # =============================================================================
 
-def slugify(name: str) -> str:
-    """Convert name to URL-safe slug: 'John Doe' -> 'john-doe'."""
-    slug = name.lower().strip()
-    slug = re.sub(r"[^a-z0-9\s-]", "", slug)
-    slug = re.sub(r"[\s_]+", "-", slug)
-    slug = re.sub(r"-+", "-", slug)
-    return slug.strip("-")
-
-
 def search_wikipedia(name: str) -> tuple[str | None, str | None]:
-    """Search Wikipedia API for person's page URL and image.
+    """Look up a person's Wikipedia page URL and image.
+
+    Backed by the batched resolver and its local cache (see wikipedia.py).
 
     Returns:
         Tuple of (wikipedia_url, image_url)
     """
-    headers = {
-        "User-Agent": "DecompressScraper/1.0 (podcast-video-scraper; contact@example.com)"
-    }
-    wikipedia_url = None
-    image_url = None
-
-    try:
-        # First, search for the page
-        url = "https://en.wikipedia.org/w/api.php"
-        params = {
-            "action": "query",
-            "list": "search",
-            "srsearch": name,
-            "format": "json",
-            "srlimit": 1,
-        }
-        response = httpx.get(url, params=params, headers=headers, timeout=10)
-        response.raise_for_status()
-        results = response.json().get("query", {}).get("search", [])
-
-        if not results:
-            return None, None
-
-        title = results[0]["title"]
-        wikipedia_url = f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
-
-        # Now fetch the page image using pageimages API
-        image_params = {
-            "action": "query",
-            "titles": title,
-            "prop": "pageimages",
-            "pithumbsize": 500,  # Get a reasonable size thumbnail
-            "format": "json",
-        }
-        image_response = httpx.get(url, params=image_params, headers=headers, timeout=10)
-        image_response.raise_for_status()
-        pages = image_response.json().get("query", {}).get("pages", {})
-
-        # Get the first (and only) page result
-        for page_data in pages.values():
-            if "thumbnail" in page_data:
-                image_url = page_data["thumbnail"].get("source")
-                break
-
-    except Exception as e:
-        print(f"    Wikipedia search failed for {name}: {e}")
-
-    return wikipedia_url, image_url
+    return resolve_wikipedia_batch([name], verbose=True).get(name.strip(), (None, None))
 
 
 # =============================================================================
@@ -170,22 +112,36 @@ If no guests can be identified or this is a news channel, return: []
 """
 
 
-def extract_with_openai(prompt: str) -> list[dict]:
-    """Extract people using OpenAI."""
-    client = get_openai_client()
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        max_tokens=1000,
-        messages=[
-            {
-                "role": "system",
-                "content": "You are an expert at identifying people mentioned in video content. Always respond with valid JSON arrays only.",
-            },
-            {"role": "user", "content": prompt},
-        ],
-    )
-    content = response.choices[0].message.content or "[]"
-    # Extract JSON from response (handle markdown code blocks)
+BATCH_GUEST_EXTRACTION_PROMPT = """Channel: {channel_name}
+{hosts_context}
+
+Below are {count} videos from this channel, each with a numeric key.
+
+{videos_info}
+
+Your task: For EACH video, extract the GUEST(s) appearing in it - people being interviewed, featured, or having a conversation with the host(s).
+
+IMPORTANT RULES:
+1. FOCUS ON THE DESCRIPTION - The description usually contains the guest's name and bio. Titles are often clickbait and may mention famous people who are NOT actually guests.
+2. Look for patterns like "X joins us", "X breaks down", "X is a [profession]", "conversation with X", "X discusses" - these indicate the actual guest.
+3. DO NOT extract people who are merely MENTIONED or DISCUSSED in the video - only extract people who actually APPEAR as guests.
+4. If this appears to be a NEWS CHANNEL (reporting news, not interviews), use an empty array for every video - news segments don't have "guests" in the podcast sense.
+5. Do NOT include the hosts listed above.
+6. Only include real people (not fictional characters, brands, or organizations).
+7. Use the person's full name as it appears in the description.
+8. Treat each video independently - never copy a guest from one video to another.
+
+Return ONLY a JSON object (no other text) with one entry per video key:
+{{"1": [{{"name": "Full Name", "role": "guest"}}], "2": []}}
+"""
+
+EXTRACTION_SYSTEM_PROMPT = "You are an expert at identifying people mentioned in video content. Always respond with valid JSON arrays only."
+
+BATCH_EXTRACTION_SYSTEM_PROMPT = "You are an expert at identifying people mentioned in video content. Always respond with a valid JSON object only."
+
+
+def _parse_json_content(content: str) -> Any:
+    """Parse JSON from an LLM response (handle markdown code blocks)."""
     if "```" in content:
         match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", content)
         if match:
@@ -193,29 +149,89 @@ def extract_with_openai(prompt: str) -> list[dict]:
     return json.loads(content.strip())
 
 
-def extract_with_anthropic(prompt: str) -> list[dict]:
-    """Extract people using Anthropic Claude."""
-    client = get_anthropic_client()
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=1000,
-        messages=[{"role": "user", "content": prompt}],
-        system="You are an expert at identifying people mentioned in video content. Always respond with valid JSON arrays only.",
+def extract_with_openai(
+    prompt: str,
+    system: str = EXTRACTION_SYSTEM_PROMPT,
+    max_tokens: int = 1000,
+    json_object: bool = False,
+    stage: str = "extract",
+) -> Any:
+    """Extract people using OpenAI (memoized, see llm_cache.py)."""
+
+    def create() -> str:
+        client = get_openai_client()
+        kwargs = {}
+        if json_object:
+            kwargs["response_format"] = {"type": "json_object"}
+        response = call_llm(
+            stage,
+            "openai",
+            OPENAI_MODEL,
+            lambda: client.chat.completions.with_raw_response.create(
+                model=OPENAI_MODEL,
+                max_tokens=max_tokens,
+                messages=[
+                    {"role": "system", "content": system},
+                    {"role": "user", "content": prompt},
+                ],
+                **kwargs,
+            ),
+        )
+        return response.choices[0].message.content or ("{}" if json_object else "[]")
+
+    return cached_completion(
+        "openai", OPENAI_MODEL, system, prompt, create, _parse_json_content,
+        max_tokens=max_tokens, json_object=json_object,
     )
-    content = message.content[0].text or "[]"
-    # Extract JSON from response (handle markdown code blocks)
-    if "```" in content:
-        match = re.search(r"```(?:json)?\s*([\s\S]*?)\s*```", content)
-        if match:
-            content = match.group(1)
-    return json.loads(content.strip())
 
 
-def extract_people(prompt: str, provider: Provider = "openai") -> list[dict]:
-    """Extract people using specified AI provider."""
+def extract_with_anthropic(
+    prompt: str,
+    system: str = EXTRACTION_SYSTEM_PROMPT,
+    max_tokens: int = 1000,
+    json_object: bool = False,
+    stage: str = "extract",
+) -> Any:
+    """Extract people using Anthropic Claude (memoized, see llm_cache.py)."""
+
+    def create() -> str:
+        client = get_anthropic_client()
+        message = call_llm(
+            stage,
+            "anthropic",
+            ANTHROPIC_MODEL,
+            lambda: client.messages.with_raw_response.create(
+                model=ANTHROPIC_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+                system=system,
+            ),
+        )
+        return message.content[0].text or ("{}" if json_object else "[]")
+
+    return cached_completion(
+        "anthropic", ANTHROPIC_MODEL, system, prompt, create, _parse_json_content,
+        max_tokens=max_tokens, json_object=json_object,
+    )
+
+
+def extract_people(
+    prompt: str,
+    provider: Provider = "openai",
+    system: str = EXTRACTION_SYSTEM_PROMPT,
+    max_tokens: int = 1000,
+    json_object: bool = False,
+    stage: str = "extract",
+) -> Any:
+    """Extract people using specified AI provider.
+
+    Returns the parsed JSON: a list of people by default, or an object when
+    json_object is set (used for multi-video prompts). stage labels the call
+    in the LLM usage rollup (see llm_metrics.py).
+    """
     if provider == "anthropic":
-        return extract_with_anthropic(prompt)
-    return extract_with_openai(prompt)
+        return extract_with_anthropic(prompt, system, max_tokens, json_object, stage)
+    return extract_with_openai(prompt, system, max_tokens, json_object, stage)
 
 
 # =============================================================================
@@ -232,55 +248,15 @@ def upsert_person(
 
     URLs are stored in the social_links JSONB column.
     Photo URL is stored in the photo_url column.
+    See db.upsert_people for the bulk version.
     """
-    client = get_client()
-    slug = slugify(name)
-
-    # Try to find existing person by slug
-    result = client.table("people").select("*").eq("slug", slug).execute()
-
-    if result.data:
-        person = result.data[0]
-        # Update social_links if URLs provided and not already set
-        social_links = person.get("social_links") or {}
-        updates = {}
-
-        if wikipedia_url and not social_links.get("wikipedia"):
-            social_links["wikipedia"] = wikipedia_url
-            updates["social_links"] = social_links
-        if website_url and not social_links.get("website"):
-            social_links["website"] = website_url
-            updates["social_links"] = social_links
-        if photo_url and not person.get("photo_url"):
-            updates["photo_url"] = photo_url
-
-        if updates:
-            updates["updated_at"] = datetime.now(timezone.utc).isoformat()
-            client.table("people").update(updates).eq("id", person["id"]).execute()
-            person["social_links"] = social_links
-            if "photo_url" in updates:
-                person["photo_url"] = photo_url
-        return person
-
-    # Create new person
-    social_links = {}
-    if wikipedia_url:
-        social_links["wikipedia"] = wikipedia_url
-    if website_url:
-        social_links["website"] = website_url
-
-    new_person = {
+    people = upsert_people([{
         "name": name,
-        "slug": slug,
-        "social_links": social_links,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-    }
-    if photo_url:
-        new_person["photo_url"] = photo_url
-
-    result = client.table("people").insert(new_person).execute()
-    return result.data[0]
+        "wikipedia_url": wikipedia_url,
+        "website_url": website_url,
+        "photo_url": photo_url,
+    }])
+    return people[slugify_person(name)]
 
 
 def link_person_to_source(
@@ -290,35 +266,16 @@ def link_person_to_source(
     is_primary: bool = True,
     verified: bool = False,
     ai_confidence: str | None = None,
-) -> dict | None:
-    """Link person to source/channel via source_people."""
-    client = get_client()
-
-    # Check if link already exists
-    existing = (
-        client.table("source_people")
-        .select("*")
-        .eq("source_id", source_id)
-        .eq("person_id", person_id)
-        .eq("role", role)
-        .execute()
-    )
-
-    if existing.data:
-        return existing.data[0]
-
-    # Create new link
-    link = {
-        "source_id": source_id,
+) -> dict:
+    """Link person to source/channel via source_people (see db.link_people)."""
+    return link_people([{
         "person_id": person_id,
+        "source_id": source_id,
         "role": role,
         "is_primary": is_primary,
         "verified": verified,
         "ai_confidence": ai_confidence,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    }
-    result = client.table("source_people").insert(link).execute()
-    return result.data[0] if result.data else None
+    }])[0]
 
 
 def link_person_to_video(
@@ -326,33 +283,81 @@ def link_person_to_video(
     person_id: str,
     role: str,
     display_order: int = 0,
-) -> dict | None:
-    """Link person to video via video_people."""
-    client = get_client()
-
-    # Check if link already exists
-    existing = (
-        client.table("video_people")
-        .select("*")
-        .eq("video_id", video_id)
-        .eq("person_id", person_id)
-        .eq("role", role)
-        .execute()
-    )
-
-    if existing.data:
-        return existing.data[0]
-
-    # Create new link
-    link = {
-        "video_id": video_id,
+) -> dict:
+    """Link person to video via video_people (see db.link_people)."""
+    return link_people([{
         "person_id": person_id,
+        "video_id": video_id,
         "role": role,
         "display_order": display_order,
-        "created_at": datetime.now(timezone.utc).isoformat(),
-    }
-    result = client.table("video_people").insert(link).execute()
-    return result.data[0] if result.data else None
+    }])[0]
+
+
+def link_resolved_people(links: list[dict], verbose: bool = True) -> list[dict]:
+    """
+    Like db.link_people, but resolve names to existing people first.
+
+    Name variants ("Dr. Jane Doe", "Jane Doe, PhD") are matched against the
+    in-memory PersonIndex, linked to the existing person by id and recorded
+    as aliases, so they don't create near-duplicate people rows. Wikipedia,
+    website and photo values of matched links fill in what the person is
+    missing, as upsert_people does for new links.
+    """
+    index = get_person_index()
+    aliases = canonicalize_links(links, index)
+
+    details = [
+        (index.people[link["person_id"]], link)
+        for link in links
+        if link.get("name") and link.get("person_id") in index.people
+    ]
+    for person in fill_person_details(details):
+        index.add(person)
+
+    results = link_people(links, known=index.by_slug)
+    for result in results:
+        if result["person"]:
+            index.add(result["person"])
+        elif result["person_id"] in index.people:
+            result["person"] = index.people[result["person_id"]]
+
+    if aliases:
+        updated = add_person_aliases([(index.people[pid], names) for pid, names in aliases.items()])
+        for person in updated:
+            index.add(person)
+            if verbose:
+                print(f"      Aliases for {person['name']}: {', '.join(person.get('aliases') or [])}")
+
+    return results
+
+
+def resolve_wikipedia(
+    names: list[str],
+    verbose: bool = True,
+    max_workers: int = 1,
+) -> dict[str, tuple[str | None, str | None]]:
+    """
+    Wikipedia URL and photo for each name.
+
+    Names that resolve to a known person with a Wikipedia link reuse it;
+    only the rest are looked up (see wikipedia.resolve_wikipedia_batch).
+    """
+    index = get_person_index()
+    results: dict[str, tuple[str | None, str | None]] = {}
+    pending = []
+
+    for name in dict.fromkeys(n.strip() for n in names if n and n.strip()):
+        person = index.resolve(name)
+        wikipedia_url = ((person or {}).get("social_links") or {}).get("wikipedia")
+        if wikipedia_url:
+            results[name] = (wikipedia_url, person.get("photo_url"))
+        else:
+            pending.append(name)
+
+    if pending:
+        results.update(resolve_wikipedia_batch(pending, verbose=verbose, max_workers=max_workers))
+
+    return results
 
 
 def get_verified_hosts(source_id: str) -> list[dict]:
@@ -369,6 +374,27 @@ def get_verified_hosts(source_id: str) -> list[dict]:
     return result.data or []
 
 
+def get_verified_hosts_by_source(source_ids: list[str]) -> dict[str, list[dict]]:
+    """Get verified hosts for many channels in one query, grouped by source_id."""
+    if not source_ids:
+        return {}
+
+    client = get_client()
+    result = (
+        client.table("source_people")
+        .select("*, person:people(*)")
+        .in_("source_id", source_ids)
+        .eq("role", "host")
+        .eq("verified", True)
+        .execute()
+    )
+
+    hosts: dict[str, list[dict]] = {source_id: [] for source_id in source_ids}
+    for row in result.data or []:
+        hosts.setdefault(row["source_id"], []).append(row)
+    return hosts
+
+
 def get_unverified_hosts() -> list[dict]:
     """Get all unverified hosts grouped by channel."""
     client = get_client()
@@ -496,12 +522,19 @@ def extract_hosts_for_channel(
         channel_description=channel_description[:1000],  # Limit description length
         videos_info=videos_info,
     )
-    extracted = extract_people(prompt, provider)
+    extracted = extract_people(prompt, provider, stage="hosts")
 
     if verbose and not extracted:
         print(f"    No hosts identified by AI")
 
-    hosts = []
+    # Resolve all host names on Wikipedia in one batch
+    wikipedia = {}
+    if lookup_wikipedia:
+        wikipedia = resolve_wikipedia(
+            [item.get("name", "") for item in extracted], verbose=verbose
+        )
+
+    links = []
     for item in extracted:
         name = item.get("name", "").strip()
         confidence = item.get("confidence", "medium")
@@ -512,30 +545,31 @@ def extract_hosts_for_channel(
         if verbose:
             print(f"    Found host: {name} (confidence: {confidence})")
 
-        # Search Wikipedia
-        wikipedia_url = None
-        photo_url = None
-        if lookup_wikipedia:
-            wikipedia_url, photo_url = search_wikipedia(name)
-            if verbose and wikipedia_url:
-                print(f"      Wikipedia: {wikipedia_url}")
-            if verbose and photo_url:
-                print(f"      Photo: {photo_url}")
-
-        # Create/get person record
-        person = upsert_person(name, wikipedia_url=wikipedia_url, photo_url=photo_url)
-
-        # Link to source
-        link_person_to_source(
-            source_id=source_id,
-            person_id=person["id"],
-            role="host",
-            is_primary=True,
-            verified=False,
-            ai_confidence=confidence,
-        )
-
-        hosts.append({"person": person, "confidence": confidence})
+        # Wikipedia page and photo
+        wikipedia_url, photo_url = wikipedia.get(name, (None, None))
+        if verbose and wikipedia_url:
+            print(f"      Wikipedia: {wikipedia_url}")
+        if verbose and photo_url:
+            print(f"      Photo: {photo_url}")
+
+        links.append({
+            "name": name,
+            "wikipedia_url": wikipedia_url,
+            "photo_url": photo_url,
+            "source_id": source_id,
+            "role": "host",
+            "is_primary": True,
+            "verified": False,
+            "ai_confidence": confidence,
+        })
+
+    # Create/get person records and link them to the source in bulk
+    saved = link_resolved_people(links, verbose)
+    hosts = [
+        {"person": result["person"], "confidence": link["ai_confidence"]}
+        for link, result in zip(links, saved)
+        if result["person"]
+    ]
 
     # Mark channel as processed
     client.table("sources").update(
@@ -677,19 +711,34 @@ def verify_hosts_interactive(verbose: bool = True) -> dict[str, Any]:
 # Video Guest Extraction
 # =============================================================================
 
-def extract_guests_for_video(
-    video_id: str,
-    provider: Provider = "openai",
-    lookup_wikipedia: bool = True,
-    verbose: bool = True,
-) -> list[dict]:
-    """Extract guests for a single video."""
+VIDEO_CONTEXT_COLUMNS = "id, title, description, source_id, source:sources(id, name)"
+
+
+def _build_video_context(video_data: dict, verified_hosts: list[dict]) -> dict[str, Any]:
+    """Build the extraction context for a video row (with joined source)."""
+    source_data = video_data.get("source")
+    if isinstance(source_data, list):
+        source_data = source_data[0] if source_data else {}
+
+    return {
+        "video_id": video_data["id"],
+        "source_id": video_data["source_id"],
+        "channel_name": source_data.get("name", "Unknown") if source_data else "Unknown",
+        "title": video_data.get("title", ""),
+        "description": video_data.get("description", "") or "",
+        "verified_hosts": verified_hosts,
+        "host_names": [h["person"]["name"] for h in verified_hosts if h.get("person")],
+    }
+
+
+def _load_video_context(video_id: str) -> dict[str, Any]:
+    """Load a video with its channel name and verified hosts for guest extraction."""
     client = get_client()
 
     # Get video info
     video = (
         client.table("videos")
-        .select("*, source:sources(id, name)")
+        .select(VIDEO_CONTEXT_COLUMNS)
         .eq("id", video_id)
         .single()
         .execute()
@@ -698,38 +747,87 @@ def extract_guests_for_video(
     if not video.data:
         raise ValueError(f"Video not found: {video_id}")
 
-    video_data = video.data
-    source_id = video_data["source_id"]
-    source_data = video_data.get("source")
-    if isinstance(source_data, list):
-        source_data = source_data[0] if source_data else {}
-    channel_name = source_data.get("name", "Unknown") if source_data else "Unknown"
-    title = video_data.get("title", "")
-    description = video_data.get("description", "") or ""
-
     # Get verified hosts for this channel
-    verified_hosts = get_verified_hosts(source_id)
-    host_names = [h["person"]["name"] for h in verified_hosts if h.get("person")]
+    verified_hosts = get_verified_hosts(video.data["source_id"])
+
+    return _build_video_context(video.data, verified_hosts)
+
+
+def _emit(log: list[str] | None, message: str) -> None:
+    """Print a progress line, or collect it in log (worker threads print nothing themselves)."""
+    if log is None:
+        print(message)
+    else:
+        log.append(message)
 
-    # Build hosts context for prompt
-    hosts_context = ""
-    if host_names:
-        hosts_context = f"Known hosts (DO NOT include these): {', '.join(host_names)}"
+
+def _extract_guest_names(
+    context: dict[str, Any],
+    provider: Provider = "openai",
+    verbose: bool = True,
+    log: list[str] | None = None,
+) -> list[dict]:
+    """Run the LLM on a video's title/description and return guest name/role dicts."""
+    host_names = context["host_names"]
 
     if verbose:
-        print(f"  Extracting guests from: {title[:60]}...")
+        _emit(log, f"  Extracting guests from: {context['title'][:60]}...")
 
     # Extract guests using AI
     prompt = GUEST_EXTRACTION_PROMPT.format(
-        channel_name=channel_name,
-        hosts_context=hosts_context,
-        title=title,
-        description=description[:2000],  # Limit description length
+        channel_name=context["channel_name"],
+        hosts_context=_hosts_context(host_names),
+        title=context["title"],
+        description=context["description"][:2000],  # Limit description length
     )
-    extracted = extract_people(prompt, provider)
+    extracted = extract_people(prompt, provider, stage="guests")
+
+    return _filter_guests(extracted, host_names, verbose, log)
+
+
+def _heuristic_guests(context: dict[str, Any], verbose: bool = True) -> list[dict] | None:
+    """Guests from the rule-based tier, or None if it isn't confident enough to skip the LLM.
+
+    Uses the channel's learned title/description templates when available.
+    """
+    try:
+        templates = get_channel_templates(context["source_id"])
+    except Exception as e:
+        templates = None
+        if verbose:
+            print(f"    Template learning failed, using generic rules: {e}")
+
+    if templates:
+        templates.observe(context["title"])
+
+    result = extract_guests_heuristic(
+        context["title"],
+        context["description"],
+        host_names=context["host_names"],
+        channel_name=context["channel_name"],
+        title_templates=templates.heuristic_templates() if templates else None,
+        description_weights=templates.description_weights if templates else None,
+    )
+    if not result.confident:
+        return None
+
+    if verbose:
+        print(f"  Heuristic match ({result.confidence:.2f}): {context['title'][:60]}")
+    return _filter_guests(result.guests, context["host_names"], verbose)
+
+
+def _hosts_context(host_names: list[str]) -> str:
+    if not host_names:
+        return ""
+    return f"Known hosts (DO NOT include these): {', '.join(host_names)}"
 
+
+def _filter_guests(
+    extracted: list[dict], host_names: list[str], verbose: bool = True, log: list[str] | None = None
+) -> list[dict]:
+    """Normalise extracted guests and drop empty names and known hosts."""
     guests = []
-    for i, item in enumerate(extracted):
+    for item in extracted:
         name = item.get("name", "").strip()
         role = item.get("role", "guest")
 
@@ -741,47 +839,182 @@ def extract_guests_for_video(
             continue
 
         if verbose:
-            print(f"    Found guest: {name} (role: {role})")
+            _emit(log, f"    Found guest: {name} (role: {role})")
 
-        # Search Wikipedia
-        wikipedia_url = None
-        photo_url = None
-        if lookup_wikipedia:
-            wikipedia_url, photo_url = search_wikipedia(name)
-            if verbose and wikipedia_url:
-                print(f"      Wikipedia: {wikipedia_url}")
-            if verbose and photo_url:
-                print(f"      Photo: {photo_url}")
-
-        # Create/get person record
-        person = upsert_person(name, wikipedia_url=wikipedia_url, photo_url=photo_url)
-
-        # Link to video
-        link_person_to_video(
-            video_id=video_id,
-            person_id=person["id"],
-            role=role,
-            display_order=i,
+        guests.append({"name": name, "role": role})
+
+    return guests
+
+
+def _valid_guest_list(value: Any) -> bool:
+    """Check one video's entry in a multi-video response."""
+    return isinstance(value, list) and all(
+        isinstance(item, dict) and isinstance(item.get("name"), str) for item in value
+    )
+
+
+def _extract_guest_names_multi(
+    contexts: list[dict[str, Any]],
+    provider: Provider = "openai",
+    verbose: bool = True,
+    log: list[str] | None = None,
+) -> dict[str, list[dict]]:
+    """
+    Extract guests for several videos from the same channel in one LLM request.
+
+    Each video is validated separately; any video missing from the response
+    or with a malformed entry falls back to a single-video request. Progress
+    lines go to log when given (see _emit).
+
+    Returns:
+        Dict mapping video_id to its guest name/role dicts (videos whose
+        fallback request also failed are omitted)
+    """
+    first = contexts[0]
+    host_names = first["host_names"]
+
+    # A single video goes straight to the regular prompt below
+    response: Any = {}
+    if len(contexts) > 1:
+        videos_info = "\n\n".join(
+            f"[{i}] Video title: {ctx['title']}\nVideo description:\n{ctx['description'][:2000]}"
+            for i, ctx in enumerate(contexts, 1)
+        )
+        prompt = BATCH_GUEST_EXTRACTION_PROMPT.format(
+            channel_name=first["channel_name"],
+            hosts_context=_hosts_context(host_names),
+            count=len(contexts),
+            videos_info=videos_info,
         )
 
-        guests.append({"person": person, "role": role})
+        if verbose:
+            _emit(log, f"  Extracting guests from {len(contexts)} videos of {first['channel_name']} in one request...")
 
-    # Also link verified hosts to this video
-    for i, host in enumerate(verified_hosts):
-        if host.get("person"):
-            link_person_to_video(
-                video_id=video_id,
-                person_id=host["person"]["id"],
-                role="host",
-                display_order=i,
+        try:
+            response = extract_people(
+                prompt,
+                provider,
+                system=BATCH_EXTRACTION_SYSTEM_PROMPT,
+                max_tokens=300 * len(contexts) + 200,
+                json_object=True,
+                stage="guests_batch",
             )
+        except Exception as e:
+            if verbose:
+                _emit(log, f"    Batch request failed ({e}), falling back to single-video requests")
 
-    # Mark video as processed
-    client.table("videos").update(
-        {"people_extracted_at": datetime.now(timezone.utc).isoformat()}
-    ).eq("id", video_id).execute()
+    if not isinstance(response, dict):
+        response = {}
 
-    return guests
+    results = {}
+    for i, ctx in enumerate(contexts, 1):
+        entry = response.get(str(i))
+        if _valid_guest_list(entry):
+            if verbose:
+                _emit(log, f"   [{i}] {ctx['title'][:60]}")
+            results[ctx["video_id"]] = _filter_guests(entry, host_names, verbose, log)
+        else:
+            try:
+                results[ctx["video_id"]] = _extract_guest_names(ctx, provider, verbose, log)
+            except Exception as e:
+                if verbose:
+                    _emit(log, f"    ✗ Error: {e}")
+
+    return results
+
+
+def _extract_chunk(
+    contexts: list[dict[str, Any]], provider: Provider, verbose: bool
+) -> tuple[dict[str, list[dict]], list[str]]:
+    """_extract_guest_names_multi() for a worker thread: (results, progress lines to print)."""
+    log: list[str] = []
+    try:
+        return _extract_guest_names_multi(contexts, provider, verbose, log), log
+    except Exception as e:
+        if verbose:
+            log.append(f"    ✗ Error: {e}\n")
+        return {}, log
+
+
+def _save_video_people(
+    extracted: list[tuple[dict[str, Any], list[dict]]],
+    wikipedia: dict[str, tuple[str | None, str | None]],
+    verbose: bool = True,
+) -> dict[str, list[dict]]:
+    """
+    Save guests for many videos at once.
+
+    Upserts each distinct person once, writes all guest and verified-host
+    links in a single video_people upsert, and marks every video processed
+    in a single update.
+
+    Args:
+        extracted: (context, guests) pairs
+        wikipedia: name -> (wikipedia_url, photo_url)
+
+    Returns:
+        Dict mapping video_id to its saved guests ({"person", "role"})
+    """
+    links = []
+    for context, guests in extracted:
+        for i, guest in enumerate(guests):
+            wikipedia_url, photo_url = wikipedia.get(guest["name"], (None, None))
+            if verbose and wikipedia_url:
+                print(f"      {guest['name']} Wikipedia: {wikipedia_url}")
+            links.append({
+                "name": guest["name"],
+                "wikipedia_url": wikipedia_url,
+                "photo_url": photo_url,
+                "video_id": context["video_id"],
+                "role": guest["role"],
+                "display_order": i,
+            })
+
+        # Also link verified hosts to this video
+        for i, host in enumerate(context["verified_hosts"]):
+            if host.get("person"):
+                links.append({
+                    "person_id": host["person"]["id"],
+                    "video_id": context["video_id"],
+                    "role": "host",
+                    "display_order": i,
+                })
+
+    results = link_resolved_people(links, verbose)
+
+    saved: dict[str, list[dict]] = {context["video_id"]: [] for context, _ in extracted}
+    for link, result in zip(links, results):
+        if link.get("name") and result["person"]:
+            saved[link["video_id"]].append({"person": result["person"], "role": link["role"]})
+
+    # Mark videos as processed (hosts were linked above)
+    mark_people_extracted(list(saved), link_hosts=False)
+
+    return saved
+
+
+def extract_guests_for_video(
+    video_id: str,
+    provider: Provider = "openai",
+    lookup_wikipedia: bool = True,
+    verbose: bool = True,
+    use_heuristics: bool = False,
+) -> list[dict]:
+    """Extract guests for a single video.
+
+    With use_heuristics, obvious cases (see heuristics.py) are resolved
+    without calling the LLM.
+    """
+    context = _load_video_context(video_id)
+    guests = _heuristic_guests(context, verbose) if use_heuristics else None
+    if guests is None:
+        guests = _extract_guest_names(context, provider, verbose)
+
+    wikipedia = {}
+    if lookup_wikipedia and guests:
+        wikipedia = resolve_wikipedia([g["name"] for g in guests], verbose=verbose)
+
+    return _save_video_people([(context, guests)], wikipedia, verbose)[video_id]
 
 
 def extract_guests_batch(
@@ -789,20 +1022,38 @@ def extract_guests_batch(
     provider: Provider = "openai",
     lookup_wikipedia: bool = True,
     verbose: bool = True,
+    videos_per_prompt: int = 1,
+    max_workers: int = 4,
+    use_heuristics: bool = False,
 ) -> dict[str, Any]:
     """Extract guests for videos that haven't been processed.
 
     Only processes videos that have metadata (metadata_scraped_at is set),
     since guest extraction relies on video descriptions.
+
+    Runs in three phases so Wikipedia lookups can be batched across the
+    whole run: LLM extraction per video, one batched Wikipedia resolution
+    for every guest name, then a bulk database write for all videos
+    (falling back to one write per video if the bulk write fails).
+
+    Channel names and verified hosts are loaded once per channel up front,
+    and LLM requests run concurrently in a pool of max_workers threads.
+
+    With videos_per_prompt > 1, videos from the same channel are packed
+    into one LLM request (falling back to single-video requests for any
+    video whose part of the response doesn't validate).
+
+    With use_heuristics, videos whose guests are obvious from the title and
+    description (see heuristics.py) skip the LLM entirely.
     """
     client = get_client()
-    stats = {"videos_processed": 0, "guests_found": 0, "errors": []}
+    stats = {"videos_processed": 0, "guests_found": 0, "heuristic_matches": 0, "errors": []}
 
     # Get videos without people_extracted_at that HAVE metadata
     # (metadata_scraped_at is not null - ensures we have description)
     videos = (
         client.table("videos")
-        .select("id, title")
+        .select(VIDEO_CONTEXT_COLUMNS)
         .is_("people_extracted_at", "null")
         .not_.is_("metadata_scraped_at", "null")
         .limit(limit)
@@ -815,26 +1066,84 @@ def extract_guests_batch(
         return stats
 
     if verbose:
-        print(f"Found {len(videos.data)} videos to process (using {provider})\n")
+        print(f"Found {len(videos.data)} videos to process (using {provider}, {max_workers} workers)\n")
+
+    # Preload verified hosts for every channel in the batch with one query
+    hosts_by_source = get_verified_hosts_by_source(
+        list(dict.fromkeys(v["source_id"] for v in videos.data))
+    )
 
+    # Phase 1: heuristics, then LLM extraction grouped by channel so videos can share a prompt
+    extracted: list[tuple[dict, list[dict]]] = []
+    by_source: dict[str, list[dict]] = {}
     for video in videos.data:
-        try:
-            guests = extract_guests_for_video(
-                video["id"],
-                provider=provider,
-                lookup_wikipedia=lookup_wikipedia,
-                verbose=verbose,
-            )
-            stats["videos_processed"] += 1
-            stats["guests_found"] += len(guests)
+        context = _build_video_context(video, hosts_by_source.get(video["source_id"], []))
+        guests = _heuristic_guests(context, verbose) if use_heuristics else None
+        if guests is not None:
+            extracted.append((context, guests))
+            stats["heuristic_matches"] += 1
+            continue
+        by_source.setdefault(context["source_id"], []).append(context)
+
+    chunk_size = max(videos_per_prompt, 1)
+    chunks = [
+        contexts[start:start + chunk_size]
+        for contexts in by_source.values()
+        for start in range(0, len(contexts), chunk_size)
+    ]
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        futures = {
+            executor.submit(_extract_chunk, chunk, provider, verbose): chunk
+            for chunk in chunks
+        }
+        for future in as_completed(futures):
+            chunk = futures[future]
+            # Each chunk's output in one piece, from this thread
+            guests_by_video, lines = future.result()
+            for line in lines:
+                print(line)
+            for context in chunk:
+                if context["video_id"] in guests_by_video:
+                    extracted.append((context, guests_by_video[context["video_id"]]))
+                else:
+                    stats["errors"].append(f"{context['title'][:50]}: guest extraction failed")
 
+    # Phase 2: resolve every guest name across the batch at once
+    wikipedia = {}
+    if lookup_wikipedia:
+        names = [g["name"] for _, guests in extracted for g in guests]
+        if names:
             if verbose:
-                print(f"    ✓ Found {len(guests)} guest(s)\n")
+                print(f"\nResolving {len(set(names))} names on Wikipedia...")
+            wikipedia = resolve_wikipedia(names, verbose=verbose, max_workers=max_workers)
 
+    # Phase 3: save people and links in bulk; if that fails, video by video,
+    # so one bad row doesn't throw away the rest of the batch's LLM results
+    saved: dict[str, list[dict]] = {}
+    if extracted:
+        try:
+            saved = _save_video_people(extracted, wikipedia, verbose)
         except Exception as e:
-            stats["errors"].append(f"{video['title'][:50]}: {e}")
             if verbose:
-                print(f"    ✗ Error: {e}\n")
+                print(f"    Bulk save of {len(extracted)} videos failed ({e}), saving one by one")
+            for context, guests in extracted:
+                try:
+                    saved.update(_save_video_people([(context, guests)], wikipedia, verbose))
+                except Exception as e:
+                    stats["errors"].append(f"Saving {context['title'][:50]}: {e}")
+                    if verbose:
+                        print(f"    ✗ {context['title'][:50]}: {e}")
+
+    for context, _ in extracted:
+        if context["video_id"] not in saved:
+            continue
+        guests = saved[context["video_id"]]
+        stats["videos_processed"] += 1
+        stats["guests_found"] += len(guests)
+
+        if verbose:
+            print(f"    ✓ {context['title'][:50]}: {len(guests)} guest(s)")
 
     if verbose:
         print(f"\n{'='*60}")
@@ -842,6 +1151,21 @@ def extract_guests_batch(
         print(f"{'='*60}")
         print(f"Videos processed: {stats['videos_processed']}")
         print(f"Guests found: {stats['guests_found']}")
+        if use_heuristics:
+            print(f"LLM calls avoided by heuristics: {stats['heuristic_matches']}")
+            for templates in broken_templates():
+                print(
+                    f"Title template broke for source {templates.source_id}: "
+                    f"{templates.recent_match_rate:.0%} of recent titles match (was {templates.match_rate:.0%})"
+                )
+        if format_llm_usage():
+            print(format_llm_usage())
+        if format_llm_cache_stats():
+            print(format_llm_cache_stats())
+        if format_retry_stats():
+            print(format_retry_stats())
+        if format_http_stats():
+            print(format_http_stats())
         if stats["errors"]:
             print(f"Errors: {len(stats['errors'])}")
             for err in stats["errors"][:5]:
@@ -904,6 +1228,35 @@ def main():
         action="store_true",
         help="Re-process channels/videos even if already processed",
     )
+    parser.add_argument(
+        "--videos-per-prompt",
+        type=int,
+        default=1,
+        metavar="K",
+        help="Pack up to K videos from the same channel into one LLM request (default: 1)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent LLM and Wikipedia requests for batch extraction (default: 4)",
+    )
+    parser.add_argument(
+        "--heuristics",
+        action="store_true",
+        help="Skip the LLM when the guest is obvious from title/description "
+             "(opt-in until held-out precision is measured; see heuristics.py)",
+    )
+    parser.add_argument(
+        "--no-llm-cache",
+        action="store_true",
+        help="Bypass the local LLM response cache (always call the API)",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        help="Write LLM token/cost/latency metrics here (.prom = Prometheus text, else JSON lines)",
+    )
     parser.add_argument(
         "--fetch-descriptions",
         action="store_true",
@@ -914,6 +1267,9 @@ def main():
     verbose = not args.quiet
     lookup_wikipedia = not args.no_wikipedia
 
+    if args.no_llm_cache:
+        set_llm_cache_enabled(False)
+
     if args.fetch_descriptions:
         # Fetch channel descriptions from YouTube
         stats = fetch_channel_descriptions(verbose=verbose)
@@ -934,6 +1290,10 @@ def main():
         if verbose:
             print(f"\nChannels processed: {stats['channels_processed']}")
             print(f"Hosts found: {stats['hosts_found']}")
+            if format_llm_usage():
+                print(format_llm_usage())
+            if format_llm_cache_stats():
+                print(format_llm_cache_stats())
             if stats["errors"]:
                 print(f"Errors: {len(stats['errors'])}")
 
@@ -952,9 +1312,12 @@ def main():
             provider=args.provider,
             lookup_wikipedia=lookup_wikipedia,
             verbose=verbose,
+            use_heuristics=args.heuristics,
         )
         if verbose:
             print(f"\nGuests found: {len(guests)}")
+            if format_llm_usage():
+                print(format_llm_usage())
 
     else:
         # Batch process videos
@@ -963,8 +1326,13 @@ def main():
             provider=args.provider,
             lookup_wikipedia=lookup_wikipedia,
             verbose=verbose,
+            videos_per_prompt=args.videos_per_prompt,
+            max_workers=args.workers,
+            use_heuristics=args.heuristics,
         )
 
+    write_llm_metrics(args.metrics_file)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,251 @@
+"""
+Where yt-dlp extraction runs: in the calling thread or in worker processes.
+
+Full video extraction spends much of its time in Python (JSON, player JS,
+format lists), so under threads it is GIL-bound and stops scaling after a few
+concurrent videos. Two executors (set_metadata_executor):
+- thread: extract in the calling thread, a fresh YoutubeDL per call (default)
+- process: a pool of long-lived worker processes, each holding warm YoutubeDL
+  instances (extractors and player caches survive between videos). Workers
+  send back only the requested fields, keeping IPC small.
+
+Either way run_extraction() returns (info, error messages) and never raises
+for extraction failures, so the circuit breaker and retries in channel.py
+work the same on top of both. Concurrency comes from the caller: the scraper
+fetches metadata for up to metadata_workers() videos at once.
+
+Usage:
+    set_metadata_executor("process", workers=4)
+    info, errors = run_extraction(url, ydl_opts, fields=["id", "title"])
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+import yt_dlp
+from dotenv import load_dotenv
+from yt_dlp.utils import formatSeconds, strftime_or_none
+
+load_dotenv()
+
+EXECUTORS = ("thread", "process")
+
+_mode = os.getenv("SCRAPER_METADATA_EXECUTOR", "thread")
+_workers = int(os.getenv("SCRAPER_METADATA_WORKERS", "1"))
+_initializer: Callable[..., None] | None = None
+_initargs: tuple = ()
+
+# Longest wait for a worker's answer before treating the pool as broken
+WORKER_TIMEOUT = 300.0
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+
+
+class _ErrorCapture:
+    """Silent yt-dlp logger that keeps error messages (ignoreerrors hides them otherwise)."""
+
+    def __init__(self):
+        self.errors: list[str] = []
+
+    def debug(self, msg): pass
+    def info(self, msg): pass
+    def warning(self, msg): pass
+
+    def error(self, msg):
+        self.errors.append(str(msg))
+
+
+def _fill_unprocessed(info: dict[str, Any]) -> dict[str, Any]:
+    """
+    Fields yt-dlp's processing step adds, for results of extract_info(process=False).
+
+    Processing also sorts and selects formats, which is what process=False
+    skips; only the cheap derived fields we store are filled in here.
+    """
+    if info.get("duration") is not None and not info.get("duration_string"):
+        info["duration_string"] = formatSeconds(info["duration"])
+    if not info.get("upload_date") and info.get("timestamp") is not None:
+        info["upload_date"] = strftime_or_none(info["timestamp"])
+    if not info.get("thumbnail") and info.get("thumbnails"):
+        # The preferred thumbnail, as yt-dlp's thumbnail sort would put last
+        best = max(
+            info["thumbnails"],
+            key=lambda t: (
+                t["preference"] if t.get("preference") is not None else -1,
+                t["width"] if t.get("width") is not None else -1,
+            ),
+        )
+        info["thumbnail"] = best.get("url")
+    if info.get("chapters"):
+        # End times (and an untitled first chapter), as processing fills them in
+        chapters = info["chapters"]
+        if chapters[0].get("start_time"):
+            chapters.insert(0, {"start_time": 0})
+        for i, chapter in enumerate(chapters):
+            if chapter.get("start_time") is None:
+                chapter["start_time"] = chapters[i - 1].get("end_time") if i else 0
+            if not chapter.get("end_time"):
+                chapter["end_time"] = chapters[i + 1].get("start_time") if i + 1 < len(chapters) else info.get("duration")
+            if not chapter.get("title"):
+                chapter["title"] = f"<Untitled Chapter {i + 1}>"
+    return info
+
+
+def _finish(info: dict[str, Any] | None, fields: list[str] | None, process: bool) -> dict[str, Any] | None:
+    if info is not None and not process:
+        info = _fill_unprocessed(info)
+    return _trim(info, fields)
+
+
+def _trim(info: dict[str, Any] | None, fields: list[str] | None) -> dict[str, Any] | None:
+    if info is None or fields is None:
+        return info
+    return {field: info.get(field) for field in fields}
+
+
+def _extract(
+    url: str, ydl_opts: dict[str, Any], fields: list[str] | None, process: bool
+) -> tuple[dict[str, Any] | None, list[str]]:
+    """One extraction with a fresh YoutubeDL (thread executor)."""
+    capture = _ErrorCapture()
+    try:
+        with yt_dlp.YoutubeDL({**ydl_opts, "logger": capture}) as ydl:
+            info = ydl.extract_info(url, download=False, process=process)
+    except Exception as e:
+        return None, capture.errors + [str(e)]
+    return _finish(info, fields, process), capture.errors
+
+
+# =============================================================================
+# Worker processes
+# =============================================================================
+
+# Per worker process: options (as JSON) -> warm YoutubeDL and its logger
+_warm: dict[str, tuple[Any, _ErrorCapture]] = {}
+
+
+def _worker_extract(
+    url: str, ydl_opts: dict[str, Any], fields: list[str] | None, process: bool
+) -> tuple[dict[str, Any] | None, list[str]]:
+    """One extraction in a worker process, reusing its YoutubeDL for these options."""
+    key = json.dumps(ydl_opts, sort_keys=True, default=str)
+    warm = _warm.get(key)
+    if warm is None:
+        capture = _ErrorCapture()
+        warm = _warm[key] = (yt_dlp.YoutubeDL({**ydl_opts, "logger": capture}), capture)
+
+    ydl, capture = warm
+    capture.errors = []
+    try:
+        info = ydl.extract_info(url, download=False, process=process)
+    except Exception as e:
+        return None, capture.errors + [str(e)]
+    return _finish(info, fields, process), capture.errors
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # spawn, not fork: the parent has live threads (HTTP pool, metrics server)
+                _pool = ProcessPoolExecutor(
+                    max_workers=_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_initializer,
+                    initargs=_initargs,
+                )
+    return _pool
+
+
+def shutdown_extraction() -> None:
+    """Stop the worker processes (they are restarted on next use)."""
+    global _pool
+
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+# =============================================================================
+# Public API
+# =============================================================================
+
+def set_metadata_executor(
+    mode: str,
+    workers: int | None = None,
+    initializer: Callable[..., None] | None = None,
+    initargs: tuple = (),
+) -> None:
+    """
+    Choose where metadata extraction runs and how many videos run at once.
+
+    Args:
+        mode: "thread" or "process"
+        workers: Concurrent extractions (threads in the scraper, and worker
+                 processes in process mode)
+        initializer: Called in each new worker process (e.g. the benchmark
+                     installs its yt-dlp stand-in there)
+        initargs: Arguments for initializer
+
+    Raises:
+        ValueError: If mode is unknown
+    """
+    global _mode, _workers, _initializer, _initargs
+
+    if mode not in EXECUTORS:
+        raise ValueError(f"Unknown metadata executor {mode!r} (one of {', '.join(EXECUTORS)})")
+    shutdown_extraction()
+    _mode = mode
+    if workers is not None:
+        _workers = max(1, workers)
+    _initializer = initializer
+    _initargs = initargs
+
+
+def metadata_workers() -> int:
+    """How many videos the scraper should extract metadata for at once."""
+    return _workers
+
+
+def run_extraction(
+    url: str,
+    ydl_opts: dict[str, Any],
+    fields: list[str] | None = None,
+    use_pool: bool = True,
+    process: bool = True,
+) -> tuple[dict[str, Any] | None, list[str]]:
+    """
+    Run yt-dlp extract_info on the configured executor.
+
+    Args:
+        url: Video or channel URL
+        ydl_opts: YoutubeDL options (the logger is supplied here)
+        fields: Keep only these keys of the result (None: everything)
+        process: False skips yt-dlp's processing step (format sorting and
+                 selection); the stored derived fields are filled in anyway
+        use_pool: False forces the calling thread, e.g. for flat channel
+                  listings whose large results aren't worth sending between
+                  processes
+
+    Returns:
+        Tuple of (info or None, error messages yt-dlp logged or raised)
+    """
+    if _mode != "process" or not use_pool:
+        return _extract(url, ydl_opts, fields, process)
+
+    try:
+        return _get_pool().submit(_worker_extract, url, ydl_opts, fields, process).result(timeout=WORKER_TIMEOUT)
+    except (BrokenProcessPool, TimeoutError) as e:
+        # A worker died (e.g. OOM) or hangs; start a fresh pool for the next call
+        shutdown_extraction()
+        return None, [f"yt-dlp worker process failed: {e!r}"]
@@ -0,0 +1,270 @@
+"""
+YouTube Atom feed change detection.
+
+Every channel exposes a lightweight Atom feed of its latest ~15 uploads at
+https://www.youtube.com/feeds/videos.xml?channel_id=UC...
+
+Polling the feed (with ETag / If-Modified-Since) is much cheaper than a
+yt-dlp flat extraction of the channel's /videos page, so it is used as a
+fast path to decide whether a full listing is needed at all.
+
+Uploads the VideoFilter rejects (shorts, videos under the minimum duration)
+are never stored, so they would look new on every poll. Their ids are kept
+in a local SQLite cache (save_rejected) and skipped by the feed check.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any
+
+import httpx
+from dotenv import load_dotenv
+
+from .filters import VideoFilter
+from .http_client import get_http_client
+from .retry import call_with_retry, raise_for_retryable
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+# Overridable so the detector can be pointed at a local fixture server
+FEED_URL = os.getenv("YOUTUBE_FEED_URL", "https://www.youtube.com/feeds/videos.xml")
+
+# YouTube feeds contain at most this many entries
+FEED_MAX_ENTRIES = 15
+
+_NS = {
+    "atom": "http://www.w3.org/2005/Atom",
+    "yt": "http://www.youtube.com/xml/schemas/2015",
+}
+
+# Remembered rejections are checked again after this long (titles get edited)
+REJECTED_TTL_SECONDS = 30 * 24 * 60 * 60
+
+CACHE_DIR = Path(os.getenv("SCRAPER_CACHE_DIR", Path(__file__).parent.parent.parent / ".cache"))
+
+# Per-channel validators and last parsed entries, kept for the process lifetime
+_feed_cache: dict[str, dict[str, Any]] = {}
+
+_db: sqlite3.Connection | None = None
+_db_lock = threading.Lock()
+
+
+# =============================================================================
+# Rejected-id cache
+# =============================================================================
+
+def _get_db() -> sqlite3.Connection:
+    """Get or create the SQLite cache connection."""
+    global _db
+
+    if _db is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _db = sqlite3.connect(CACHE_DIR / "feed.sqlite", check_same_thread=False)
+        _db.execute(
+            """CREATE TABLE IF NOT EXISTS rejected_videos (
+                video_id TEXT NOT NULL,
+                filter_key TEXT NOT NULL,
+                reason TEXT NOT NULL,
+                rejected_at REAL NOT NULL,
+                PRIMARY KEY (video_id, filter_key)
+            )"""
+        )
+        _db.commit()
+
+    return _db
+
+
+def save_rejected(video_filter: VideoFilter) -> int:
+    """
+    Remember the ids a filter rejected for good, so later feed checks skip them.
+
+    Call after filtering a listing or metadata; already remembered ids keep
+    their original time.
+
+    Returns:
+        Number of ids saved
+    """
+    if not video_filter.rejected:
+        return 0
+    now = time.time()
+    with _db_lock:
+        db = _get_db()
+        db.executemany(
+            "INSERT OR IGNORE INTO rejected_videos VALUES (?, ?, ?, ?)",
+            [(video_id, video_filter.key, reason, now) for video_id, reason in video_filter.rejected.items()],
+        )
+        db.commit()
+    return len(video_filter.rejected)
+
+
+def _remembered_rejections(video_ids: list[str], video_filter: VideoFilter) -> set[str]:
+    """Ids among video_ids this filter rejected before (in this process or a saved run)."""
+    found = {v for v in video_ids if v in video_filter.rejected}
+    rest = [v for v in video_ids if v not in found]
+    if not rest:
+        return found
+
+    with _db_lock:
+        rows = _get_db().execute(
+            f"SELECT video_id FROM rejected_videos "
+            f"WHERE filter_key = ? AND rejected_at > ? AND video_id IN ({','.join('?' * len(rest))})",
+            [video_filter.key, time.time() - REJECTED_TTL_SECONDS, *rest],
+        ).fetchall()
+    return found | {row[0] for row in rows}
+
+
+class FeedResult:
+    """Result of a feed fetch operation."""
+
+    def __init__(
+        self,
+        entries: list[dict[str, Any]],
+        not_modified: bool = False,
+        error: str | None = None,
+    ):
+        self.entries = entries
+        self.not_modified = not_modified
+        self.error = error
+
+    @property
+    def success(self) -> bool:
+        return self.error is None
+
+
+def parse_feed(xml_text: str) -> list[dict[str, Any]]:
+    """
+    Parse a YouTube channel Atom feed.
+
+    Returns:
+        List of entry dicts with id, title, url and published (newest first)
+    """
+    root = ET.fromstring(xml_text)
+    entries = []
+
+    for entry in root.findall("atom:entry", _NS):
+        video_id = entry.findtext("yt:videoId", namespaces=_NS)
+        if not video_id:
+            continue
+        link = entry.find("atom:link", _NS)
+        entries.append({
+            "id": video_id,
+            "title": entry.findtext("atom:title", namespaces=_NS),
+            "url": link.get("href") if link is not None else f"https://www.youtube.com/watch?v={video_id}",
+            "published": entry.findtext("atom:published", namespaces=_NS),
+        })
+
+    return entries
+
+
+def fetch_channel_feed(channel_id: str) -> FeedResult:
+    """
+    Fetch a channel's upload feed using a conditional GET.
+
+    Sends the ETag / Last-Modified validators from the previous fetch, so an
+    unchanged feed costs a single 304 with no body.
+
+    Args:
+        channel_id: YouTube channel ID (UC...)
+
+    Returns:
+        FeedResult with the current entries (cached entries on 304)
+    """
+    cached = _feed_cache.get(channel_id)
+
+    headers = {}
+    if cached:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+    try:
+        response = call_with_retry(
+            lambda: raise_for_retryable(
+                get_http_client().get(FEED_URL, params={"channel_id": channel_id}, headers=headers)
+            ),
+            "feed",
+        )
+
+        if response.status_code == 304 and cached:
+            return FeedResult(entries=cached["entries"], not_modified=True)
+
+        if response.status_code == 200:
+            entries = parse_feed(response.text)
+            _feed_cache[channel_id] = {
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "entries": entries,
+            }
+            return FeedResult(entries=entries)
+
+        return FeedResult(
+            entries=[],
+            error=f"Feed error: {response.status_code}",
+        )
+
+    except httpx.TimeoutException:
+        return FeedResult(entries=[], error="Feed timeout")
+    except Exception as e:
+        return FeedResult(entries=[], error=f"Feed error: {str(e)}")
+
+
+def feed_has_new_videos(
+    channel_id: str,
+    known_ids: set[str],
+    video_filter: VideoFilter | None = None,
+) -> bool:
+    """
+    Decide whether a channel needs a full yt-dlp listing.
+
+    Args:
+        channel_id: YouTube channel ID (UC...)
+        known_ids: YouTube IDs of videos already stored for the channel
+        video_filter: Optional filter; unseen entries it rejects (excluded
+                      titles), or rejected at an earlier listing (shorts,
+                      too short; see save_rejected), don't trigger a listing
+
+    Returns:
+        True if the feed shows unseen ids, overflows (every entry is new, so
+        there may be more beyond the feed window) or could not be fetched.
+        False only when the feed confirms there is nothing new.
+    """
+    result = fetch_channel_feed(channel_id)
+
+    if not result.success:
+        logger.info(f"[{channel_id}] {result.error}, falling back to full listing")
+        return True
+
+    unseen = [e for e in result.entries if e["id"] not in known_ids]
+    if video_filter and unseen:
+        skipped = _remembered_rejections([e["id"] for e in unseen], video_filter)
+        unseen = [e for e in unseen if e["id"] not in skipped]
+    overflow = len(unseen) >= FEED_MAX_ENTRIES
+
+    # Only count rejections the first time we see an entry (304s replay the cache)
+    if video_filter and unseen:
+        if result.not_modified:
+            unseen = [e for e in unseen if not video_filter.rejection_reason(e)]
+        else:
+            unseen = video_filter.apply(unseen, "feed")
+
+    if overflow:
+        logger.info(f"[{channel_id}] Feed overflow ({FEED_MAX_ENTRIES}+ unseen)")
+        return True
+    if unseen:
+        logger.info(f"[{channel_id}] Feed shows {len(unseen)} unseen video(s)")
+    else:
+        logger.debug(
+            f"[{channel_id}] No new videos in feed"
+            f"{' (not modified)' if result.not_modified else ''}"
+        )
+
+    return bool(unseen)
@@ -0,0 +1,148 @@
+"""
+Declarative video filters.
+
+A VideoFilter describes which videos we want (duration bounds, live status,
+title patterns, shorts). Each rule is evaluated at the earliest stage where
+the field it needs is available (listing, feed, metadata), so rejected
+videos never incur metadata or transcript requests. Rejections are counted
+per stage and rule to show how much work was avoided.
+
+Rejected videos are never stored, so the filter also remembers which ids it
+rejected for good (see rejected); the feed check uses that to tell a
+skipped upload from a new one.
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+# Stages in pipeline order
+STAGES = ("feed", "listing", "metadata")
+
+# Verdicts that can change for the same video: an upcoming stream goes live
+# and later becomes a regular upload with its final duration
+LIVE_STATUSES = ("is_live", "is_upcoming", "post_live")
+
+
+class VideoFilter:
+    """Filter spec with per-stage, per-rule rejection counters."""
+
+    def __init__(
+        self,
+        min_duration: int | None = 20 * 60,
+        max_duration: int | None = None,
+        exclude_live_status: list[str] | None = None,
+        title_exclude: list[str] | None = None,
+        title_include: list[str] | None = None,
+        exclude_shorts: bool = True,
+    ):
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.exclude_live_status = set(
+            exclude_live_status if exclude_live_status is not None else ["is_live", "is_upcoming"]
+        )
+        self.title_exclude = [re.compile(p, re.IGNORECASE) for p in title_exclude or []]
+        self.title_include = [re.compile(p, re.IGNORECASE) for p in title_include or []]
+        self.exclude_shorts = exclude_shorts
+        self.rejections: Counter[tuple[str, str]] = Counter()
+        # Video id -> rule, for rejections that won't change (see _is_final)
+        self.rejected: dict[str, str] = {}
+
+        spec = {
+            "min_duration": min_duration,
+            "max_duration": max_duration,
+            "exclude_live_status": sorted(self.exclude_live_status),
+            "title_exclude": title_exclude or [],
+            "title_include": title_include or [],
+            "exclude_shorts": exclude_shorts,
+        }
+        self.key = hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def from_dict(cls, spec: dict[str, Any]) -> "VideoFilter":
+        """Build a filter from a dict (e.g. loaded from JSON)."""
+        return cls(**spec)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "VideoFilter":
+        """Build a filter from a JSON spec file."""
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def rejection_reason(self, video: dict[str, Any]) -> str | None:
+        """
+        Return the name of the first rule that rejects the video, or None.
+
+        Rules only run when the field they need is present in the dict, so
+        the same video can be re-checked as more data becomes available.
+        A duration key that is present but None is treated as 0 (flat
+        listings omit it for upcoming streams and unavailable videos).
+        """
+        if "duration" in video:
+            duration = video.get("duration") or 0
+            if self.min_duration is not None and duration < self.min_duration:
+                return "min_duration"
+            if self.max_duration is not None and duration > self.max_duration:
+                return "max_duration"
+
+        live_status = video.get("live_status")
+        if live_status and live_status in self.exclude_live_status:
+            return "live_status"
+
+        url = video.get("url") or ""
+        if self.exclude_shorts and "/shorts/" in url:
+            return "shorts"
+
+        title = video.get("title")
+        if title is not None:
+            if any(p.search(title) for p in self.title_exclude):
+                return "title_exclude"
+            if self.title_include and not any(p.search(title) for p in self.title_include):
+                return "title_include"
+
+        return None
+
+    @staticmethod
+    def _is_final(video: dict[str, Any], reason: str) -> bool:
+        """Whether a rejection will still hold when the video is seen again."""
+        if reason == "live_status" or video.get("live_status") in LIVE_STATUSES:
+            return False
+        # A missing duration counts as 0 but may just not be known yet
+        if reason == "min_duration" and not video.get("duration"):
+            return False
+        return True
+
+    def apply(self, videos: list[dict[str, Any]], stage: str) -> list[dict[str, Any]]:
+        """Filter videos at a pipeline stage, recording rejections."""
+        kept = []
+        for video in videos:
+            if self.accepts(video, stage):
+                kept.append(video)
+        return kept
+
+    def accepts(self, video: dict[str, Any], stage: str) -> bool:
+        """Check a single video at a pipeline stage, recording a rejection."""
+        reason = self.rejection_reason(video)
+        if reason:
+            self.rejections[(stage, reason)] += 1
+            if video.get("id") and self._is_final(video, reason):
+                self.rejected[video["id"]] = reason
+            return False
+        return True
+
+    @property
+    def total_rejections(self) -> int:
+        return sum(self.rejections.values())
+
+    def summary(self) -> list[str]:
+        """Human-readable rejection counts, in pipeline order."""
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        return [
+            f"{stage}/{rule}: {count}"
+            for (stage, rule), count in sorted(
+                self.rejections.items(), key=lambda item: (order.get(item[0][0], len(order)), item[0][1])
+            )
+        ]
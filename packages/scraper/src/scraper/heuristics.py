@@ -0,0 +1,370 @@
+"""
+Rule-based guest extraction.
+
+Many videos state the guest outright: a title suffix ("Topic - Jane Doe"), a
+bio line opening the description ("Jane Doe is an American author..."), or a
+phrase like "Jane Doe joins us" / "conversation with Jane Doe". This tier
+runs before the LLM and only returns a result when independent signals
+agree, so the LLM is reserved for videos where the guest isn't obvious.
+
+The tier is opt-in (extract_people --heuristics) until held-out precision
+on labelled videos from enough channels supports skipping the LLM.
+
+Usage:
+    # Measure LLM-call reduction and precision on the labelled fixture set
+    uv run python -m scraper.heuristics --benchmark fixtures/guest_labels.json
+"""
+
+import argparse
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from .people_index import core_name, normalize_name
+
+# Skip the LLM when every guest found scores at least this much
+CONFIDENCE_THRESHOLD = 0.75
+
+# Minimum score for a candidate to count as a guest
+ACCEPT_SCORE = 0.5
+
+# Confidence that a title naming only a known host is a hosts-only episode.
+# Below CONFIDENCE_THRESHOLD on purpose: a guest the rules missed would be
+# saved as "no guests", so the LLM confirms these.
+HOST_ONLY_CONFIDENCE = 0.6
+
+# Scale confidence down when other name-like candidates were left out
+AMBIGUITY_PENALTY = 0.8
+
+# Held-out labels needed before the benchmark's precision says anything
+# beyond the channels the rules were written against
+MIN_HELD_OUT_VIDEOS = 100
+MIN_HELD_OUT_CHANNELS = 5
+
+_UPPER = "A-ZÀ-ÖØ-ÞĀ-Ž"
+_TOKEN = rf"(?:[{_UPPER}][\w'’.\-]*)"
+_PARTICLE = r"(?:de|da|di|du|van|von|der|den|del|della|la|le|bin|al|el|ibn|st\.?)"
+NAME = rf"{_TOKEN}(?:\s+(?:{_PARTICLE}\s+)?{_TOKEN}){{1,3}}"
+
+# Generic title templates: (rule, pattern with a "name" group, weight)
+TITLE_TEMPLATES: list[tuple[str, re.Pattern, float]] = [
+    ("title_suffix", re.compile(r"\s[-–—|]\s+(?P<name>[^-–—|]+?)\s*$"), 0.6),
+    ("title_prefix", re.compile(r"^(?P<name>[^:|\"“]{3,60}?):\s"), 0.5),
+    ("title_on", re.compile(rf"^(?P<name>{NAME})\s+on\s"), 0.5),
+    ("title_with", re.compile(rf"\b[Ww]ith\s+(?P<name>{NAME})\s*$"), 0.5),
+]
+
+# Description patterns: (rule, pattern with a "name" group, weight)
+DESCRIPTION_PATTERNS: list[tuple[str, re.Pattern, float]] = [
+    ("bio", re.compile(
+        rf"(?m)^\s*(?P<name>{NAME})\s*(?:,[^,\n]{{1,80}},\s*)?(?:is|was|has been)\s+"
+        r"(?:a|an|the|one|currently)\b"
+    ), 0.6),
+    ("joins", re.compile(rf"(?P<name>{NAME})\s+(?:joins|joined|sits down with)\s"), 0.4),
+    ("joined_by", re.compile(rf"\b(?:joined|accompanied) by\s+(?P<name>{NAME})"), 0.4),
+    ("conversation_with", re.compile(
+        rf"\b(?:conversation|interview|chat|discussion|talk|sit[- ]down|speaks?|sat down)\s+with\s+(?P<name>{NAME})"
+    ), 0.4),
+    ("guest_is", re.compile(
+        rf"\b(?:[Mm]y|[Oo]ur|[Tt]oday'?s|[Tt]his week'?s)\s+guest(?:\s+is|,|:)?\s+(?P<name>{NAME})"
+    ), 0.4),
+    ("guest_label", re.compile(rf"\b[Gg]uests?:\s*(?P<name>{NAME})"), 0.4),
+    ("welcome", re.compile(rf"\b[Ww]elcom(?:e|es|ing)\s+(?:back\s+)?(?P<name>{NAME})"), 0.4),
+]
+
+# Words that start a title or phrase but never a name
+NOT_NAMES = {
+    "the", "why", "how", "what", "when", "where", "who", "which", "our", "my", "we",
+    "i", "is", "a", "an", "this", "that", "these", "those", "live", "full", "part",
+    "episode", "ep", "news", "every", "new", "top", "best", "inside", "breaking",
+    "update", "watch", "join", "today", "tonight", "it", "you", "your", "they",
+}
+
+# Trailing context cut from candidate names ("David Fuller of Rebel Wisdom")
+_NAME_TAIL = re.compile(r"\s+(?:of|from|at|on|and|&|\(|aka)\s.*$|[,;(].*$")
+
+
+class HeuristicResult:
+    """Guests found by the rule-based tier, with a confidence score."""
+
+    def __init__(
+        self,
+        guests: list[dict],
+        confidence: float,
+        signals: dict[str, list[str]] | None = None,
+    ):
+        self.guests = guests
+        self.confidence = confidence
+        self.signals = signals or {}
+
+    @property
+    def confident(self) -> bool:
+        return self.confidence >= CONFIDENCE_THRESHOLD
+
+
+def clean_name(text: str) -> str | None:
+    """Trim a captured name and return it if it looks like a person's name."""
+    text = text.strip().strip("\"'“”‘’").strip()
+    text = _NAME_TAIL.sub("", text).strip()
+
+    if not re.fullmatch(NAME, text):
+        return None
+
+    tokens = text.split()
+    if tokens[0].lower().strip(".") in NOT_NAMES:
+        return None
+    if any(ch.isdigit() for ch in text):
+        return None
+    # ALL-CAPS words are shouting, not names ("INVESTMENT BANKER", "AI CEO")
+    if any(len(t) > 1 and t.isupper() and "." not in t for t in tokens):
+        return None
+
+    return text
+
+
+def names_match(name: str, others: list[str]) -> bool:
+    """True if name is the same person as any of others (normalised or first + last name)."""
+    normalized = normalize_name(name)
+    core = core_name(normalized)
+    for other in others:
+        other_normalized = normalize_name(other)
+        if normalized == other_normalized or (core and core == core_name(other_normalized)):
+            return True
+    return False
+
+
+def extract_guests_heuristic(
+    title: str,
+    description: str,
+    host_names: list[str] | None = None,
+    channel_name: str | None = None,
+    title_templates: list[tuple[str, re.Pattern, float]] | None = None,
+    description_weights: dict[str, float] | None = None,
+) -> HeuristicResult:
+    """
+    Find guests from title and description patterns.
+
+    Args:
+        title: Video title
+        description: Video description
+        host_names: Known hosts (never returned as guests)
+        channel_name: Channel name (never returned as a guest)
+        title_templates: (rule, pattern, weight) title templates to use
+                         instead of the generic TITLE_TEMPLATES
+        description_weights: Per-rule weight overrides for DESCRIPTION_PATTERNS
+                             (e.g. learned per channel, see templates.py)
+
+    Returns:
+        HeuristicResult; check .confident before skipping the LLM
+    """
+    host_names = host_names or []
+    excluded = host_names + ([channel_name] if channel_name else [])
+
+    description_weights = description_weights or {}
+
+    # normalized name -> {"name", "weights": {signal: weight}, "rules": [...]}
+    candidates: dict[str, dict[str, Any]] = {}
+
+    def add(raw: str, rule: str, signal: str, weight: float, from_description: bool) -> None:
+        name = clean_name(raw)
+        if not name:
+            return
+        candidate = candidates.setdefault(normalize_name(name), {"name": name, "weights": {}, "rules": []})
+        candidate["weights"][signal] = max(weight, candidate["weights"].get(signal, 0.0))
+        candidate["rules"].append(rule)
+        if from_description:
+            candidate["name"] = name  # prefer the description's spelling
+
+    # All title templates read the same evidence, so they count as one signal
+    for rule, pattern, weight in title_templates or TITLE_TEMPLATES:
+        match = pattern.search(title or "")
+        if match:
+            add(match.group("name"), rule, "title", weight, from_description=False)
+
+    for rule, pattern, weight in DESCRIPTION_PATTERNS:
+        weight = description_weights.get(rule, weight)
+        for match in pattern.finditer((description or "")[:2000]):
+            add(match.group("name"), rule, rule, weight, from_description=True)
+
+    # Fold "Hilarious Comedian Jeff Dye" / "Adam Carolla Unfiltered" into the bare name
+    for key in sorted(candidates, key=len, reverse=True):
+        target = next(
+            (o for o in candidates if o != key and (key.endswith(" " + o) or key.startswith(o + " "))),
+            None,
+        )
+        if target:
+            merged = candidates.pop(key)
+            for signal, weight in merged["weights"].items():
+                weights = candidates[target]["weights"]
+                weights[signal] = max(weight, weights.get(signal, 0.0))
+            candidates[target]["rules"].extend(merged["rules"])
+
+    # Independent signals combine as a noisy-or
+    for candidate in candidates.values():
+        miss = 1.0
+        for weight in candidate["weights"].values():
+            miss *= 1 - weight
+        candidate["score"] = 1 - miss
+
+    host_hit = any(names_match(c["name"], host_names) for c in candidates.values())
+    others = [c for c in candidates.values() if not names_match(c["name"], excluded)]
+    accepted = [c for c in others if c["score"] >= ACCEPT_SCORE]
+    signals = {c["name"]: c["rules"] for c in candidates.values()}
+
+    if not accepted:
+        if host_hit and not others:
+            return HeuristicResult([], HOST_ONLY_CONFIDENCE, signals)
+        return HeuristicResult([], 0.0, signals)
+
+    confidence = min(c["score"] for c in accepted)
+    if len(accepted) < len(others):
+        confidence *= AMBIGUITY_PENALTY
+
+    guests = [{"name": c["name"], "role": "guest"} for c in accepted]
+    return HeuristicResult(guests, confidence, signals)
+
+
+# =============================================================================
+# Benchmark
+# =============================================================================
+
+def _same_guests(predicted: list[dict], expected: list[str]) -> bool:
+    predicted_names = [g["name"] for g in predicted]
+    return (
+        len(predicted_names) == len(expected)
+        and all(names_match(name, expected) for name in predicted_names)
+    )
+
+
+def _split(video: dict, dev_channels: set[str]) -> str:
+    if not video.get("id"):
+        return "synthetic"
+    return "dev" if video.get("channel") in dev_channels else "held_out"
+
+
+def run_benchmark(
+    fixture_path: Path,
+    verbose: bool = True,
+    templates_for: Callable[[list[dict], int], Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Score the heuristic tier against labelled videos.
+
+    The fixture is JSON with a "videos" list; each video has title,
+    description, channel, hosts and the expected guests (names). Videos
+    are scored per split: "dev" (channels listed in the fixture's
+    dev_channels, which the rules were written against), "held_out" (real
+    videos from other channels) and "synthetic" (no id). Only held-out
+    precision measures how the rules generalise.
+
+    Args:
+        fixture_path: Fixture JSON path
+        verbose: Print the summary
+        templates_for: Optional (videos, index) -> ChannelTemplates, to score
+                       with per-channel templates (see templates.py)
+
+    Returns:
+        Stats dict with videos, llm_calls_avoided, agreement, timing, per-split
+        stats (videos, channels, confident, agreed, precision) and
+        held_out_sufficient
+    """
+    with open(fixture_path, encoding="utf-8") as f:
+        fixture = json.load(f)
+    videos = fixture["videos"]
+    dev_channels = set(fixture.get("dev_channels") or [])
+
+    stats: dict[str, Any] = {"videos": len(videos), "confident": 0, "agreed": 0, "disagreements": []}
+    splits: dict[str, dict[str, Any]] = {
+        name: {"videos": 0, "channels": set(), "confident": 0, "agreed": 0}
+        for name in ("dev", "held_out", "synthetic")
+    }
+
+    channel_templates = [templates_for(videos, i) if templates_for else None for i in range(len(videos))]
+
+    start = time.perf_counter()
+    results = [
+        extract_guests_heuristic(
+            v["title"],
+            v.get("description") or "",
+            v.get("hosts"),
+            v.get("channel"),
+            title_templates=t.heuristic_templates() if t else None,
+            description_weights=t.description_weights if t else None,
+        )
+        for v, t in zip(videos, channel_templates)
+    ]
+    elapsed = time.perf_counter() - start
+
+    for video, result in zip(videos, results):
+        split = splits[_split(video, dev_channels)]
+        split["videos"] += 1
+        split["channels"].add(video.get("channel"))
+        if not result.confident:
+            continue
+        stats["confident"] += 1
+        split["confident"] += 1
+        if _same_guests(result.guests, video["guests"]):
+            stats["agreed"] += 1
+            split["agreed"] += 1
+        else:
+            stats["disagreements"].append(
+                f"{video['title'][:60]}: got {[g['name'] for g in result.guests]}, expected {video['guests']}"
+            )
+
+    stats["llm_calls_avoided"] = stats["confident"] / len(videos) if videos else 0.0
+    stats["agreement"] = stats["agreed"] / stats["confident"] if stats["confident"] else 0.0
+    stats["microseconds_per_video"] = elapsed / len(videos) * 1e6 if videos else 0.0
+    for split in splits.values():
+        split["channels"] = len(split["channels"])
+        split["precision"] = split["agreed"] / split["confident"] if split["confident"] else None
+    stats["splits"] = splits
+    held_out = splits["held_out"]
+    stats["held_out_sufficient"] = (
+        held_out["videos"] >= MIN_HELD_OUT_VIDEOS and held_out["channels"] >= MIN_HELD_OUT_CHANNELS
+    )
+
+    if verbose:
+        print(f"\n{'='*60}")
+        print("SUMMARY")
+        print(f"{'='*60}")
+        print(f"Videos: {stats['videos']}")
+        print(f"LLM calls avoided: {stats['confident']} ({stats['llm_calls_avoided']:.0%})")
+        print(f"Agreement with labels: {stats['agreed']}/{stats['confident']} ({stats['agreement']:.0%})")
+        print(f"Time per video: {stats['microseconds_per_video']:.0f}µs")
+        for name, split in splits.items():
+            precision = f"{split['precision']:.0%}" if split["precision"] is not None else "n/a"
+            print(
+                f"  {name}: {split['videos']} videos from {split['channels']} channel(s), "
+                f"{split['confident']} skipped, precision {split['agreed']}/{split['confident']} ({precision})"
+            )
+        if not stats["held_out_sufficient"]:
+            print(
+                f"Held-out split too small ({held_out['videos']} videos from {held_out['channels']} channel(s); "
+                f"need {MIN_HELD_OUT_VIDEOS} from {MIN_HELD_OUT_CHANNELS}): "
+                "not evidence for skipping the LLM by default"
+            )
+        if stats["disagreements"]:
+            print(f"Disagreements: {len(stats['disagreements'])}")
+            for line in stats["disagreements"]:
+                print(f"  - {line}")
+
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rule-based guest extraction")
+    parser.add_argument(
+        "--benchmark",
+        type=Path,
+        metavar="FIXTURE",
+        required=True,
+        help="Labelled fixture JSON to score the heuristics against",
+    )
+    args = parser.parse_args()
+    run_benchmark(args.benchmark)
+
+
+if __name__ == "__main__":
+    main()
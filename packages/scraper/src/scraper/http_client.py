@@ -0,0 +1,164 @@
+"""
+Shared HTTP client for the scraper.
+
+One process-wide httpx.Client with keep-alive pools and HTTP/2, so repeated
+calls to Supadata, Wikipedia, the YouTube feed and the LLM APIs reuse
+connections instead of paying DNS + TCP + TLS on every request.
+
+Connection reuse is tracked via httpcore trace events and exposed through
+get_http_stats().
+"""
+
+import os
+import threading
+from collections import Counter
+from typing import Any
+
+import httpx
+from dotenv import load_dotenv
+
+load_dotenv()
+
+USER_AGENT = "DecompressScraper/1.0 (podcast-video-scraper; contact@example.com)"
+
+# Pool defaults (overridable via environment)
+MAX_CONNECTIONS = int(os.getenv("SCRAPER_HTTP_MAX_CONNECTIONS", "50"))
+KEEPALIVE_EXPIRY = float(os.getenv("SCRAPER_HTTP_KEEPALIVE_EXPIRY", "60"))
+DEFAULT_TIMEOUT = float(os.getenv("SCRAPER_HTTP_TIMEOUT", "30"))
+CONNECT_TIMEOUT = 10.0
+HTTP2_ENABLED = os.getenv("SCRAPER_HTTP2", "1") != "0"
+
+# Per-host pool size and request timeout. Hosts without a timeout keep
+# whatever the caller asks for; the OpenAI/Anthropic SDKs are given an
+# explicit one (summarize.LLM_TIMEOUT), else they would take DEFAULT_TIMEOUT.
+HOST_LIMITS: dict[str, dict[str, Any]] = {
+    "api.supadata.ai": {"max_connections": 10, "timeout": 30.0},
+    "en.wikipedia.org": {"max_connections": 4, "timeout": 10.0},
+    "www.youtube.com": {"max_connections": 10, "timeout": 10.0},
+    "api.openai.com": {"max_connections": 20},
+    "api.anthropic.com": {"max_connections": 20},
+}
+
+_client: httpx.Client | None = None
+_client_lock = threading.Lock()
+
+_stats: Counter[str] = Counter()
+_stats_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs the optional h2 package (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _count(key: str) -> None:
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _trace(event_name: str, info: dict) -> None:
+    """httpcore trace callback: count new connections and TLS handshakes."""
+    if event_name == "connection.connect_tcp.complete":
+        _count("new_connections")
+    elif event_name == "connection.start_tls.complete":
+        _count("tls_handshakes")
+
+
+def _on_request(request: httpx.Request) -> None:
+    """Apply per-host timeouts and attach the connection trace hook."""
+    _count("requests")
+    _count(f"host:{request.url.host}")
+
+    host_timeout = HOST_LIMITS.get(request.url.host, {}).get("timeout")
+    if host_timeout is not None:
+        request.extensions["timeout"] = httpx.Timeout(
+            host_timeout, connect=min(CONNECT_TIMEOUT, host_timeout)
+        ).as_dict()
+
+    request.extensions["trace"] = _trace
+
+
+def _on_response(response: httpx.Response) -> None:
+    if response.http_version == "HTTP/2":
+        _count("http2_responses")
+
+
+def get_http_client() -> httpx.Client:
+    """Get or create the shared HTTP client."""
+    global _client
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                http2 = HTTP2_ENABLED and _http2_available()
+
+                mounts = {
+                    f"https://{host}": httpx.HTTPTransport(
+                        http2=http2,
+                        limits=httpx.Limits(
+                            max_connections=config["max_connections"],
+                            max_keepalive_connections=config["max_connections"],
+                            keepalive_expiry=KEEPALIVE_EXPIRY,
+                        ),
+                    )
+                    for host, config in HOST_LIMITS.items()
+                }
+
+                _client = httpx.Client(
+                    http2=http2,
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_CONNECTIONS,
+                        keepalive_expiry=KEEPALIVE_EXPIRY,
+                    ),
+                    timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=CONNECT_TIMEOUT),
+                    headers={"User-Agent": USER_AGENT},
+                    mounts=mounts,
+                    event_hooks={"request": [_on_request], "response": [_on_response]},
+                )
+
+    return _client
+
+
+def get_http_stats() -> dict[str, Any]:
+    """
+    Get connection reuse metrics for the shared client.
+
+    Returns:
+        Dict with requests, new_connections, reused_connections,
+        tls_handshakes, http2_responses and per-host request counts
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+
+    requests = stats.get("requests", 0)
+    new_connections = stats.get("new_connections", 0)
+
+    return {
+        "requests": requests,
+        "new_connections": new_connections,
+        "reused_connections": max(requests - new_connections, 0),
+        "tls_handshakes": stats.get("tls_handshakes", 0),
+        "http2_responses": stats.get("http2_responses", 0),
+        "hosts": {
+            key.split(":", 1)[1]: count
+            for key, count in stats.items()
+            if key.startswith("host:")
+        },
+    }
+
+
+def format_http_stats() -> str | None:
+    """One-line summary of connection reuse, or None if no requests were made."""
+    stats = get_http_stats()
+    if not stats["requests"]:
+        return None
+    reuse = stats["reused_connections"] / stats["requests"] * 100
+    return (
+        f"HTTP: {stats['requests']} requests, {stats['new_connections']} new connections "
+        f"({reuse:.0f}% reused, {stats['http2_responses']} over HTTP/2)"
+    )
@@ -0,0 +1,199 @@
+"""
+Local memoization of LLM responses.
+
+Responses are keyed by a hash of everything that determines them (provider,
+model, system prompt, prompt, request parameters and PROMPT_VERSION) and
+stored in SQLite, so re-running extraction after a fix that doesn't touch
+the prompts (e.g. a database write bug) costs zero tokens.
+
+The cache is bounded by size: once it grows past SCRAPER_LLM_CACHE_MAX_MB,
+the least recently used responses are evicted. Set SCRAPER_LLM_CACHE=0 (or
+pass --no-llm-cache) to bypass it.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_DIR = Path(os.getenv("SCRAPER_CACHE_DIR", Path(__file__).parent.parent.parent / ".cache"))
+
+# Bump to invalidate every cached response (e.g. after changing how replies are parsed)
+PROMPT_VERSION = 1
+
+MAX_CACHE_BYTES = int(float(os.getenv("SCRAPER_LLM_CACHE_MAX_MB", "100")) * 1024 * 1024)
+
+# Evict down to this fraction of the limit, so eviction doesn't run on every insert
+EVICT_TO = 0.9
+
+_enabled = os.getenv("SCRAPER_LLM_CACHE", "1") != "0"
+
+_db: sqlite3.Connection | None = None
+_db_lock = threading.Lock()
+
+_stats: Counter[str] = Counter()
+_stats_lock = threading.Lock()
+
+
+def _count(key: str, n: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += n
+
+
+def set_llm_cache_enabled(enabled: bool) -> None:
+    """Turn the cache on or off for this process (off = always call the API)."""
+    global _enabled
+    _enabled = enabled
+
+
+def _get_db() -> sqlite3.Connection:
+    """Get or create the SQLite cache connection."""
+    global _db
+
+    if _db is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _db = sqlite3.connect(CACHE_DIR / "llm_cache.sqlite", check_same_thread=False)
+        _db.execute(
+            """CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                content TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )"""
+        )
+        _db.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_used_at ON llm_responses(used_at)")
+        _db.commit()
+
+    return _db
+
+
+def cache_key(provider: str, model: str, system: str, prompt: str, **params: Any) -> str:
+    """Deterministic key for a request."""
+    payload = json.dumps(
+        {
+            "version": PROMPT_VERSION,
+            "provider": provider,
+            "model": model,
+            "system": system,
+            "prompt": prompt,
+            "params": params,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _get(key: str) -> str | None:
+    with _db_lock:
+        db = _get_db()
+        row = db.execute("SELECT content FROM llm_responses WHERE key = ?", (key,)).fetchone()
+        if row:
+            db.execute("UPDATE llm_responses SET used_at = ? WHERE key = ?", (time.time(), key))
+            db.commit()
+    return row[0] if row else None
+
+
+def _put(key: str, provider: str, model: str, content: str) -> None:
+    now = time.time()
+    size = len(content.encode("utf-8"))
+
+    with _db_lock:
+        db = _get_db()
+        db.execute(
+            "INSERT OR REPLACE INTO llm_responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, provider, model, content, size, now, now),
+        )
+
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM llm_responses").fetchone()[0]
+        if total > MAX_CACHE_BYTES:
+            # Drop least recently used rows until under EVICT_TO of the limit
+            excess = total - int(MAX_CACHE_BYTES * EVICT_TO)
+            freed = 0
+            stale = []
+            for old_key, old_size in db.execute(
+                "SELECT key, size FROM llm_responses ORDER BY used_at"
+            ):
+                if freed >= excess:
+                    break
+                stale.append((old_key,))
+                freed += old_size
+            db.executemany("DELETE FROM llm_responses WHERE key = ?", stale)
+            _count("evicted", len(stale))
+
+        db.commit()
+
+
+def _delete(key: str) -> None:
+    with _db_lock:
+        db = _get_db()
+        db.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+        db.commit()
+
+
+def cached_completion(
+    provider: str,
+    model: str,
+    system: str,
+    prompt: str,
+    create: Callable[[], str],
+    parse: Callable[[str], Any],
+    **params: Any,
+) -> Any:
+    """
+    Return the parsed response for a request, calling the API only on a miss.
+
+    Args:
+        provider, model, system, prompt, params: Everything that determines the response
+        create: Makes the API call and returns the raw response text
+        parse: Parses the response text; responses that fail to parse are
+               not cached (and raise as usual)
+
+    Returns:
+        parse(response text)
+    """
+    if not _enabled:
+        return parse(create())
+
+    key = cache_key(provider, model, system, prompt, **params)
+
+    content = _get(key)
+    if content is not None:
+        try:
+            result = parse(content)
+            _count("hits")
+            return result
+        except Exception:
+            _delete(key)
+
+    _count("misses")
+    content = create()
+    result = parse(content)
+    _put(key, provider, model, content)
+    return result
+
+
+def get_llm_cache_stats() -> dict[str, int]:
+    """Hits, misses and evictions in this process."""
+    with _stats_lock:
+        return {"hits": _stats["hits"], "misses": _stats["misses"], "evicted": _stats["evicted"]}
+
+
+def format_llm_cache_stats() -> str | None:
+    """One-line cache summary, or None if the cache wasn't used."""
+    stats = get_llm_cache_stats()
+    if not stats["hits"] and not stats["misses"]:
+        return None
+    return f"LLM cache: {stats['hits']} hits, {stats['misses']} misses"
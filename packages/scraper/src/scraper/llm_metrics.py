@@ -0,0 +1,357 @@
+"""
+Token, cost and latency instrumentation for LLM calls.
+
+Every OpenAI/Anthropic request in summarize.py and extract_people.py goes
+through call_llm() (or call_llm_stream() for streamed completions), which
+records the caller stage, model, prompt and completion tokens, latency, SDK
+retries and, for streams, the time to the first token. The per-run rollup is printed in
+the CLI SUMMARY blocks (format_llm_usage) and can be written to a metrics
+file: JSON lines, or Prometheus text format when the path ends in .prom
+(e.g. for the node_exporter textfile collector).
+
+Usage:
+    # Write metrics at the end of a run
+    SCRAPER_LLM_METRICS_FILE=.cache/llm_metrics.jsonl uv run extract-people
+    uv run summarize --metrics-file /var/lib/node_exporter/scraper_llm.prom
+"""
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+
+from .metrics import escape_label_value
+
+load_dotenv()
+
+# USD per million (prompt, completion) tokens. Unknown models are reported without a cost.
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "claude-sonnet-4-20250514": (3.00, 15.00),
+    "claude-3-5-haiku-20241022": (0.80, 4.00),
+}
+
+METRICS_FILE = os.getenv("SCRAPER_LLM_METRICS_FILE")
+
+_calls: list[dict[str, Any]] = []
+_calls_lock = threading.Lock()
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float | None:
+    """Cost of a call in USD, or None if the model has no known price."""
+    prices = MODEL_PRICES.get(model)
+    if prices is None:
+        return None
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+def _usage_tokens(usage: Any) -> tuple[int, int]:
+    """(prompt, completion) tokens from an OpenAI or Anthropic usage object."""
+    if usage is None:
+        return 0, 0
+    prompt = getattr(usage, "prompt_tokens", None)
+    if prompt is None:
+        prompt = getattr(usage, "input_tokens", 0)
+    completion = getattr(usage, "completion_tokens", None)
+    if completion is None:
+        completion = getattr(usage, "output_tokens", 0)
+    return prompt or 0, completion or 0
+
+
+def record_llm_call(
+    stage: str,
+    provider: str,
+    model: str,
+    prompt_tokens: int = 0,
+    completion_tokens: int = 0,
+    latency: float = 0.0,
+    retries: int = 0,
+    error: str | None = None,
+    first_token: float | None = None,
+) -> dict[str, Any]:
+    """Record one LLM request and return the record (first_token: seconds to the first streamed text)."""
+    record = {
+        "stage": stage,
+        "provider": provider,
+        "model": model,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "latency": latency,
+        "retries": retries,
+        "cost": estimate_cost(model, prompt_tokens, completion_tokens),
+        "error": error,
+        "first_token": first_token,
+        "at": datetime.now(timezone.utc).isoformat(),
+    }
+    with _calls_lock:
+        _calls.append(record)
+    return record
+
+
+def call_llm(stage: str, provider: str, model: str, create_raw: Callable[[], Any]) -> Any:
+    """
+    Make an instrumented LLM request.
+
+    Args:
+        stage: Caller stage for the rollup (e.g. "summary", "guests")
+        provider: "openai" or "anthropic"
+        model: Model name (used for pricing)
+        create_raw: Makes the request via the SDK's with_raw_response, so the
+                    retry count is available
+
+    Returns:
+        The parsed SDK response (ChatCompletion / Message)
+    """
+    start = time.perf_counter()
+    try:
+        raw = create_raw()
+        response = raw.parse()
+    except Exception as e:
+        record_llm_call(stage, provider, model, latency=time.perf_counter() - start, error=type(e).__name__)
+        raise
+
+    prompt_tokens, completion_tokens = _usage_tokens(getattr(response, "usage", None))
+    record_llm_call(
+        stage,
+        provider,
+        model,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        latency=time.perf_counter() - start,
+        retries=getattr(raw, "retries_taken", 0) or 0,
+    )
+    return response
+
+
+def _stream_event(provider: str, event: Any) -> tuple[str, int | None, int | None]:
+    """(text, prompt tokens, completion tokens) carried by one stream event; None: not in this event."""
+    if provider == "anthropic":
+        if event.type == "message_start":
+            prompt, completion = _usage_tokens(event.message.usage)
+            return "", prompt, completion
+        if event.type == "content_block_delta" and event.delta.type == "text_delta":
+            return event.delta.text, None, None
+        if event.type == "message_delta":
+            # Cumulative output tokens of the message so far
+            return "", None, event.usage.output_tokens
+        return "", None, None
+
+    # OpenAI: with include_usage, the last chunk has the usage and no choices
+    text = (event.choices[0].delta.content or "") if event.choices else ""
+    if event.usage is not None:
+        prompt, completion = _usage_tokens(event.usage)
+        return text, prompt, completion
+    return text, None, None
+
+
+def call_llm_stream(
+    stage: str,
+    provider: str,
+    model: str,
+    create_raw: Callable[[], Any],
+    on_delta: Callable[[str], None],
+) -> str:
+    """
+    Make an instrumented streaming LLM request.
+
+    Args:
+        stage: Caller stage for the rollup (e.g. "summary")
+        provider: "openai" or "anthropic"
+        model: Model name (used for pricing)
+        create_raw: Makes the request with stream=True via the SDK's
+                    with_raw_response (for OpenAI also with
+                    stream_options={"include_usage": True}, or no tokens are
+                    recorded)
+        on_delta: Called with each piece of text as it arrives
+
+    Returns:
+        The full completion text
+    """
+    start = time.perf_counter()
+    first_token = None
+    prompt_tokens = completion_tokens = retries = 0
+    parts: list[str] = []
+    try:
+        raw = create_raw()
+        retries = getattr(raw, "retries_taken", 0) or 0
+        for event in raw.parse():
+            text, prompt, completion = _stream_event(provider, event)
+            prompt_tokens = prompt if prompt is not None else prompt_tokens
+            completion_tokens = completion if completion is not None else completion_tokens
+            if text:
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                parts.append(text)
+                on_delta(text)
+    except Exception as e:
+        # Tokens streamed before the failure are billed too
+        record_llm_call(
+            stage,
+            provider,
+            model,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            latency=time.perf_counter() - start,
+            retries=retries,
+            error=type(e).__name__,
+            first_token=first_token,
+        )
+        raise
+
+    record_llm_call(
+        stage,
+        provider,
+        model,
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        latency=time.perf_counter() - start,
+        retries=retries,
+        first_token=first_token,
+    )
+    return "".join(parts)
+
+
+def get_llm_calls() -> list[dict[str, Any]]:
+    """All LLM calls recorded in this process."""
+    with _calls_lock:
+        return list(_calls)
+
+
+def get_llm_usage() -> dict[tuple[str, str], dict[str, Any]]:
+    """
+    Roll up recorded calls per (stage, model).
+
+    Returns:
+        Dict mapping (stage, model) to calls, errors, retries, prompt_tokens,
+        completion_tokens, latency (total seconds), cost (None if unpriced),
+        streamed (calls with a first token) and first_token (total seconds)
+    """
+    usage: dict[tuple[str, str], dict[str, Any]] = {}
+    for call in get_llm_calls():
+        row = usage.setdefault(
+            (call["stage"], call["model"]),
+            {
+                "provider": call["provider"],
+                "calls": 0,
+                "errors": 0,
+                "retries": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "latency": 0.0,
+                "cost": 0.0,
+                "streamed": 0,
+                "first_token": 0.0,
+            },
+        )
+        row["calls"] += 1
+        row["errors"] += 1 if call["error"] else 0
+        row["retries"] += call["retries"]
+        row["prompt_tokens"] += call["prompt_tokens"]
+        row["completion_tokens"] += call["completion_tokens"]
+        row["latency"] += call["latency"]
+        row["cost"] = None if row["cost"] is None or call["cost"] is None else row["cost"] + call["cost"]
+        if call.get("first_token") is not None:
+            row["streamed"] += 1
+            row["first_token"] += call["first_token"]
+    return usage
+
+
+def format_llm_usage() -> str | None:
+    """Per-stage cost/latency rollup for SUMMARY blocks, or None if no calls were made."""
+    usage = get_llm_usage()
+    if not usage:
+        return None
+
+    lines = ["LLM usage:"]
+    total_cost = 0.0
+    for (stage, model), row in sorted(usage.items()):
+        cost = f"${row['cost']:.4f}" if row["cost"] is not None else "cost unknown"
+        total_cost += row["cost"] or 0.0
+        line = (
+            f"  {stage} ({model}): {row['calls']} calls, "
+            f"{row['prompt_tokens']:,} in / {row['completion_tokens']:,} out tokens, "
+            f"{row['latency'] / row['calls']:.1f}s avg, {cost}"
+        )
+        if row["streamed"]:
+            line += f", first token {row['first_token'] / row['streamed']:.1f}s avg"
+        if row["retries"] or row["errors"]:
+            line += f", {row['retries']} retries, {row['errors']} errors"
+        lines.append(line)
+    lines.append(f"  Total: ${total_cost:.4f}")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+def prometheus_text() -> str:
+    """Per-stage LLM rollup in Prometheus text format."""
+    metrics = [
+        ("scraper_llm_calls_total", "counter", "LLM requests", "calls"),
+        ("scraper_llm_errors_total", "counter", "Failed LLM requests", "errors"),
+        ("scraper_llm_retries_total", "counter", "SDK retries of LLM requests", "retries"),
+        ("scraper_llm_prompt_tokens_total", "counter", "Prompt tokens", "prompt_tokens"),
+        ("scraper_llm_completion_tokens_total", "counter", "Completion tokens", "completion_tokens"),
+        ("scraper_llm_latency_seconds_total", "counter", "Total LLM request latency", "latency"),
+        ("scraper_llm_streamed_total", "counter", "Streamed LLM requests that returned text", "streamed"),
+        ("scraper_llm_first_token_seconds_total", "counter", "Total time to first token of streamed requests", "first_token"),
+        ("scraper_llm_cost_usd_total", "counter", "Estimated LLM cost in USD", "cost"),
+    ]
+    usage = get_llm_usage()
+
+    lines = []
+    for name, kind, help_text, field in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for (stage, model), row in sorted(usage.items()):
+            if row[field] is None:
+                continue
+            labels = ",".join(
+                f'{k}="{escape_label_value(v)}"'
+                for k, v in (("stage", stage), ("provider", row["provider"]), ("model", model))
+            )
+            lines.append(f"{name}{{{labels}}} {row[field]}")
+    return "\n".join(lines) + "\n"
+
+
+def write_llm_metrics(path: str | Path | None = None) -> Path | None:
+    """
+    Write this run's LLM metrics.
+
+    Paths ending in .prom are overwritten with Prometheus text format (one
+    rollup per run); anything else gets one JSON line per call appended.
+
+    Args:
+        path: Output file (default: SCRAPER_LLM_METRICS_FILE; nothing is
+              written if neither is set or no calls were made)
+
+    Returns:
+        The path written, or None
+    """
+    path = path or METRICS_FILE
+    calls = get_llm_calls()
+    if not path or not calls:
+        return None
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if path.suffix == ".prom":
+        # Write-then-rename so a scraper never reads a half-written file
+        tmp = path.with_suffix(".prom.tmp")
+        tmp.write_text(prometheus_text(), encoding="utf-8")
+        tmp.replace(path)
+    else:
+        with open(path, "a", encoding="utf-8") as f:
+            for call in calls:
+                f.write(json.dumps(call) + "\n")
+
+    return path
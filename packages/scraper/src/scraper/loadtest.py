@@ -0,0 +1,459 @@
+"""
+Load generator for the scraper's db layer.
+
+Replays the scrape and people-extraction write patterns of scrape_to_db and
+extract_people through the real scraper.db functions, at scale (default:
+100k videos with 10 tags each, i.e. 1M video_tags rows), and reports
+latency per db function. Use it to compare batch sizes, concurrency or index
+changes before they reach production.
+
+Targets:
+    local    Start a throwaway local Supabase stack (Postgres + PostgREST with
+             the API migrations applied; see localdb.py). Needs Docker.
+    url      An already running local stack (--supabase-url/--secret-key,
+             e.g. from `npx supabase start` in packages/api). Only local URLs
+             are accepted.
+    standin  The in-memory PostgREST stand-in from standins.py. No Docker,
+             but rows are scanned linearly: smoke tests at small scale only.
+
+Per channel, a scrape worker runs get_or_create_source, create_scrape_log,
+get_existing_external_ids, get_recent_published_at, upsert_videos_batch per
+batch, add_video_tags per video, video_has_transcript/update_video_transcript
+for a share of the videos, then complete_scrape_log and
+update_source_scraped_at. Extraction then links a verified host per channel
+and guests per video batch (link_people, add_person_aliases,
+mark_people_extracted), and polls get_videos_without_transcript.
+
+Usage:
+    uv run python -m scraper.loadtest
+    uv run python -m scraper.loadtest --videos 10000 --concurrency 16 --batch-size 200
+    uv run python -m scraper.loadtest --target standin --videos 500
+    uv run python -m scraper.loadtest --target url --supabase-url http://127.0.0.1:54321 --secret-key ...
+"""
+
+import argparse
+import functools
+import json
+import logging
+import os
+import random
+import string
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import accumulate
+from pathlib import Path
+from typing import Any
+
+from . import db
+from .localdb import LocalSupabase, is_local_url
+from .metrics import count, get_counter, get_stage_stats, reset_metrics, timer
+
+logger = logging.getLogger(__name__)
+
+# db functions timed by the load test (nested calls are timed too, e.g.
+# get_or_create_tag inside add_video_tags)
+DB_FUNCTIONS = [
+    "get_or_create_source",
+    "create_scrape_log",
+    "get_existing_external_ids",
+    "get_recent_published_at",
+    "upsert_videos_batch",
+    "add_video_tags",
+    "get_or_create_tag",
+    "video_has_transcript",
+    "update_video_transcript",
+    "complete_scrape_log",
+    "update_source_scraped_at",
+    "get_videos_without_transcript",
+    "upsert_people",
+    "link_people",
+    "add_person_aliases",
+    "mark_people_extracted",
+]
+
+FIRST_NAMES = [
+    "Alex", "Sam", "Jordan", "Taylor", "Chris", "Morgan", "Jamie", "Casey", "Robin", "Avery",
+    "Maria", "David", "Sarah", "James", "Priya", "Wei", "Elena", "Omar", "Hannah", "Lucas",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Lee", "Garcia", "Brown", "Martinez", "Nguyen", "Patel", "Kim", "Chen",
+    "Rossi", "Müller", "Silva", "Cohen", "Walker", "Young", "Hughes", "Okafor", "Novak", "Sato",
+]
+
+# Share of a channel's guests that have appeared on it before (people are reused)
+RETURNING_GUEST_RATE = 0.3
+
+DESCRIPTION_WORDS = (
+    "today we talk about technology politics science history health business culture "
+    "sponsor episode guest book new podcast interview story life career future"
+).split()
+
+
+def _instrument_db() -> None:
+    """Wrap the db functions in stage timers (stage "db", label function=name)."""
+    for name in DB_FUNCTIONS:
+        original = getattr(db, name)
+        if getattr(original, "_loadtest_timed", False):
+            continue
+
+        def timed(*args: Any, _name: str = name, _original: Callable = original, **kwargs: Any) -> Any:
+            with timer("db", function=_name):
+                return _original(*args, **kwargs)
+
+        functools.update_wrapper(timed, original)
+        timed._loadtest_timed = True
+        setattr(db, name, timed)
+
+
+# =============================================================================
+# Synthetic data
+# =============================================================================
+
+class Workload:
+    """Deterministic synthetic channels, videos, tags and guests."""
+
+    def __init__(
+        self,
+        videos: int,
+        videos_per_channel: int,
+        tags_per_video: int,
+        tag_vocabulary: int,
+        seed: int,
+    ):
+        self.videos = videos
+        self.videos_per_channel = videos_per_channel
+        self.tags_per_video = tags_per_video
+        self.seed = seed
+        self.channels = max(1, -(-videos // videos_per_channel))
+
+        # Zipf-like tag popularity, as in real channel tags ("podcast" everywhere, long tail)
+        self.tags = [f"topic {i}" for i in range(tag_vocabulary)]
+        weights = [1 / (rank + 1) for rank in range(tag_vocabulary)]
+        self._tag_cum_weights = list(accumulate(weights))
+
+    def channel(self, index: int) -> dict[str, Any]:
+        rng = random.Random(f"{self.seed}-channel-{index}")
+        first = index * self.videos_per_channel
+        n_videos = min(self.videos_per_channel, self.videos - first)
+        host = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}"
+
+        guests: list[str] = []
+        videos = []
+        for i in range(n_videos):
+            if guests and rng.random() < RETURNING_GUEST_RATE:
+                guest = rng.choice(guests)
+            else:
+                guest = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {index}-{i}"
+                guests.append(guest)
+
+            duration = rng.randint(1200, 10800)
+            day = 1 + (i % 28)
+            videos.append({
+                "id": "".join(rng.choices(string.ascii_letters + string.digits + "-_", k=11)),
+                "url": None,
+                "title": f"Episode {i + 1} - {guest}",
+                "description": " ".join(rng.choices(DESCRIPTION_WORDS, k=rng.randint(50, 400))),
+                "duration": duration,
+                "duration_string": f"{duration // 3600}:{duration % 3600 // 60:02d}:{duration % 60:02d}",
+                "upload_date": f"{2015 + i * 10 // max(n_videos, 1)}{1 + i % 12:02d}{day:02d}",
+                "view_count": rng.randint(1_000, 5_000_000),
+                "like_count": rng.randint(10, 100_000),
+                "comment_count": rng.randint(0, 20_000),
+                "tags": list(dict.fromkeys(
+                    rng.choices(self.tags, cum_weights=self._tag_cum_weights, k=self.tags_per_video)
+                )),
+                "guest": guest,
+            })
+            videos[-1]["url"] = f"https://www.youtube.com/watch?v={videos[-1]['id']}"
+
+        return {
+            "handle": f"@loadtest{index}",
+            "name": f"Load Test Channel {index}",
+            "host": host,
+            "youtube_channel_id": f"UC{index:022d}",
+            "videos": videos,
+        }
+
+
+# =============================================================================
+# Write patterns
+# =============================================================================
+
+def scrape_channel(channel: dict[str, Any], batch_size: int, transcript_rate: float, rng: random.Random) -> list[dict]:
+    """The db calls of scrape_channel_to_db for one channel; returns the stored videos."""
+    source = db.get_or_create_source(
+        external_id=channel["handle"].lstrip("@"),
+        name=channel["name"],
+        handle=channel["handle"],
+        source_type="youtube_channel",
+        youtube_channel_id=channel["youtube_channel_id"],
+    )
+    log = db.create_scrape_log(source["id"])
+    db.get_existing_external_ids(source["id"])
+    db.get_recent_published_at(source["id"])
+
+    stored = []
+    transcripts = 0
+    videos = channel["videos"]
+    for start in range(0, len(videos), batch_size):
+        batch = videos[start:start + batch_size]
+        saved = db.upsert_videos_batch(source["id"], batch)
+        saved_by_external_id = {row["external_id"]: row for row in saved}
+
+        for video in batch:
+            row = saved_by_external_id.get(video["id"])
+            if row is None:
+                continue
+            stored.append({**row, "guest": video["guest"]})
+            # Failures are counted per function by the timers; keep loading
+            try:
+                db.add_video_tags(row["id"], video["tags"])
+                if rng.random() < transcript_rate and not db.video_has_transcript(video["id"]):
+                    text = " ".join(rng.choices(DESCRIPTION_WORDS, k=int(video["duration"] * 2.5)))
+                    db.update_video_transcript(row["id"], text)
+                    transcripts += 1
+            except Exception as e:
+                logger.debug(f"{video['id']}: {e}")
+
+        count("videos_processed", len(batch))
+        count("tags_linked", sum(len(v["tags"]) for v in batch))
+
+    db.complete_scrape_log(
+        log["id"],
+        videos_found=len(videos),
+        videos_new=len(stored),
+        transcripts_added=transcripts,
+    )
+    db.update_source_scraped_at(source["id"])
+    return stored
+
+
+def extract_channel(channel: dict[str, Any], stored: list[dict], batch_size: int) -> None:
+    """The db calls of extract_people for one channel (hosts once, guests per batch)."""
+    if not stored:
+        return
+    source_id = stored[0]["source_id"]
+
+    db.link_people([{
+        "name": channel["host"],
+        "role": "host",
+        "source_id": source_id,
+        "verified": True,
+        "ai_confidence": 0.95,
+    }])
+
+    for start in range(0, len(stored), batch_size):
+        batch = stored[start:start + batch_size]
+        try:
+            results = db.link_people([
+                {"name": video["guest"], "role": "guest", "video_id": video["id"]}
+                for video in batch
+            ])
+            # A share of guests get a name variant recorded, as the person index does
+            people = {r["person"]["slug"]: r["person"] for r in results[::4] if r["person"]}
+            db.add_person_aliases([(person, [person["name"].upper()]) for person in people.values()])
+            db.mark_people_extracted([video["id"] for video in batch])
+        except Exception as e:
+            logger.debug(f"{channel['handle']} batch {start}: {e}")
+
+    db.get_videos_without_transcript(source_id)
+
+
+# =============================================================================
+# Runner
+# =============================================================================
+
+def run_load(
+    workload: Workload,
+    concurrency: int,
+    batch_size: int,
+    extract_batch_size: int,
+    transcript_rate: float,
+    verbose: bool = True,
+) -> dict[str, Any]:
+    """
+    Replay the workload with one channel per worker at a time.
+
+    Returns:
+        Dict with elapsed seconds, videos, tags, errors and per-function
+        latency stats
+    """
+    _instrument_db()
+    reset_metrics()
+    done = 0
+    done_lock = threading.Lock()
+    errors: list[str] = []
+
+    def work(index: int) -> None:
+        nonlocal done
+        channel = workload.channel(index)
+        channel_start = time.perf_counter()
+        rng = random.Random(f"{workload.seed}-work-{index}")
+        stored = scrape_channel(channel, batch_size, transcript_rate, rng)
+        extract_channel(channel, stored, extract_batch_size)
+        with done_lock:
+            done += 1
+            if verbose:
+                print(
+                    f"[{done}/{workload.channels}] {channel['handle']}: {len(stored)} videos "
+                    f"in {time.perf_counter() - channel_start:.1f}s"
+                )
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(work, i): i for i in range(workload.channels)}
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                errors.append(f"channel {futures[future]}: {e}")
+                if verbose:
+                    print(f"channel {futures[future]} failed: {e}")
+    elapsed = time.perf_counter() - start
+
+    functions = []
+    for row in get_stage_stats():
+        if row["stage"] != "db":
+            continue
+        name = row["labels"]["function"]
+        functions.append({
+            "function": name,
+            "calls": row["count"],
+            "errors": int(get_counter("errors", stage="db", function=name)),
+            "total": row["sum"],
+            "p50": row["p50"],
+            "p95": row["p95"],
+            "p99": row["p99"],
+            "max": row["max"],
+        })
+
+    return {
+        "elapsed": elapsed,
+        "videos": int(get_counter("videos_processed")),
+        "tags": int(get_counter("tags_linked")),
+        "channel_errors": errors,
+        "functions": sorted(functions, key=lambda f: -f["total"]),
+    }
+
+
+def format_report(result: dict[str, Any]) -> str:
+    lines = [
+        f"{'function':<30} {'calls':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'total':>9} {'errors':>7}",
+    ]
+    for f in result["functions"]:
+        lines.append(
+            f"{f['function']:<30} {f['calls']:>9,} {f['p50'] * 1000:>6.1f}ms {f['p95'] * 1000:>6.1f}ms "
+            f"{f['p99'] * 1000:>6.1f}ms {f['max'] * 1000:>6.0f}ms {f['total']:>8.1f}s {f['errors']:>7}"
+        )
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test scraper.db against a local Supabase stack")
+    parser.add_argument(
+        "--target",
+        choices=["local", "url", "standin"],
+        default="local",
+        help="Database to load (default: start a throwaway local stack)",
+    )
+    parser.add_argument("--supabase-url", help="With --target url: local stack API URL")
+    parser.add_argument("--secret-key", help="With --target url: the stack's service role key")
+    parser.add_argument("--videos", type=int, default=100_000, help="Videos to write (default: 100000)")
+    parser.add_argument("--videos-per-channel", type=int, default=500, help="Videos per channel (default: 500)")
+    parser.add_argument("--tags-per-video", type=int, default=10, help="Tags per video (default: 10)")
+    parser.add_argument("--tag-vocabulary", type=int, default=20_000, help="Distinct tags (default: 20000)")
+    parser.add_argument("--batch-size", type=int, default=50, help="Videos per upsert_videos_batch (default: 50)")
+    parser.add_argument(
+        "--extract-batch-size",
+        type=int,
+        default=20,
+        help="Videos per link_people/mark_people_extracted call (default: 20)",
+    )
+    parser.add_argument(
+        "--transcript-rate",
+        type=float,
+        default=0.3,
+        help="Share of videos that get a transcript written (default: 0.3)",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Channels loaded in parallel (default: 8)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic data")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--quiet", "-q", action="store_true", help="No per-channel progress")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    workload = Workload(
+        videos=args.videos,
+        videos_per_channel=args.videos_per_channel,
+        tags_per_video=args.tags_per_video,
+        tag_vocabulary=args.tag_vocabulary,
+        seed=args.seed,
+    )
+    settings = {
+        "target": args.target,
+        "videos": args.videos,
+        "channels": workload.channels,
+        "tags_per_video": args.tags_per_video,
+        "tag_vocabulary": args.tag_vocabulary,
+        "batch_size": args.batch_size,
+        "extract_batch_size": args.extract_batch_size,
+        "concurrency": args.concurrency,
+        "seed": args.seed,
+    }
+
+    def run(url: str, key: str) -> dict[str, Any]:
+        os.environ["SUPABASE_URL"] = url
+        os.environ["SUPABASE_SECRET_KEY"] = key
+        db._client = None
+        print(
+            f"Loading {args.videos:,} videos ({workload.channels} channels, "
+            f"~{args.videos * args.tags_per_video:,} tag links) into {url} "
+            f"with {args.concurrency} workers"
+        )
+        return run_load(
+            workload,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            extract_batch_size=args.extract_batch_size,
+            transcript_rate=args.transcript_rate,
+            verbose=not args.quiet,
+        )
+
+    if args.target == "url":
+        if not args.supabase_url or not args.secret_key:
+            parser.error("--target url needs --supabase-url and --secret-key")
+        if not is_local_url(args.supabase_url):
+            parser.error(f"refusing to load a non-local database: {args.supabase_url}")
+        result = run(args.supabase_url, args.secret_key)
+    elif args.target == "standin":
+        from .standins import STANDIN_SECRET_KEY, BenchFixtures, StandinServer
+
+        with StandinServer(BenchFixtures()) as server:
+            result = run(server.service_url("postgrest"), STANDIN_SECRET_KEY)
+    else:
+        with LocalSupabase() as stack:
+            result = run(stack.url, stack.service_role_key)
+
+    print(f"\n{format_report(result)}")
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps({"settings": settings, **result}, indent=2), encoding="utf-8")
+
+    elapsed = result["elapsed"]
+    print(f"\n{'=' * 50}")
+    print("SUMMARY")
+    print(f"{'=' * 50}")
+    print(f"Videos written: {result['videos']:,} ({result['videos'] / elapsed * 60:,.0f}/min)")
+    print(f"Tag links written: {result['tags']:,} ({result['tags'] / elapsed:,.0f}/s)")
+    print(f"Elapsed: {elapsed:.1f}s")
+    print(f"Failed channels: {len(result['channel_errors'])}")
+    if args.output:
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
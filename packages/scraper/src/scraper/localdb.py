@@ -0,0 +1,150 @@
+"""
+Throwaway local Supabase stack for load-testing the db layer.
+
+Starts Postgres + PostgREST (behind Supabase's API gateway, so the scraper's
+SUPABASE_URL works unchanged) with the packages/api/supabase/migrations
+schema applied, using the Supabase CLI the API package already uses
+(`npx supabase`). Docker is required.
+
+The stack runs from a temporary copy of the migrations under its own project
+id and shifted ports, so it neither touches the API package's files nor
+clashes with a local dev stack already running on the default ports.
+
+Usage:
+    with LocalSupabase() as stack:
+        os.environ["SUPABASE_URL"] = stack.url
+        os.environ["SUPABASE_SECRET_KEY"] = stack.service_role_key
+"""
+
+import logging
+import re
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+API_DIR = Path(__file__).parent.parent.parent.parent / "api"
+MIGRATIONS_DIR = API_DIR / "supabase" / "migrations"
+
+PROJECT_ID = "scraper-loadtest"
+
+# Added to every default port (54321 API, 54322 DB, ...) of the temporary stack
+PORT_OFFSET = 100
+
+# Containers the db layer doesn't need (`supabase start -x`)
+EXCLUDED_SERVICES = [
+    "gotrue",
+    "realtime",
+    "storage-api",
+    "imgproxy",
+    "studio",
+    "edge-runtime",
+    "logflare",
+    "vector",
+    "postgres-meta",
+]
+
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1", "host.docker.internal"}
+
+
+def is_local_url(url: str) -> bool:
+    """True for URLs on this machine (load tests must never hit a real project)."""
+    return (urlsplit(url).hostname or "") in LOCAL_HOSTS
+
+
+def supabase_command() -> list[str]:
+    """The Supabase CLI: a global install, else through npx like packages/api."""
+    if shutil.which("supabase"):
+        return ["supabase"]
+    if shutil.which("npx"):
+        return ["npx", "--yes", "supabase"]
+    raise RuntimeError("Supabase CLI not found (install it or Node.js for npx)")
+
+
+class LocalSupabase:
+    """A local Supabase stack with the API package's migrations applied."""
+
+    def __init__(self, migrations_dir: Path = MIGRATIONS_DIR, port_offset: int = PORT_OFFSET):
+        self.migrations_dir = migrations_dir
+        self.port_offset = port_offset
+        self.workdir: Path | None = None
+        self.url: str | None = None
+        self.service_role_key: str | None = None
+        self.db_url: str | None = None
+
+    def _run(self, *args: str, capture: bool = False) -> str:
+        command = supabase_command() + list(args) + ["--workdir", str(self.workdir)]
+        logger.info(" ".join(command))
+        result = subprocess.run(command, capture_output=capture, text=True, check=False)
+        if result.returncode != 0:
+            detail = (result.stderr or result.stdout or "").strip() if capture else ""
+            raise RuntimeError(f"{' '.join(command[:3])} failed ({result.returncode}) {detail}".strip())
+        return result.stdout or ""
+
+    def _write_config(self) -> None:
+        """Fresh config.toml with our project id and ports shifted out of the way."""
+        self._run("init", capture=True)
+        config_path = self.workdir / "supabase" / "config.toml"
+        config = config_path.read_text(encoding="utf-8")
+        config = re.sub(r'^project_id = ".*"$', f'project_id = "{PROJECT_ID}"', config, flags=re.MULTILINE)
+        config = re.sub(
+            r"^(\s*(?:shadow_)?port = )(54\d\d\d)$",
+            lambda m: f"{m.group(1)}{int(m.group(2)) + self.port_offset}",
+            config,
+            flags=re.MULTILINE,
+        )
+        config_path.write_text(config, encoding="utf-8")
+
+    def start(self) -> "LocalSupabase":
+        """
+        Start the stack and apply the migrations (takes a minute on first pull).
+
+        Raises:
+            RuntimeError: If Docker or the Supabase CLI is unavailable or the
+                          stack fails to start
+        """
+        if not shutil.which("docker"):
+            raise RuntimeError("Docker is required for a local Supabase stack")
+
+        self.workdir = Path(tempfile.mkdtemp(prefix="scraper-localdb-"))
+        try:
+            self._write_config()
+            shutil.copytree(self.migrations_dir, self.workdir / "supabase" / "migrations", dirs_exist_ok=True)
+            self._run("start", "-x", ",".join(EXCLUDED_SERVICES))
+
+            output = self._run("status", "-o", "env", capture=True)
+            status = dict(re.findall(r'^([A-Z_]+)="?([^"\n]*)"?$', output, re.MULTILINE))
+            self.url = status.get("API_URL")
+            self.service_role_key = status.get("SERVICE_ROLE_KEY") or status.get("SECRET_KEY")
+            self.db_url = status.get("DB_URL")
+            if not self.url or not self.service_role_key:
+                raise RuntimeError(f"Could not read API_URL/SERVICE_ROLE_KEY from `supabase status`: {status}")
+        except BaseException:
+            try:
+                self.stop()
+            except RuntimeError as e:
+                logger.warning(f"Cleanup after failed start: {e}")
+            raise
+
+        logger.info(f"Local Supabase running at {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """Stop the stack and delete its data."""
+        if self.workdir is None:
+            return
+        try:
+            self._run("stop", "--no-backup", capture=True)
+        finally:
+            shutil.rmtree(self.workdir, ignore_errors=True)
+            self.workdir = None
+
+    def __enter__(self) -> "LocalSupabase":
+        return self.start()
+
+    def __exit__(self, *exc) -> bool:
+        self.stop()
+        return False
@@ -0,0 +1,323 @@
+"""
+Per-stage timing, error and throughput metrics.
+
+Stages (listing, metadata, transcript per provider, DB upsert, tags, ...)
+record their durations into histograms via timer() / observe(). Errors,
+retries and processed items go to counters, and throughput to gauges. At the
+end of a run:
+- format_stage_metrics() gives p50/p95/max per stage for the SUMMARY block
+- write_metrics() appends one JSON line per series to a file
+- start_metrics_server() serves everything (plus llm_metrics) as Prometheus
+  text on /metrics, for long-running daemons
+
+Usage:
+    uv run python -m scraper.scrape_to_db --metrics-file .cache/metrics.jsonl
+    uv run python -m scraper.scrape_to_db --daemon --metrics-port 9108
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Histogram bucket upper bounds in seconds (Prometheus export)
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Samples kept per series for exact percentiles (reservoir sampled beyond this)
+MAX_SAMPLES = 10_000
+
+METRICS_FILE = os.getenv("SCRAPER_METRICS_FILE")
+
+Labels = tuple[tuple[str, str], ...]
+
+_lock = threading.Lock()
+_started_at = time.time()
+
+
+def _labels(labels: dict[str, Any]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items() if v is not None))
+
+
+class Histogram:
+    """Bucketed durations plus a bounded sample for percentiles."""
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.samples: list[float] = []
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+
+        if len(self.samples) < MAX_SAMPLES:
+            self.samples.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < MAX_SAMPLES:
+                self.samples[slot] = value
+
+    def percentile(self, q: float) -> float:
+        """q in [0, 1], nearest-rank over the sample."""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+_histograms: dict[tuple[str, Labels], Histogram] = {}
+_counters: dict[tuple[str, Labels], float] = {}
+_gauges: dict[tuple[str, Labels], float] = {}
+
+
+def observe(stage: str, seconds: float, **labels: Any) -> None:
+    """Record a stage duration (extra labels e.g. provider="supadata")."""
+    key = (stage, _labels(labels))
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(seconds)
+
+
+def count(name: str, n: float = 1, **labels: Any) -> None:
+    """Increment a counter (e.g. count("errors", stage="metadata"))."""
+    key = (name, _labels(labels))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+
+def set_gauge(name: str, value: float, **labels: Any) -> None:
+    """Set a gauge (e.g. throughput of the last channel scraped)."""
+    with _lock:
+        _gauges[(name, _labels(labels))] = value
+
+
+class Timing:
+    """Handle yielded by timer(): labels can be added inside the block."""
+
+    def __init__(self, labels: dict[str, Any]):
+        self.labels = labels
+        self.elapsed = 0.0
+
+
+@contextmanager
+def timer(stage: str, **labels: Any) -> Iterator[Timing]:
+    """
+    Time a block as a stage.
+
+    Failed blocks (exceptions) increment errors{stage} instead of recording a
+    duration, so percentiles describe successful work.
+
+    Example:
+        with timer("metadata") as timing:
+            metadata = get_video_metadata(video_id)
+        print(f"metadata ({timing.elapsed:.1f}s)")
+    """
+    timing = Timing(labels)
+    start = time.perf_counter()
+    try:
+        yield timing
+    except BaseException:
+        timing.elapsed = time.perf_counter() - start
+        count("errors", stage=stage, **timing.labels)
+        raise
+    timing.elapsed = time.perf_counter() - start
+    observe(stage, timing.elapsed, **timing.labels)
+
+
+def reset_metrics() -> None:
+    """Clear every series and restart the throughput clock (e.g. between benchmark scenarios)."""
+    global _started_at
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+        _gauges.clear()
+        _started_at = time.time()
+
+
+def get_counter(name: str, **labels: Any) -> float:
+    """Sum of a counter across series matching the given labels."""
+    wanted = set(_labels(labels))
+    with _lock:
+        return sum(v for (n, l), v in _counters.items() if n == name and wanted <= set(l))
+
+
+def get_stage_stats() -> list[dict[str, Any]]:
+    """
+    Snapshot of every stage histogram.
+
+    Returns:
+        List of dicts with stage, labels, count, sum, p50, p95, p99 and max
+    """
+    with _lock:
+        items = list(_histograms.items())
+        rows = [
+            {
+                "stage": stage,
+                "labels": dict(labels),
+                "count": h.count,
+                "sum": h.sum,
+                "p50": h.percentile(0.5),
+                "p95": h.percentile(0.95),
+                "p99": h.percentile(0.99),
+                "max": h.max,
+            }
+            for (stage, labels), h in items
+        ]
+    return sorted(rows, key=lambda r: (r["stage"], sorted(r["labels"].items())))
+
+
+def format_stage_metrics() -> str | None:
+    """Per-stage p50/p95/max lines for SUMMARY blocks, or None if nothing was timed."""
+    rows = get_stage_stats()
+    if not rows:
+        return None
+
+    lines = ["Stage timings (count, p50 / p95 / max):"]
+    for row in rows:
+        label = row["stage"]
+        if row["labels"]:
+            label += " [" + ", ".join(f"{k}={v}" for k, v in sorted(row["labels"].items())) + "]"
+        line = f"  {label}: {row['count']}, {row['p50']:.2f}s / {row['p95']:.2f}s / {row['max']:.2f}s"
+        errors = get_counter("errors", stage=row["stage"], **row["labels"])
+        if errors:
+            line += f", {errors:.0f} errors"
+        lines.append(line)
+
+    processed = get_counter("videos_processed")
+    elapsed = time.time() - _started_at
+    if processed and elapsed > 0:
+        lines.append(f"Throughput: {processed / elapsed * 60:.1f} videos/min")
+    return "\n".join(lines)
+
+
+# =============================================================================
+# Export
+# =============================================================================
+
+def escape_label_value(value: Any) -> str:
+    """Escape a Prometheus label value (backslash, double quote and newline)."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prometheus_labels(labels: Labels, extra: dict[str, str] | None = None) -> str:
+    items = list(labels) + list((extra or {}).items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{escape_label_value(v)}"' for k, v in items) + "}"
+
+
+def prometheus_text() -> str:
+    """All stage, counter and gauge metrics in Prometheus text format."""
+    with _lock:
+        histograms = list(_histograms.items())
+        counters = list(_counters.items())
+        gauges = list(_gauges.items())
+
+    lines = [
+        "# HELP scraper_stage_seconds Duration of scraper stages",
+        "# TYPE scraper_stage_seconds histogram",
+    ]
+    for (stage, labels), h in sorted(histograms):
+        series = (("stage", stage),) + labels
+        cumulative = 0
+        for bound, n in zip(BUCKETS, h.buckets):
+            cumulative += n
+            lines.append(f"scraper_stage_seconds_bucket{_prometheus_labels(series, {'le': str(bound)})} {cumulative}")
+        lines.append(f"scraper_stage_seconds_bucket{_prometheus_labels(series, {'le': '+Inf'})} {h.count}")
+        lines.append(f"scraper_stage_seconds_sum{_prometheus_labels(series)} {h.sum}")
+        lines.append(f"scraper_stage_seconds_count{_prometheus_labels(series)} {h.count}")
+
+    for name in sorted({n for (n, _), _ in counters}):
+        lines.append(f"# TYPE scraper_{name}_total counter")
+        for (n, labels), value in sorted(counters):
+            if n == name:
+                lines.append(f"scraper_{name}_total{_prometheus_labels(labels)} {value}")
+
+    for name in sorted({n for (n, _), _ in gauges}):
+        lines.append(f"# TYPE scraper_{name} gauge")
+        for (n, labels), value in sorted(gauges):
+            if n == name:
+                lines.append(f"scraper_{name}{_prometheus_labels(labels)} {value}")
+
+    lines.append("# TYPE scraper_uptime_seconds gauge")
+    lines.append(f"scraper_uptime_seconds {time.time() - _started_at}")
+    return "\n".join(lines) + "\n"
+
+
+def write_metrics(path: str | Path | None = None) -> Path | None:
+    """
+    Append this run's metrics as JSON lines (one per stage, counter and gauge).
+
+    Args:
+        path: Output file (default: SCRAPER_METRICS_FILE; nothing is written
+              if neither is set)
+
+    Returns:
+        The path written, or None
+    """
+    path = path or METRICS_FILE
+    if not path:
+        return None
+
+    at = datetime.now(timezone.utc).isoformat()
+    with _lock:
+        counters = list(_counters.items())
+        gauges = list(_gauges.items())
+
+    records = [{"type": "stage", **row} for row in get_stage_stats()]
+    records += [{"type": "counter", "name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(counters)]
+    records += [{"type": "gauge", "name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(gauges)]
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps({"at": at, **record}) + "\n")
+
+    return path
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+
+        from .llm_metrics import prometheus_text as llm_prometheus_text
+
+        body = (prometheus_text() + llm_prometheus_text()).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would drown the progress output
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve Prometheus metrics on http://host:port/metrics from a background thread."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,336 @@
+"""
+In-memory person identity resolution.
+
+upsert_people matches on exact slug only, so "Dr. Andrew Huberman",
+"Andrew Huberman" and "Andrew D. Huberman" would become three people. The
+PersonIndex is built once from the people table and resolves a name to an
+existing person by, in order:
+1. Wikipedia URL
+2. Normalised name (honorifics, suffixes, accents and punctuation removed)
+3. Known aliases (people.aliases)
+4. First + last name, ignoring middle names and initials, only when the
+   name's Wikipedia page has the same first + last name (two different
+   "John Smith"s share a core name, so it is not enough on its own)
+5. Trigram candidates scored by edit similarity, for typos in the last name
+   only (first names must match: "Jane" vs "Janet" is a different person)
+
+A person whose Wikipedia link differs from the name's never matches.
+
+Lookups are dict/set operations with no database access; refresh() pulls
+only people updated since the last load.
+"""
+
+import difflib
+import re
+import time
+import unicodedata
+from typing import Any
+from urllib.parse import unquote
+
+from .db import get_client
+
+# Stripped from the start / end of names before matching
+HONORIFICS = {
+    "dr", "prof", "professor", "mr", "mrs", "ms", "miss", "sir", "dame", "rev", "fr",
+    "colonel", "col", "general", "gen", "major", "captain", "capt", "officer",
+}
+SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "phd", "md", "dphil", "esq", "mba", "obe", "mbe", "frs"}
+
+# Minimum similarity for a fuzzy (typo) match
+FUZZY_THRESHOLD = 0.9
+
+# Shorter last names are too easy to confuse ("Smith" / "Smyth")
+MIN_FUZZY_TOKEN = 6
+
+# get_person_index() refreshes at most this often
+REFRESH_SECONDS = 5 * 60
+
+PAGE_SIZE = 1000
+
+PEOPLE_COLUMNS = "id, name, slug, social_links, photo_url, aliases, updated_at"
+
+
+def normalize_name(name: str) -> str:
+    """'Dr. Andrés  Huberman, PhD' -> 'andres huberman'."""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    text = "".join(c if c.isalnum() else " " for c in text.replace("'", ""))
+    tokens = text.split()
+
+    while tokens and tokens[0] in HONORIFICS:
+        tokens.pop(0)
+    while tokens and tokens[-1] in SUFFIXES:
+        tokens.pop()
+
+    return " ".join(tokens)
+
+
+def core_name(normalized: str) -> str | None:
+    """First and last token of a normalised name ('andrew d huberman' -> 'andrew huberman')."""
+    tokens = [t for t in normalized.split() if len(t) > 1]
+    if len(tokens) < 2:
+        return None
+    return f"{tokens[0]} {tokens[-1]}"
+
+
+def normalize_wikipedia_url(url: str) -> str:
+    """Canonical form of a Wikipedia page URL for comparison."""
+    url = unquote(url).strip().rstrip("/")
+    url = url.split("#", 1)[0].replace("http://", "https://", 1)
+    return url.replace(" ", "_").casefold()
+
+
+def wikipedia_page_name(url: str) -> str:
+    """Normalised page title ('.../wiki/Jane_Doe_(author)' -> 'jane doe')."""
+    title = unquote(url).split("#", 1)[0].rstrip("/").rsplit("/", 1)[-1].replace("_", " ")
+    return normalize_name(re.sub(r"\s*\(.*\)$", "", title))
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PersonIndex:
+    """Name / alias / Wikipedia / trigram index over the people table."""
+
+    def __init__(self):
+        self.people: dict[str, dict] = {}
+        self.by_slug: dict[str, dict] = {}
+        self.by_wikipedia: dict[str, str] = {}
+        self.by_name: dict[str, str] = {}
+        self.by_core: dict[str, set[str]] = {}
+        self.by_trigram: dict[str, set[str]] = {}
+        self.loaded_until: str | None = None
+        self.refreshed_at = 0.0
+        self._keys: dict[str, list[tuple[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.people)
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+
+    def refresh(self) -> int:
+        """
+        Load people created or updated since the last refresh.
+
+        Returns:
+            Number of people (re)indexed
+        """
+        client = get_client()
+        since = self.loaded_until
+        count = 0
+        start = 0
+
+        while True:
+            query = client.table("people").select(PEOPLE_COLUMNS)
+            if since:
+                # gte: rows sharing the last timestamp are cheap to re-index, missing them isn't
+                query = query.gte("updated_at", since)
+            result = query.order("updated_at").range(start, start + PAGE_SIZE - 1).execute()
+
+            rows = result.data or []
+            for person in rows:
+                self.add(person)
+                if person.get("updated_at") and (
+                    not self.loaded_until or person["updated_at"] > self.loaded_until
+                ):
+                    self.loaded_until = person["updated_at"]
+            count += len(rows)
+
+            if len(rows) < PAGE_SIZE:
+                break
+            start += PAGE_SIZE
+
+        self.refreshed_at = time.time()
+        return count
+
+    def add(self, person: dict) -> None:
+        """Index (or re-index) a person record."""
+        person_id = person["id"]
+        self._remove(person_id)
+        self.people[person_id] = person
+        if person.get("slug"):
+            self.by_slug[person["slug"]] = person
+        keys: list[tuple[str, str]] = []
+
+        wikipedia_url = (person.get("social_links") or {}).get("wikipedia")
+        if wikipedia_url:
+            key = normalize_wikipedia_url(wikipedia_url)
+            self.by_wikipedia[key] = person_id
+            keys.append(("wikipedia", key))
+
+        for name in [person["name"], *(person.get("aliases") or [])]:
+            normalized = normalize_name(name)
+            if not normalized:
+                continue
+            self.by_name.setdefault(normalized, person_id)
+            keys.append(("name", normalized))
+
+            core = core_name(normalized)
+            if core:
+                self.by_core.setdefault(core, set()).add(person_id)
+                keys.append(("core", core))
+
+            for gram in _trigrams(normalized):
+                self.by_trigram.setdefault(gram, set()).add(person_id)
+                keys.append(("trigram", gram))
+
+        self._keys[person_id] = keys
+
+    def _remove(self, person_id: str) -> None:
+        for kind, key in self._keys.pop(person_id, []):
+            if kind == "wikipedia" and self.by_wikipedia.get(key) == person_id:
+                del self.by_wikipedia[key]
+            elif kind == "name" and self.by_name.get(key) == person_id:
+                del self.by_name[key]
+            elif kind == "core":
+                self.by_core.get(key, set()).discard(person_id)
+            elif kind == "trigram":
+                self.by_trigram.get(key, set()).discard(person_id)
+        person = self.people.pop(person_id, None)
+        if person and self.by_slug.get(person.get("slug")) is person:
+            del self.by_slug[person["slug"]]
+
+    # -------------------------------------------------------------------------
+    # Lookups
+    # -------------------------------------------------------------------------
+
+    def candidates(self, name: str, limit: int = 5) -> list[tuple[dict, float]]:
+        """
+        Fuzzy candidates for a name, best first.
+
+        Returns:
+            List of (person, similarity) with similarity in [0, 1]
+        """
+        normalized = normalize_name(name)
+        if not normalized:
+            return []
+
+        grams = _trigrams(normalized)
+        shared: dict[str, int] = {}
+        for gram in grams:
+            for person_id in self.by_trigram.get(gram, ()):
+                shared[person_id] = shared.get(person_id, 0) + 1
+
+        # Only score people sharing at least half the trigrams
+        pool = [pid for pid, n in shared.items() if n * 2 >= len(grams)]
+
+        scored = []
+        for person_id in pool:
+            person = self.people[person_id]
+            best = max(
+                difflib.SequenceMatcher(None, normalized, normalize_name(n)).ratio()
+                for n in [person["name"], *(person.get("aliases") or [])]
+            )
+            scored.append((person, best))
+
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:limit]
+
+    def resolve(self, name: str, wikipedia_url: str | None = None) -> dict | None:
+        """
+        Resolve a name (and optional Wikipedia URL) to an existing person.
+
+        Returns:
+            The person record, or None if no confident match exists
+        """
+        if wikipedia_url:
+            person_id = self.by_wikipedia.get(normalize_wikipedia_url(wikipedia_url))
+            if person_id:
+                return self.people[person_id]
+
+        normalized = normalize_name(name)
+        if not normalized:
+            return None
+
+        def conflicts(person: dict) -> bool:
+            # Linked to another Wikipedia page: a namesake, not a variant
+            other = (person.get("social_links") or {}).get("wikipedia")
+            return bool(wikipedia_url and other)
+
+        person_id = self.by_name.get(normalized)
+        if person_id:
+            person = self.people[person_id]
+            return None if conflicts(person) else person
+
+        core = core_name(normalized)
+        if core and wikipedia_url and core_name(wikipedia_page_name(wikipedia_url)) == core:
+            matches = self.by_core.get(core, set())
+            if len(matches) == 1:
+                person = self.people[next(iter(matches))]
+                if not conflicts(person):
+                    return person
+
+        # Typo tolerance: unambiguous best candidate, same first name, long last name
+        candidates = self.candidates(name, limit=2)
+        if not candidates or candidates[0][1] < FUZZY_THRESHOLD:
+            return None
+        if len(candidates) > 1 and candidates[1][1] >= FUZZY_THRESHOLD:
+            return None
+
+        person = candidates[0][0]
+        if conflicts(person):
+            return None
+        tokens = normalized.split()
+        other = normalize_name(person["name"]).split()
+        if (
+            len(tokens) >= 2 and len(other) >= 2
+            and tokens[0] == other[0]
+            and min(len(tokens[-1]), len(other[-1])) >= MIN_FUZZY_TOKEN
+        ):
+            return person
+
+        return None
+
+
+_index: PersonIndex | None = None
+
+
+def get_person_index(max_age: float = REFRESH_SECONDS) -> PersonIndex:
+    """Get the shared index, refreshing it incrementally if older than max_age seconds."""
+    global _index
+
+    if _index is None:
+        _index = PersonIndex()
+    if time.time() - _index.refreshed_at > max_age:
+        _index.refresh()
+
+    return _index
+
+
+def canonicalize_links(links: list[dict[str, Any]], index: PersonIndex) -> dict[str, list[str]]:
+    """
+    Point name-based links (see db.link_people) at existing people in place.
+
+    Matched links get the person's id, so db.link_people links the existing
+    row instead of upserting the variant's slug as a near-duplicate. The name
+    is kept (callers use it to tell guests from id-only host links).
+
+    Returns:
+        Dict mapping person_id to new aliases (the variant names that matched)
+    """
+    aliases: dict[str, list[str]] = {}
+    # Unmatched names in this batch, so "Jane Doe" and "Dr. Jane Doe" share one new row
+    new_names: dict[str, str] = {}
+
+    for link in links:
+        if link.get("person_id") or not link.get("name"):
+            continue
+
+        person = index.resolve(link["name"], link.get("wikipedia_url"))
+        if not person:
+            normalized = normalize_name(link["name"])
+            link["name"] = new_names.setdefault(normalized, link["name"]) if normalized else link["name"]
+            continue
+        link["person_id"] = person["id"]
+        if person["name"] == link["name"]:
+            continue
+
+        known = {normalize_name(n) for n in [person["name"], *(person.get("aliases") or [])]}
+        if normalize_name(link["name"]) not in known and link["name"] not in aliases.get(person["id"], []):
+            aliases.setdefault(person["id"], []).append(link["name"])
+
+    return aliases
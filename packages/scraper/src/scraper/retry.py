@@ -0,0 +1,349 @@
+"""
+Retry policies shared by the scraper's network stages.
+
+Every network call (Supabase/PostgREST, Supadata, yt-dlp, Wikipedia, the
+YouTube feed) goes through call_with_retry() or the @retrying(stage)
+decorator with its stage's RetryPolicy:
+- only transient errors are retried (see classify()): timeouts and connection
+  errors, HTTP 408/429/5xx, yt-dlp throttling, PostgREST statement and pool
+  timeouts, serialization failures and deadlocks
+- waits use exponential backoff with full jitter, or the server's Retry-After
+  when it sends one (if that is longer than the policy's max delay we give up
+  rather than stall the run)
+- each stage has a retry budget: every call earns a fraction of a retry, so
+  during an outage retries add at most that fraction of extra load instead of
+  multiplying it
+- nested retrying calls don't multiply attempts: an error that already used up
+  its retries in an inner call is not retried again by the outer one
+
+The LLM SDKs (OpenAI, Anthropic) retry 429/5xx with Retry-After themselves
+and are not wrapped here.
+
+Retries are counted in retries{stage,reason} and give-ups in
+retry_giveups{stage,reason}.
+
+Usage:
+    @retrying("db")
+    def update_source_scraped_at(source_id): ...
+
+    response = call_with_retry(lambda: raise_for_retryable(client.get(url)), "supadata")
+"""
+
+import functools
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from email.utils import parsedate_to_datetime
+from typing import Any, TypeVar
+
+import httpx
+from dotenv import load_dotenv
+from postgrest.exceptions import APIError
+from yt_dlp.utils import YoutubeDLError
+
+from .metrics import count
+
+logger = logging.getLogger(__name__)
+
+load_dotenv()
+
+T = TypeVar("T")
+
+_enabled = os.getenv("SCRAPER_RETRIES", "1") != "0"
+
+# HTTP statuses worth retrying (plus every 5xx)
+RETRYABLE_STATUS = {408, 425, 429}
+
+# PostgREST / Postgres error codes that mean "try again", by reason
+POSTGREST_RETRYABLE = {
+    "57014": "statement_timeout",
+    "PGRST000": "db_unavailable",
+    "PGRST001": "db_unavailable",
+    "PGRST002": "schema_cache",
+    "PGRST003": "pool_timeout",
+    "40001": "serialization_failure",
+    "40P01": "deadlock",
+    "08000": "db_connection",
+    "08003": "db_connection",
+    "08006": "db_connection",
+}
+
+# yt-dlp / YouTube messages that mean throttling or an unreachable YouTube,
+# not that one video is unavailable
+THROTTLING_MESSAGES = re.compile(
+    r"HTTP Error (429|5\d\d)|Too Many Requests|Sign in to confirm|rate.?limit|timed out|"
+    r"Connection (refused|reset|aborted)|Temporary failure in name resolution",
+    re.IGNORECASE,
+)
+
+
+class RetryableError(Exception):
+    """Raise to request a retry for a failure classify() can't see (e.g. yt-dlp with ignoreerrors)."""
+
+    def __init__(self, message: str, reason: str = "transient", retry_after: float | None = None):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class RetryPolicy:
+    """Attempts, backoff and retry budget for one stage."""
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 10.0,
+        budget_ratio: float = 0.2,
+        budget_burst: float = 10.0,
+    ):
+        """
+        Args:
+            attempts: Total tries per call, including the first
+            base_delay: Backoff cap for the first retry; doubled per retry
+            max_delay: Upper bound for any wait, including Retry-After
+            budget_ratio: Retries earned per call
+            budget_burst: Retries available up front (and the budget's cap)
+        """
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_burst = budget_burst
+        self._tokens = budget_burst
+        self._lock = threading.Lock()
+
+    def backoff(self, retry: int) -> float:
+        """Full-jitter delay before the given retry (1 = first retry)."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (retry - 1)))
+
+    def _earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self.budget_burst, self._tokens + self.budget_ratio)
+
+    def _spend(self) -> bool:
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+# A fallback provider exists for Supadata, so it gets one quick retry only
+POLICIES: dict[str, RetryPolicy] = {
+    "db": RetryPolicy(attempts=3, base_delay=0.5, max_delay=8.0),
+    "supadata": RetryPolicy(attempts=2, base_delay=1.0, max_delay=10.0),
+    "youtube": RetryPolicy(attempts=3, base_delay=2.0, max_delay=30.0),
+    "wikipedia": RetryPolicy(attempts=3, base_delay=1.0, max_delay=10.0),
+    "feed": RetryPolicy(attempts=2, base_delay=1.0, max_delay=10.0),
+}
+
+_stats: Counter[tuple[str, str, str]] = Counter()
+_stats_lock = threading.Lock()
+
+
+def get_policy(stage: str) -> RetryPolicy:
+    """The policy for a stage (a default one is created for unknown stages)."""
+    policy = POLICIES.get(stage)
+    if policy is None:
+        policy = POLICIES.setdefault(stage, RetryPolicy())
+    return policy
+
+
+def set_retries_enabled(enabled: bool) -> None:
+    """Turn retries on or off for this process."""
+    global _enabled
+    _enabled = enabled
+
+
+# =============================================================================
+# Classification
+# =============================================================================
+
+def _is_retryable_status(status: int) -> bool:
+    return status in RETRYABLE_STATUS or 500 <= status < 600
+
+
+def classify(error: BaseException) -> str | None:
+    """
+    Why an error is worth retrying, or None if it isn't.
+
+    Returns:
+        A short reason used as the metrics label ("429", "timeout",
+        "statement_timeout", "throttled", ...)
+    """
+    if isinstance(error, RetryableError):
+        return error.reason
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return str(status) if _is_retryable_status(status) else None
+    if isinstance(error, (httpx.TimeoutException, TimeoutError)):
+        return "timeout"
+    if isinstance(error, (httpx.TransportError, ConnectionError)):
+        return "connection"
+    if isinstance(error, APIError):
+        code = str(error.code or "")
+        if code in POSTGREST_RETRYABLE:
+            return POSTGREST_RETRYABLE[code]
+        # Non-JSON responses (e.g. a gateway 503) carry the HTTP status as code
+        if len(code) == 3 and code.isdigit() and _is_retryable_status(int(code)):
+            return code
+        return None
+    if isinstance(error, YoutubeDLError) and THROTTLING_MESSAGES.search(str(error)):
+        return "throttled"
+    return None
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Seconds the server asked us to wait (Retry-After), if it did."""
+    if isinstance(error, RetryableError):
+        return error.retry_after
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+
+    value = error.response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def raise_for_retryable(response: httpx.Response) -> httpx.Response:
+    """
+    Raise for retryable statuses (429, 5xx, ...) and pass other responses through.
+
+    Callers that handle 4xx themselves can wrap a request in call_with_retry()
+    without losing those responses.
+
+    Raises:
+        httpx.HTTPStatusError: For retryable statuses
+    """
+    if _is_retryable_status(response.status_code):
+        response.raise_for_status()
+    return response
+
+
+# =============================================================================
+# Execution
+# =============================================================================
+
+def _give_up(stage: str, reason: str, error: BaseException) -> None:
+    # Enclosing retrying calls must not start over with a fresh set of attempts
+    error._retries_exhausted = True
+    with _stats_lock:
+        _stats[("giveup", stage, reason)] += 1
+    count("retry_giveups", stage=stage, reason=reason)
+
+
+def call_with_retry(
+    fn: Callable[..., T],
+    stage: str,
+    *args: Any,
+    policy: RetryPolicy | None = None,
+    retry_if: Callable[[BaseException], str | None] | None = None,
+    **kwargs: Any,
+) -> T:
+    """
+    Call fn(*args, **kwargs), retrying transient failures per the stage's policy.
+
+    Args:
+        fn: The call to make; it must be safe to repeat
+        stage: Policy and metrics label ("db", "supadata", "youtube", ...)
+        policy: Override the stage's policy
+        retry_if: Extra classifier for errors that are transient for this
+                  call only (returns a reason or None)
+
+    Returns:
+        fn's result
+
+    Raises:
+        The last error, once it isn't retryable or attempts, budget or the
+        Retry-After limit are exhausted
+    """
+    policy = policy or get_policy(stage)
+    policy._earn()
+
+    attempt = 1
+    while True:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as e:
+            if not _enabled or getattr(e, "_retries_exhausted", False):
+                raise
+            reason = classify(e) or (retry_if(e) if retry_if else None)
+            if reason is None:
+                raise
+
+            if attempt >= policy.attempts:
+                _give_up(stage, "attempts", e)
+                raise
+            wait = retry_after(e)
+            if wait is not None and wait > policy.max_delay:
+                _give_up(stage, "retry_after", e)
+                raise
+            if not policy._spend():
+                _give_up(stage, "budget", e)
+                raise
+
+            if wait is None:
+                wait = policy.backoff(attempt)
+            with _stats_lock:
+                _stats[("retry", stage, reason)] += 1
+            count("retries", stage=stage, reason=reason)
+            logger.info(f"{stage}: retrying after {reason} in {wait:.1f}s (attempt {attempt + 1}/{policy.attempts})")
+            time.sleep(wait)
+            attempt += 1
+
+
+def retrying(
+    stage: str,
+    policy: RetryPolicy | None = None,
+    retry_if: Callable[[BaseException], str | None] | None = None,
+) -> Callable[[Callable[..., T]], Callable[..., T]]:
+    """Decorator form of call_with_retry() for idempotent functions."""
+    def decorator(fn: Callable[..., T]) -> Callable[..., T]:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> T:
+            return call_with_retry(fn, stage, *args, policy=policy, retry_if=retry_if, **kwargs)
+        return wrapper
+    return decorator
+
+
+def reset_retries() -> None:
+    """Clear retry counts and refill every budget, e.g. between benchmark rounds."""
+    with _stats_lock:
+        _stats.clear()
+    for policy in POLICIES.values():
+        with policy._lock:
+            policy._tokens = policy.budget_burst
+
+
+def format_retry_stats() -> str | None:
+    """Retries and give-ups per stage for SUMMARY blocks, or None if nothing was retried."""
+    with _stats_lock:
+        stats = dict(_stats)
+    if not stats:
+        return None
+
+    lines = ["Retries:"]
+    for stage in sorted({stage for _, stage, _ in stats}):
+        retries = {r: n for (kind, s, r), n in stats.items() if kind == "retry" and s == stage}
+        giveups = {r: n for (kind, s, r), n in stats.items() if kind == "giveup" and s == stage}
+        line = f"  {stage}: {sum(retries.values())} retries"
+        if retries:
+            line += " (" + ", ".join(f"{r} {n}" for r, n in sorted(retries.items())) + ")"
+        if giveups:
+            line += ", gave up " + ", ".join(f"{n}x on {r}" for r, n in sorted(giveups.items()))
+        lines.append(line)
+    return "\n".join(lines)
@@ -0,0 +1,109 @@
+"""
+Adaptive per-channel polling schedule.
+
+Learns how often each channel uploads from the published_at history stored
+in the videos table, and turns that cadence into a poll interval:
+channels that post daily are checked often, channels that post once a month
+are checked rarely.
+"""
+
+import statistics
+from datetime import datetime, timezone
+
+# Poll interval bounds (seconds)
+MIN_POLL_INTERVAL = 15 * 60  # 15 minutes
+MAX_POLL_INTERVAL = 24 * 60 * 60  # 24 hours
+
+# Interval used when a channel has too little history to learn from
+DEFAULT_POLL_INTERVAL = 6 * 60 * 60  # 6 hours
+
+# Poll this many times per typical gap between uploads
+POLLS_PER_UPLOAD = 4
+
+# Number of recent uploads used to estimate cadence
+CADENCE_HISTORY = 20
+
+# A channel silent for this many typical gaps is treated as dormant
+DORMANT_AFTER_GAPS = 4
+
+
+def _parse_timestamp(value: str) -> datetime | None:
+    """Parse an ISO timestamp from the database into an aware datetime."""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def estimate_upload_gap(published_at: list[str]) -> float | None:
+    """
+    Estimate the typical gap between uploads in seconds.
+
+    Args:
+        published_at: ISO timestamps of recent uploads (any order)
+
+    Returns:
+        Median gap between consecutive uploads, or None if there is not
+        enough history to estimate one
+    """
+    dates = sorted(
+        (d for d in (_parse_timestamp(p) for p in published_at if p) if d),
+        reverse=True,
+    )
+    gaps = [
+        (newer - older).total_seconds()
+        for newer, older in zip(dates, dates[1:])
+    ]
+    # Same-day uploads have a zero gap (published_at only has day precision)
+    gaps = [g for g in gaps if g > 0]
+
+    if not gaps:
+        return None
+    return statistics.median(gaps)
+
+
+def compute_poll_interval(
+    published_at: list[str],
+    min_interval: float = MIN_POLL_INTERVAL,
+    max_interval: float = MAX_POLL_INTERVAL,
+    now: datetime | None = None,
+) -> float:
+    """
+    Compute how long to wait before polling a channel again.
+
+    The interval is a fraction of the channel's typical upload gap, clamped
+    to [min_interval, max_interval]. Channels that are overdue for an upload
+    (last upload older than the typical gap) are polled twice as often, and
+    channels that have gone quiet for several gaps fall back to max_interval.
+
+    Args:
+        published_at: ISO timestamps of recent uploads
+        min_interval: Lower bound in seconds
+        max_interval: Upper bound in seconds
+        now: Current time (default: utcnow)
+
+    Returns:
+        Poll interval in seconds
+    """
+    gap = estimate_upload_gap(published_at)
+    if gap is None:
+        return max(min_interval, min(DEFAULT_POLL_INTERVAL, max_interval))
+
+    interval = gap / POLLS_PER_UPLOAD
+
+    latest = max(
+        (d for d in (_parse_timestamp(p) for p in published_at if p) if d),
+        default=None,
+    )
+    if latest is not None:
+        now = now or datetime.now(timezone.utc)
+        since_latest = (now - latest).total_seconds()
+        if since_latest > gap * DORMANT_AFTER_GAPS:
+            interval = max_interval
+        elif since_latest > gap:
+            interval /= 2
+
+    return max(min_interval, min(interval, max_interval))
@@ -6,17 +6,34 @@ to the Supabase database.
 """
 
 import argparse
+import heapq
 import json
 import logging
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
+from .circuit import CircuitOpenError, format_circuit_stats
 from .channel import (
+    METADATA_PROFILES,
     get_channel_video_ids,
     get_channel_metadata,
     get_video_metadata,
+    set_metadata_profile,
+)
+from .extraction import EXECUTORS, metadata_workers, set_metadata_executor
+from .feed import feed_has_new_videos, save_rejected
+from .filters import VideoFilter
+from .http_client import format_http_stats
+from .metrics import count, format_stage_metrics, set_gauge, start_metrics_server, timer, write_metrics
+from .retry import format_retry_stats
+from .transcript import (
+    DEFAULT_HEDGE_DELAY,
+    STRATEGIES,
+    fetch_transcript,
+    format_provider_stats,
+    set_transcript_strategy,
 )
-from .transcript import fetch_transcript
 from .db import (
     get_or_create_source,
     upsert_videos_batch,
@@ -25,6 +42,14 @@ from .db import (
     complete_scrape_log,
     add_video_tags,
     video_has_transcript,
+    get_existing_external_ids,
+    get_recent_published_at,
+)
+from .schedule import (
+    CADENCE_HISTORY,
+    MAX_POLL_INTERVAL,
+    MIN_POLL_INTERVAL,
+    compute_poll_interval,
 )
 
 # Configure logging
@@ -48,6 +73,13 @@ def load_channels_config(config_path: Path | None = None) -> dict[str, str]:
         return json.load(f)
 
 
+def _timed_metadata(video_id: str) -> tuple[dict, float]:
+    """get_video_metadata under the metadata stage timer; returns (metadata, seconds)."""
+    with timer("metadata") as timing:
+        metadata = get_video_metadata(video_id)
+    return metadata, timing.elapsed
+
+
 def scrape_channel_to_db(
     channel_name: str,
     channel_handle: str,
@@ -58,6 +90,10 @@ def scrape_channel_to_db(
     transcript_providers: list[str] | None = None,
     force_update: bool = False,
     metadata_only: bool = False,
+    skip_existing: bool = False,
+    fetch_channel_metadata: bool = True,
+    use_feed: bool = False,
+    video_filter: VideoFilter | None = None,
 ) -> dict:
     """
     Scrape a single channel and save to Supabase.
@@ -71,11 +107,21 @@ def scrape_channel_to_db(
         transcript_providers: List of providers to use for transcripts (default: ["youtube_api", "supadata"])
         force_update: Force update channel metadata even if it already exists
         metadata_only: Only update channel metadata, skip video scraping
+        skip_existing: Only process videos not already in the database
+        fetch_channel_metadata: Fetch channel metadata from YouTube (the /about page)
+        use_feed: Check the channel's Atom feed first and skip the yt-dlp listing
+                  when it shows no unseen videos (requires skip_existing)
+        video_filter: Which videos to keep (default: >= 20 min, not live/upcoming,
+                      no shorts). Pass a shared instance to aggregate rejection counts.
 
     Returns:
-        Stats dict with counts
+        Stats dict with counts (including the resolved source_id)
     """
+    if video_filter is None:
+        video_filter = VideoFilter()
+
     stats = {
+        "source_id": None,
         "videos_found": 0,
         "videos_processed": 0,
         "transcripts_added": 0,
@@ -94,18 +140,20 @@ def scrape_channel_to_db(
 
     # Get channel metadata (including description)
     channel_metadata = {}
-    try:
-        channel_metadata = get_channel_metadata(channel_url)
-        if verbose:
-            if channel_metadata.get("name"):
-                print(f"Channel name from YouTube: {channel_metadata.get('name')}")
-            if channel_metadata.get("thumbnail_url"):
-                print(f"Fetched channel thumbnail: {channel_metadata.get('thumbnail_url')[:60]}...")
-            if channel_metadata.get("description"):
-                print(f"Fetched channel description ({len(channel_metadata.get('description', ''))} chars)")
-    except Exception as e:
-        if verbose:
-            print(f"Could not fetch channel metadata: {e}")
+    if fetch_channel_metadata:
+        try:
+            with timer("channel_metadata"):
+                channel_metadata = get_channel_metadata(channel_url)
+            if verbose:
+                if channel_metadata.get("name"):
+                    print(f"Channel name from YouTube: {channel_metadata.get('name')}")
+                if channel_metadata.get("thumbnail_url"):
+                    print(f"Fetched channel thumbnail: {channel_metadata.get('thumbnail_url')[:60]}...")
+                if channel_metadata.get("description"):
+                    print(f"Fetched channel description ({len(channel_metadata.get('description', ''))} chars)")
+        except Exception as e:
+            if verbose:
+                print(f"Could not fetch channel metadata: {e}")
 
     # Use YouTube metadata name if available, otherwise fall back to provided name
     resolved_channel_name = channel_metadata.get("name") or channel_name
@@ -120,8 +168,10 @@ def scrape_channel_to_db(
         description=channel_metadata.get("description"),
         subscriber_count=channel_metadata.get("subscriber_count"),
         thumbnail_url=channel_metadata.get("thumbnail_url"),
+        youtube_channel_id=channel_metadata.get("channel_id"),
     )
     source_id = source["id"]
+    stats["source_id"] = source_id
 
     if verbose:
         print(f"Source ID: {source_id}")
@@ -135,13 +185,35 @@ def scrape_channel_to_db(
             print(f"\nChannel metadata updated in {total_time:.1f}s")
         return stats
 
+    existing_ids = get_existing_external_ids(source_id) if skip_existing else set()
+
+    # Fast path: the Atom feed says nothing new, so skip the yt-dlp listing entirely
+    youtube_channel_id = source.get("youtube_channel_id")
+    if skip_existing and use_feed and youtube_channel_id:
+        with timer("feed"):
+            has_new_videos = feed_has_new_videos(youtube_channel_id, existing_ids, video_filter)
+        if not has_new_videos:
+            stats["feed_unchanged"] = True
+            if verbose:
+                print(f"No new videos in feed, skipping listing")
+            update_source_scraped_at(source_id)
+            return stats
+
     # Get video list from YouTube
     if verbose:
         print(f"Fetching video list...")
 
-    start_time = time.time()
-    channel_title, videos = get_channel_video_ids(channel_url)
-    video_list_time = time.time() - start_time
+    try:
+        with timer("list") as timing:
+            channel_title, videos = get_channel_video_ids(channel_url)
+    except CircuitOpenError as e:
+        # YouTube is failing: try the whole channel again next run
+        stats["deferred"] = True
+        stats["errors"].append(str(e))
+        if verbose:
+            print(f"Deferred: {e}")
+        return stats
+    video_list_time = timing.elapsed
 
     if not videos:
         stats["errors"].append("No videos found")
@@ -149,14 +221,23 @@ def scrape_channel_to_db(
 
     stats["videos_found"] = len(videos)
 
-    # Filter out short videos (< 20 minutes) - likely trailers, summaries, or non-interview content
-    MIN_DURATION_SECONDS = 20 * 60  # 20 minutes
-    videos = [v for v in videos if (v.get("duration") or 0) >= MIN_DURATION_SECONDS]
+    # Filter out short videos (trailers, summaries, non-interview content) before any enrichment
+    videos = video_filter.apply(videos, "listing")
     stats["videos_after_filter"] = len(videos)
+    save_rejected(video_filter)
 
     if verbose:
         filtered_count = stats["videos_found"] - len(videos)
-        print(f"Found {stats['videos_found']} videos, {filtered_count} filtered (< 20 min), processing {min(video_limit, len(videos))} ({video_list_time:.1f}s)")
+        print(f"Found {stats['videos_found']} videos, {filtered_count} filtered, processing {min(video_limit, len(videos))} ({video_list_time:.1f}s)")
+
+    # Drop videos we already have so they don't incur metadata/transcript requests
+    if skip_existing:
+        videos = [v for v in videos if v.get("id") not in existing_ids]
+        if verbose:
+            print(f"{len(videos)} new videos not yet in database")
+        if not videos:
+            update_source_scraped_at(source_id)
+            return stats
 
     # Limit videos
     videos_to_process = videos[:video_limit]
@@ -165,6 +246,17 @@ def scrape_channel_to_db(
     scrape_log = create_scrape_log(source_id)
     log_id = scrape_log["id"]
 
+    # With several metadata workers, start every extraction now and consume them in order below
+    metadata_pool = None
+    prefetched: dict[str, Future] = {}
+    if fetch_metadata and metadata_workers() > 1:
+        metadata_pool = ThreadPoolExecutor(max_workers=metadata_workers(), thread_name_prefix="metadata")
+        prefetched = {
+            video["id"]: metadata_pool.submit(_timed_metadata, video["id"])
+            for video in videos_to_process
+            if video.get("id")
+        }
+
     try:
         # Enrich videos with metadata
         enriched_videos = []
@@ -181,17 +273,30 @@ def scrape_channel_to_db(
             # Get rich metadata
             if fetch_metadata:
                 try:
-                    meta_start = time.time()
-                    metadata = get_video_metadata(video_id)
-                    meta_time = time.time() - meta_start
+                    future = prefetched.get(video_id)
+                    metadata, elapsed = future.result() if future else _timed_metadata(video_id)
                     video.update(metadata)
                     if verbose:
-                        print(f"      ✓ metadata ({meta_time:.1f}s)")
+                        chapters = f", {len(video['chapters'])} chapters" if video.get("chapters") else ""
+                        print(f"      ✓ metadata ({elapsed:.1f}s{chapters})")
+                except CircuitOpenError as e:
+                    # Not saved, so the next run picks the video up again
+                    stats["videos_deferred"] = stats.get("videos_deferred", 0) + 1
+                    count("deferred", stage="metadata")
+                    if verbose:
+                        print(f"      ○ deferred: {e}")
+                    continue
                 except Exception as e:
                     stats["errors"].append(f"Metadata error for {video_id}: {e}")
                     if verbose:
                         print(f"      ✗ metadata failed")
 
+                # Re-check now that live_status etc. are known, before paying for a transcript
+                if not video_filter.accepts(video, "metadata"):
+                    if verbose:
+                        print(f"      - skipped by filter: {video_filter.rejection_reason(video)}")
+                    continue
+
             # Get transcript if requested
             if fetch_transcripts:
                 # Check if transcript already exists in database
@@ -199,7 +304,7 @@ def scrape_channel_to_db(
                     if verbose:
                         print(f"      ○ transcript (already in DB)")
                 else:
-                    # Fetch transcript using configured providers
+                    # Fetch transcript using configured providers (timed per provider, see metrics.py)
                     transcript_start = time.time()
                     result = fetch_transcript(video_id, providers=transcript_providers)
                     transcript_time = time.time() - transcript_start
@@ -207,6 +312,7 @@ def scrape_channel_to_db(
                         video["transcript"] = result.content
                         video["transcript_language"] = result.language
                         stats["transcripts_added"] += 1
+                        count("transcripts_added")
                         if verbose:
                             print(f"      ✓ transcript ({len(result.content)} chars, {result.provider}, {transcript_time:.1f}s)")
                     else:
@@ -215,17 +321,17 @@ def scrape_channel_to_db(
 
             enriched_videos.append(video)
             stats["videos_processed"] += 1
+            count("videos_processed")
 
         # Batch upsert to database
         if enriched_videos:
             if verbose:
                 print(f"\nSaving {len(enriched_videos)} videos to database...")
 
-            db_start = time.time()
-            saved_videos = upsert_videos_batch(
-                source_id, enriched_videos, has_rich_metadata=fetch_metadata
-            )
-            db_time = time.time() - db_start
+            with timer("db_upsert") as db_timing:
+                saved_videos = upsert_videos_batch(
+                    source_id, enriched_videos, has_rich_metadata=fetch_metadata
+                )
 
             # Add tags for each video
             tags_start = time.time()
@@ -233,13 +339,14 @@ def scrape_channel_to_db(
                 tags = video.get("tags", [])
                 if tags and saved_videos and i < len(saved_videos):
                     try:
-                        add_video_tags(saved_videos[i]["id"], tags[:20])  # Limit tags
+                        with timer("tags"):
+                            add_video_tags(saved_videos[i]["id"], tags[:20])  # Limit tags
                     except Exception as e:
                         stats["errors"].append(f"Tags error: {e}")
             tags_time = time.time() - tags_start
 
             if verbose:
-                print(f"Saved {len(saved_videos)} videos (db: {db_time:.1f}s, tags: {tags_time:.1f}s)")
+                print(f"Saved {len(saved_videos)} videos (db: {db_timing.elapsed:.1f}s, tags: {tags_time:.1f}s)")
 
         # Update source scraped timestamp
         update_source_scraped_at(source_id)
@@ -255,6 +362,8 @@ def scrape_channel_to_db(
 
         # Print timing summary
         total_time = time.time() - channel_start_time
+        if stats["videos_processed"]:
+            set_gauge("channel_videos_per_minute", stats["videos_processed"] / total_time * 60, channel=channel_handle)
         if verbose:
             print(f"\n--- Timing Summary ---")
             print(f"Total: {total_time:.1f}s for {stats['videos_processed']} videos")
@@ -270,6 +379,10 @@ def scrape_channel_to_db(
             error_message=str(e),
         )
         raise
+    finally:
+        if metadata_pool is not None:
+            metadata_pool.shutdown(wait=False, cancel_futures=True)
+        save_rejected(video_filter)
 
     return stats
 
@@ -283,6 +396,7 @@ def scrape_all_channels(
     transcript_providers: list[str] | None = None,
     force_update: bool = False,
     metadata_only: bool = False,
+    video_filter: VideoFilter | None = None,
 ) -> dict:
     """
     Scrape all channels from channels.json to Supabase.
@@ -295,11 +409,14 @@ def scrape_all_channels(
         transcript_providers: List of providers to use for transcripts
         force_update: Force update channel metadata even if it already exists
         metadata_only: Only update channel metadata, skip video scraping
+        video_filter: Which videos to keep (shared across channels)
 
     Returns:
         Combined stats dict
     """
     channels = load_channels_config()
+    if video_filter is None:
+        video_filter = VideoFilter()
 
     if channels_filter:
         channels = {k: v for k, v in channels.items() if k in channels_filter}
@@ -333,6 +450,7 @@ def scrape_all_channels(
                 transcript_providers=transcript_providers,
                 force_update=force_update,
                 metadata_only=metadata_only,
+                video_filter=video_filter,
             )
 
             total_stats["channels_processed"] += 1
@@ -346,6 +464,8 @@ def scrape_all_channels(
             if verbose:
                 print(f"ERROR scraping {channel_name}: {e}")
 
+    total_stats["filter_rejections"] = video_filter.total_rejections
+
     if verbose:
         print(f"\n{'='*60}")
         print("SUMMARY")
@@ -354,6 +474,17 @@ def scrape_all_channels(
         print(f"Total videos found: {total_stats['total_videos_found']}")
         print(f"Total videos saved: {total_stats['total_videos_processed']}")
         print(f"Transcripts added: {total_stats['total_transcripts_added']}")
+        _print_filter_rejections(video_filter)
+        if format_stage_metrics():
+            print(format_stage_metrics())
+        if format_provider_stats():
+            print(format_provider_stats())
+        if format_circuit_stats():
+            print(format_circuit_stats())
+        if format_retry_stats():
+            print(format_retry_stats())
+        if format_http_stats():
+            print(format_http_stats())
         if total_stats["errors"]:
             print(f"Errors: {len(total_stats['errors'])}")
             for err in total_stats["errors"][:5]:
@@ -362,6 +493,150 @@ def scrape_all_channels(
     return total_stats
 
 
+def _print_filter_rejections(video_filter: VideoFilter) -> None:
+    """Print how many videos each filter rule rejected (work avoided)."""
+    if not video_filter.total_rejections:
+        return
+    print(f"Filtered out: {video_filter.total_rejections}")
+    for line in video_filter.summary():
+        print(f"  - {line}")
+
+
+def run_daemon(
+    video_limit: int = 10,
+    fetch_transcripts: bool = True,
+    fetch_metadata: bool = True,
+    channels_filter: list[str] | None = None,
+    verbose: bool = True,
+    transcript_providers: list[str] | None = None,
+    min_interval: float = MIN_POLL_INTERVAL,
+    max_interval: float = MAX_POLL_INTERVAL,
+    use_feed: bool = True,
+    video_filter: VideoFilter | None = None,
+) -> dict:
+    """
+    Poll channels from channels.json forever on an adaptive schedule.
+
+    Each channel's next poll time is derived from its upload cadence
+    (published_at history), so active channels are checked often and
+    dormant ones rarely. Only videos not already in the database are
+    enriched, and the channel's Atom feed is checked before falling back
+    to a yt-dlp listing. Everything runs in one process so the Supabase and
+    HTTP connection pools stay warm between polls.
+
+    Args:
+        video_limit: Maximum new videos to process per poll
+        fetch_transcripts: Whether to fetch transcripts
+        channels_filter: Optional list of channel names to filter
+        verbose: Print progress messages
+        transcript_providers: List of providers to use for transcripts
+        min_interval: Shortest allowed poll interval in seconds
+        max_interval: Longest allowed poll interval in seconds
+        use_feed: Use the Atom feed fast path for new-upload detection
+        video_filter: Which videos to keep (shared across polls)
+
+    Returns:
+        Combined stats dict (when interrupted with Ctrl+C)
+    """
+    channels = load_channels_config()
+    if video_filter is None:
+        video_filter = VideoFilter()
+
+    if channels_filter:
+        channels = {k: v for k, v in channels.items() if k in channels_filter}
+
+    total_stats = {
+        "polls": 0,
+        "total_videos_processed": 0,
+        "total_transcripts_added": 0,
+        "errors": [],
+    }
+
+    if not channels:
+        if verbose:
+            print("No channels to poll")
+        return total_stats
+
+    # Min-heap of (next_poll_at, channel_name, channel_handle); all due now
+    now = time.time()
+    queue = [(now, name, handle) for name, handle in channels.items()]
+    heapq.heapify(queue)
+    # Channels whose source row (and /about metadata) has been fetched this run
+    initialized: set[str] = set()
+
+    if verbose:
+        print(f"\nDaemon: polling {len(channels)} channels "
+              f"(interval {min_interval / 60:.0f}m - {max_interval / 3600:.1f}h)")
+
+    try:
+        while True:
+            next_poll_at, channel_name, channel_handle = heapq.heappop(queue)
+            wait = next_poll_at - time.time()
+            if wait > 0:
+                time.sleep(wait)
+
+            interval = min_interval
+            try:
+                stats = scrape_channel_to_db(
+                    channel_name=channel_name,
+                    channel_handle=channel_handle,
+                    video_limit=video_limit,
+                    fetch_transcripts=fetch_transcripts,
+                    fetch_metadata=fetch_metadata,
+                    verbose=verbose,
+                    transcript_providers=transcript_providers,
+                    skip_existing=True,
+                    fetch_channel_metadata=channel_handle not in initialized,
+                    use_feed=use_feed,
+                    video_filter=video_filter,
+                )
+                initialized.add(channel_handle)
+
+                total_stats["polls"] += 1
+                total_stats["total_videos_processed"] += stats["videos_processed"]
+                total_stats["total_transcripts_added"] += stats["transcripts_added"]
+                total_stats["errors"].extend(stats["errors"])
+
+                published_at = get_recent_published_at(stats["source_id"], CADENCE_HISTORY)
+                interval = compute_poll_interval(published_at, min_interval, max_interval)
+
+            except Exception as e:
+                total_stats["errors"].append(f"{channel_name}: {e}")
+                if verbose:
+                    print(f"ERROR polling {channel_name}: {e}")
+
+            heapq.heappush(queue, (time.time() + interval, channel_name, channel_handle))
+
+            if verbose:
+                print(f"Next poll for {channel_name} in {interval / 3600:.1f}h")
+
+    except KeyboardInterrupt:
+        if verbose:
+            print(f"\n{'='*60}")
+            print("SUMMARY")
+            print(f"{'='*60}")
+            print(f"Polls: {total_stats['polls']}")
+            print(f"Videos saved: {total_stats['total_videos_processed']}")
+            print(f"Transcripts added: {total_stats['total_transcripts_added']}")
+            _print_filter_rejections(video_filter)
+            if format_stage_metrics():
+                print(format_stage_metrics())
+            if format_provider_stats():
+                print(format_provider_stats())
+            if format_circuit_stats():
+                print(format_circuit_stats())
+            if format_retry_stats():
+                print(format_retry_stats())
+            if format_http_stats():
+                print(format_http_stats())
+            if total_stats["errors"]:
+                print(f"Errors: {len(total_stats['errors'])}")
+                for err in total_stats["errors"][:5]:
+                    print(f"  - {err}")
+
+    return total_stats
+
+
 def main():
     """CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -399,11 +674,39 @@ def main():
         action="store_true",
         help="Skip fetching rich metadata (faster, only gets id/title/duration)"
     )
+    parser.add_argument(
+        "--metadata-profile",
+        choices=METADATA_PROFILES,
+        help="yt-dlp extraction for rich metadata: full (default) or lite "
+             "(same stored fields, skips format/manifest/player JS processing)"
+    )
     parser.add_argument(
         "--supadata-only",
         action="store_true",
         help="Use only Supadata for transcripts (skip youtube_api)"
     )
+    parser.add_argument(
+        "--transcript-strategy",
+        choices=STRATEGIES,
+        help="How to combine transcript providers: one after another (sequential, default), "
+             "start the next one when the current is slow (hedged), or all at once (race)"
+    )
+    parser.add_argument(
+        "--hedge-delay",
+        type=float,
+        help=f"Hedged strategy: seconds before starting the next provider (default: {DEFAULT_HEDGE_DELAY:g})"
+    )
+    parser.add_argument(
+        "--metadata-executor",
+        choices=EXECUTORS,
+        help="Where yt-dlp metadata extraction runs: in scraper threads (thread, default) "
+             "or in long-lived worker processes (process)"
+    )
+    parser.add_argument(
+        "--metadata-workers",
+        type=int,
+        help="Videos whose metadata is extracted at once (default: 1)"
+    )
     parser.add_argument(
         "--force-update",
         action="store_true",
@@ -414,13 +717,75 @@ def main():
         action="store_true",
         help="Only update channel metadata, skip video scraping"
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Run forever, polling each channel on an adaptive schedule (new videos only)"
+    )
+    parser.add_argument(
+        "--min-interval",
+        type=float,
+        default=MIN_POLL_INTERVAL / 60,
+        help=f"Daemon: shortest poll interval in minutes (default: {MIN_POLL_INTERVAL // 60})"
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=MAX_POLL_INTERVAL / 60,
+        help=f"Daemon: longest poll interval in minutes (default: {MAX_POLL_INTERVAL // 60})"
+    )
+    parser.add_argument(
+        "--no-feed",
+        action="store_true",
+        help="Daemon: always use the yt-dlp listing instead of the Atom feed fast path"
+    )
+    parser.add_argument(
+        "--filter-spec",
+        type=Path,
+        metavar="FILE",
+        help="JSON video filter spec (default: >= 20 min, no live/upcoming, no shorts)"
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        help="Append per-stage timing/throughput metrics here as JSON lines at the end of the run"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running"
+    )
 
     args = parser.parse_args()
 
     # Determine transcript providers
     transcript_providers = ["supadata"] if args.supadata_only else None
-
-    if args.single:
+    video_filter = VideoFilter.from_file(args.filter_spec) if args.filter_spec else VideoFilter()
+    if args.transcript_strategy or args.hedge_delay is not None:
+        set_transcript_strategy(args.transcript_strategy or "hedged", args.hedge_delay)
+    if args.metadata_profile:
+        set_metadata_profile(args.metadata_profile)
+    if args.metadata_executor or args.metadata_workers:
+        set_metadata_executor(args.metadata_executor or "thread", args.metadata_workers)
+
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+
+    if args.daemon:
+        # Long-running adaptive polling mode
+        run_daemon(
+            video_limit=args.limit,
+            fetch_transcripts=not args.no_transcripts,
+            fetch_metadata=not args.fast,
+            channels_filter=args.channels,
+            verbose=not args.quiet,
+            transcript_providers=transcript_providers,
+            min_interval=args.min_interval * 60,
+            max_interval=args.max_interval * 60,
+            use_feed=not args.no_feed,
+            video_filter=video_filter,
+        )
+    elif args.single:
         # Single channel mode
         scrape_channel_to_db(
             channel_name=args.single,
@@ -432,7 +797,16 @@ def main():
             transcript_providers=transcript_providers,
             force_update=args.force_update,
             metadata_only=args.metadata_only,
+            video_filter=video_filter,
         )
+        if not args.quiet and format_stage_metrics():
+            print(format_stage_metrics())
+        if not args.quiet and format_provider_stats():
+            print(format_provider_stats())
+        if not args.quiet and format_circuit_stats():
+            print(format_circuit_stats())
+        if not args.quiet and format_retry_stats():
+            print(format_retry_stats())
     else:
         # All channels mode
         scrape_all_channels(
@@ -444,8 +818,11 @@ def main():
             transcript_providers=transcript_providers,
             force_update=args.force_update,
             metadata_only=args.metadata_only,
+            video_filter=video_filter,
         )
 
+    write_metrics(args.metrics_file)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,975 @@
+"""
+Local stand-ins for the scraper's external services, for offline benchmarks.
+
+One HTTP server answers for every service the scraper talks to, from
+recorded fixtures (see BenchFixtures), under path prefixes:
+- /supadata/v1/transcript        Supadata transcripts
+- /wikipedia/w/api.php           MediaWiki title lookup and search
+- /youtube/feeds/videos.xml      YouTube Atom feeds (with ETag / If-None-Match)
+- /openai/v1/chat/completions    OpenAI chat completions (streamed on request)
+- /anthropic/v1/messages         Anthropic messages (streamed on request)
+- /supabase/rest/v1/<table>      In-memory PostgREST subset (filters, embeds,
+                                 upserts) over the scraper's tables
+
+yt-dlp scrapes YouTube HTML rather than calling an API, so it is replayed
+in-process instead: ReplayYoutubeDL returns the recorded info dicts
+(output/triggerpod.json) and is swapped in for yt_dlp.YoutubeDL.
+
+Every service has a Fault (latency, jitter, error rate; for yt-dlp also CPU
+time, standing in for its parsing work) and request counters,
+so benchmarks can inject slow or failing dependencies and count requests.
+See bench.py for the harness.
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+from xml.sax.saxutils import escape
+
+PACKAGE_DIR = Path(__file__).parent.parent.parent
+
+DEFAULT_VIDEOS_PATH = PACKAGE_DIR / "output" / "triggerpod.json"
+DEFAULT_LABELS_PATH = PACKAGE_DIR / "fixtures" / "guest_labels.json"
+
+# Typical production latency per service, in seconds
+DEFAULT_LATENCY: dict[str, float] = {
+    "youtube": 2.0,
+    "youtube_feed": 0.1,
+    "supadata": 1.5,
+    "wikipedia": 0.15,
+    "openai": 2.0,
+    "anthropic": 3.0,
+    "postgrest": 0.03,
+}
+
+SERVICES = list(DEFAULT_LATENCY)
+
+# A well-formed (unsigned) service-role JWT; supabase-py validates the shape only
+STANDIN_SECRET_KEY = (
+    "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9."
+    "eyJyb2xlIjoic2VydmljZV9yb2xlIiwiaXNzIjoic3VwYWJhc2UtZGVtbyJ9."
+    "c2NyYXBlci1iZW5jaA"
+)
+
+# Spoken words per second, for synthesized transcripts
+WORDS_PER_SECOND = 2.5
+
+# "12:34 Title" / "1:02:03 - Title" lines in a description, as YouTube turns into chapters
+_CHAPTER_LINE = re.compile(r"^\s*\(?((?:\d+:)?\d{1,2}:\d{2})\)?\s*[-–:]?\s*(.+)$", re.MULTILINE)
+
+
+def _description_chapters(description: str | None) -> list[dict] | None:
+    """Chapters from description timestamps (YouTube needs at least 3, the first at 0:00)."""
+    chapters = []
+    for stamp, title in _CHAPTER_LINE.findall(description or ""):
+        seconds = 0
+        for part in stamp.split(":"):
+            seconds = seconds * 60 + int(part)
+        chapters.append({"start_time": float(seconds), "title": title.strip()})
+    if len(chapters) < 3 or chapters[0]["start_time"] != 0:
+        return None
+    return chapters
+
+
+class Fault:
+    """Latency and error injection for one service."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 500,
+        cpu: float = 0.0,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        # Pure-Python work per call in seconds (ReplayYoutubeDL only); holds the GIL like yt-dlp's parsing
+        self.cpu = cpu
+
+
+def _burn_cpu(seconds: float) -> None:
+    """Spin in Python for this much CPU time of the calling thread."""
+    deadline = time.thread_time() + seconds
+    while time.thread_time() < deadline:
+        sum(i * i for i in range(1000))
+
+
+class InjectedError(RuntimeError):
+    """Raised by in-process stand-ins when a fault is injected."""
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+class BenchFixtures:
+    """Recorded channel data and the responses derived from it."""
+
+    def __init__(
+        self,
+        videos_path: Path = DEFAULT_VIDEOS_PATH,
+        labels_path: Path = DEFAULT_LABELS_PATH,
+    ):
+        with open(videos_path, encoding="utf-8") as f:
+            self.videos: list[dict] = json.load(f)
+        self.by_id = {v["id"]: v for v in self.videos}
+
+        first = self.videos[0]
+        self.channel_name = first.get("channel") or "Unknown"
+        self.channel_id = first.get("channel_id")
+        self.channel_handle = "@" + re.sub(r"\W", "", self.channel_name).lower()
+
+        # Guests per title: labelled fixture videos, else the " - Guest Name" title suffix
+        self.guests_by_title: dict[str, list[str]] = {}
+        if labels_path.exists():
+            with open(labels_path, encoding="utf-8") as f:
+                for video in json.load(f)["videos"]:
+                    self.guests_by_title[video["title"]] = video["guests"]
+        for video in self.videos:
+            title = video.get("title") or ""
+            if title not in self.guests_by_title and " - " in title:
+                self.guests_by_title[title] = [title.rsplit(" - ", 1)[1].strip()]
+
+        # People with a Wikipedia page: every other known guest, deterministically
+        names = sorted({n for guests in self.guests_by_title.values() for n in guests})
+        self.wikipedia_pages = {name: name for i, name in enumerate(names) if i % 2 == 0}
+
+    def listing(self) -> dict:
+        """Flat channel listing, as yt-dlp returns for /videos."""
+        return {
+            "channel": self.channel_name,
+            "entries": [
+                {
+                    "id": v["id"],
+                    "title": v.get("title"),
+                    "url": f"https://www.youtube.com/watch?v={v['id']}",
+                    "duration": v.get("duration"),
+                }
+                for v in self.videos
+            ],
+        }
+
+    def channel_about(self) -> dict:
+        """Channel info, as yt-dlp returns for /about."""
+        return {
+            "channel": self.channel_name,
+            "description": f"{self.channel_name} is a podcast.",
+            "channel_follower_count": 1_000_000,
+            "channel_id": self.channel_id,
+            "thumbnails": [{"url": f"https://yt3.example/{self.channel_id}.jpg"}],
+        }
+
+    def video_info(self, video_id: str) -> dict | None:
+        """Full info dict for one video, as yt-dlp returns for a watch URL."""
+        video = self.by_id.get(video_id)
+        if video is None:
+            return None
+        return {
+            **video,
+            "webpage_url": f"https://www.youtube.com/watch?v={video_id}",
+            "live_status": video.get("live_status") or "not_live",
+            "chapters": video.get("chapters") or _description_chapters(video.get("description")),
+        }
+
+    def transcript(self, video_id: str) -> str | None:
+        """Recorded transcript, or one synthesized at speaking rate from the description."""
+        video = self.by_id.get(video_id)
+        if video is None:
+            return None
+        if video.get("transcript"):
+            return video["transcript"]
+
+        words = (video.get("description") or video.get("title") or "words").split()
+        target = int((video.get("duration") or 600) * WORDS_PER_SECOND)
+        return " ".join(words[i % len(words)] for i in range(target))
+
+    def guests_for(self, title: str) -> list[str]:
+        return self.guests_by_title.get(title.strip(), [])
+
+
+# =============================================================================
+# yt-dlp replay
+# =============================================================================
+
+class ReplayYoutubeDL:
+    """Drop-in for yt_dlp.YoutubeDL that answers extract_info from fixtures."""
+
+    fixtures: BenchFixtures | None = None
+    fault = Fault()
+    counts: dict[str, int] = {}
+    _lock = threading.Lock()
+    _random = random.Random(0)
+
+    def __init__(self, params: dict | None = None):
+        self.params = params or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url: str, download: bool = False, process: bool = True) -> dict | None:
+        cls = type(self)
+        if url.endswith("/videos"):
+            kind = "listing"
+        elif url.endswith("/about"):
+            kind = "about"
+        else:
+            kind = "video"
+
+        with cls._lock:
+            cls.counts[kind] = cls.counts.get(kind, 0) + 1
+            delay = cls.fault.latency + cls._random.uniform(0, cls.fault.jitter)
+            failed = cls._random.random() < cls.fault.error_rate
+        time.sleep(delay)
+        _burn_cpu(cls.fault.cpu)
+        if failed:
+            with cls._lock:
+                cls.counts["errors"] = cls.counts.get("errors", 0) + 1
+            # Like yt-dlp: the error goes to the logger, and ignoreerrors
+            # swallows the failure and returns None
+            if self.params.get("logger"):
+                self.params["logger"].error(f"ERROR: [youtube] Unable to download {url}: HTTP Error 503: Service Unavailable")
+            if self.params.get("ignoreerrors"):
+                return None
+            raise InjectedError(f"Injected yt-dlp failure for {url}")
+
+        if kind == "listing":
+            return cls.fixtures.listing()
+        if kind == "about":
+            return cls.fixtures.channel_about()
+        match = re.search(r"v=([\w-]+)", url)
+        return cls.fixtures.video_info(match.group(1)) if match else None
+
+
+def install_replay(fixtures: BenchFixtures, fault: Fault) -> None:
+    """Swap ReplayYoutubeDL in for yt_dlp.YoutubeDL (also the initializer for yt-dlp worker processes)."""
+    import yt_dlp
+
+    ReplayYoutubeDL.fixtures = fixtures
+    ReplayYoutubeDL.fault = fault
+    yt_dlp.YoutubeDL = ReplayYoutubeDL
+
+
+# =============================================================================
+# In-memory PostgREST
+# =============================================================================
+
+def _summary_transcript_changed(row: dict) -> bool:
+    return (
+        row.get("summary") is not None
+        and row.get("summary_transcript_sha256") is not None
+        and row.get("summary_transcript_sha256") != row.get("transcript_sha256")
+    )
+
+
+# Unique constraints, column defaults and generated columns of the tables the
+# scraper writes (packages/api/supabase/migrations). Tables not listed get an
+# id only.
+TABLES: dict[str, dict[str, Any]] = {
+    "sources": {
+        "unique": [("id",), ("type", "external_id")],
+        "defaults": {"type": "youtube_channel", "is_active": True},
+        "timestamps": ("created_at", "updated_at"),
+    },
+    "videos": {
+        "unique": [("id",), ("source_id", "external_id")],
+        "defaults": {"has_transcript": False, "transcript_language": "en"},
+        "timestamps": ("created_at", "updated_at"),
+        "generated": {"summary_transcript_changed": _summary_transcript_changed},
+    },
+    "people": {
+        "unique": [("id",), ("slug",)],
+        "defaults": {"social_links": {}, "aliases": []},
+        "timestamps": ("created_at", "updated_at"),
+    },
+    "source_people": {
+        "unique": [("id",), ("source_id", "person_id", "role")],
+        "defaults": {"role": "host", "is_primary": False, "verified": False},
+        "timestamps": ("created_at",),
+    },
+    "video_people": {
+        "unique": [("id",), ("video_id", "person_id", "role")],
+        "defaults": {"display_order": 0},
+        "timestamps": ("created_at",),
+    },
+    "video_chapters": {
+        "unique": [("id",)],
+        "timestamps": ("created_at",),
+    },
+    "tags": {
+        "unique": [("id",), ("slug",)],
+        "defaults": {"type": "general"},
+        "timestamps": ("created_at",),
+    },
+    "video_tags": {
+        "unique": [("video_id", "tag_id")],
+        "defaults": {"source": "youtube"},
+        "timestamps": ("created_at",),
+        "no_id": True,
+    },
+    "scrape_logs": {
+        "unique": [("id",)],
+        "defaults": {"videos_found": 0, "videos_new": 0, "videos_updated": 0, "transcripts_added": 0},
+        "timestamps": ("created_at",),
+    },
+}
+
+# Embedded resource name -> foreign key column name stem
+_SINGULAR = {"people": "person", "sources": "source", "videos": "video", "tags": "tag"}
+
+
+class PostgrestError(Exception):
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _singular(table: str) -> str:
+    return _SINGULAR.get(table, table[:-1] if table.endswith("s") else table)
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Split on commas outside parentheses and quotes."""
+    parts, depth, quoted, current = [], 0, False, ""
+    for ch in text:
+        if ch == '"':
+            quoted = not quoted
+        elif not quoted and ch == "(":
+            depth += 1
+        elif not quoted and ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0 and not quoted:
+            parts.append(current)
+            current = ""
+        else:
+            current += ch
+    if current:
+        parts.append(current)
+    return [p.strip() for p in parts if p.strip()]
+
+
+def _coerce(value: str, like: Any) -> Any:
+    """Convert a filter value string to the type of a stored value."""
+    if isinstance(like, bool):
+        return value.lower() == "true"
+    if isinstance(like, (int, float)):
+        try:
+            return float(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _matches(row: dict, column: str, expression: str) -> bool:
+    if column == "or":
+        # or=(column.op.value,...)
+        conditions = [c.split(".", 1) for c in _split_top_level(expression.strip("()"))]
+        return any(_matches(row, c, e) for c, e in conditions)
+
+    negate = expression.startswith("not.")
+    if negate:
+        expression = expression[4:]
+    op, _, value = expression.partition(".")
+    actual = row.get(column)
+
+    if op == "is":
+        result = actual is None if value == "null" else actual is (value == "true")
+    elif op == "in":
+        options = [v.strip().strip('"') for v in _split_top_level(value.strip("()"))]
+        result = actual is not None and str(actual if not isinstance(actual, bool) else str(actual).lower()) in options
+    elif actual is None:
+        result = False
+    elif op in ("like", "ilike"):
+        pattern = "^" + re.escape(value).replace(r"\*", ".*").replace("%", ".*") + "$"
+        result = re.match(pattern, str(actual), re.IGNORECASE if op == "ilike" else 0) is not None
+    else:
+        expected = _coerce(value, actual)
+        compare = {
+            "eq": lambda a, b: a == b,
+            "neq": lambda a, b: a != b,
+            "gt": lambda a, b: a > b,
+            "gte": lambda a, b: a >= b,
+            "lt": lambda a, b: a < b,
+            "lte": lambda a, b: a <= b,
+        }.get(op)
+        if compare is None:
+            raise PostgrestError(400, "PGRST100", f"Unsupported operator: {op}")
+        try:
+            result = compare(actual, expected)
+        except TypeError:
+            result = compare(str(actual), str(expected))
+
+    return not result if negate else result
+
+
+class MemoryPostgrest:
+    """Just enough of PostgREST for scraper.db, over dicts in memory."""
+
+    def __init__(self):
+        self.tables: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.tables = {}
+
+    def rows(self, table: str) -> list[dict]:
+        return self.tables.setdefault(table, [])
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+
+    def _filter(self, table: str, filters: list[tuple[str, str]]) -> list[dict]:
+        rows = self.rows(table)
+        for column, expression in filters:
+            rows = [r for r in rows if _matches(r, column, expression)]
+        return rows
+
+    def _project(self, table: str, row: dict, select: str) -> dict:
+        result: dict[str, Any] = {}
+        for item in _split_top_level(select or "*"):
+            alias, _, spec = item.rpartition(":") if ":" in item.split("(", 1)[0] else ("", "", item)
+            if "(" in spec:
+                name, columns = spec.split("(", 1)
+                name = name.split("!", 1)[0]
+                columns = columns[:-1]
+                result[alias or name] = self._embed(table, row, name, columns)
+            elif spec == "*":
+                result.update(row)
+            else:
+                result[alias or spec] = row.get(spec)
+        return result
+
+    def _embed(self, parent: str, row: dict, table: str, columns: str) -> Any:
+        key = f"{_singular(table)}_id"
+        if key in row:
+            # Many-to-one: the parent row holds the foreign key
+            target = next((r for r in self.rows(table) if r.get("id") == row.get(key)), None)
+            return self._project(table, target, columns) if target else None
+        # One-to-many: child rows point back at the parent
+        back = f"{_singular(parent)}_id"
+        return [self._project(table, r, columns) for r in self.rows(table) if r.get(back) == row.get("id")]
+
+    def select(self, table: str, params: list[tuple[str, str]]) -> list[dict]:
+        select, order, limit, offset = "*", None, None, 0
+        filters = []
+        for key, value in params:
+            if key == "select":
+                select = value
+            elif key == "order":
+                order = value
+            elif key == "limit":
+                limit = int(value)
+            elif key == "offset":
+                offset = int(value)
+            elif "." not in key and key not in ("columns", "on_conflict"):
+                filters.append((key, value))
+
+        rows = self._filter(table, filters)
+
+        if order:
+            for term in reversed(order.split(",")):
+                column, _, direction = term.partition(".")
+                desc = direction.startswith("desc")
+                present = [r for r in rows if r.get(column) is not None]
+                missing = [r for r in rows if r.get(column) is None]
+                present.sort(key=lambda r: r[column], reverse=desc)
+                # Postgres puts NULLs last ascending, first descending
+                nulls_first = "nullsfirst" in direction or (desc and "nullslast" not in direction)
+                rows = missing + present if nulls_first else present + missing
+
+        rows = rows[offset:offset + limit if limit is not None else None]
+        return [self._project(table, r, select) for r in rows]
+
+    # -------------------------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------------------------
+
+    def _generate(self, table: str, row: dict) -> None:
+        for column, compute in TABLES.get(table, {}).get("generated", {}).items():
+            row[column] = compute(row)
+
+    def _new_row(self, table: str, data: dict) -> dict:
+        schema = TABLES.get(table, {})
+        row = {k: (json.loads(json.dumps(v))) for k, v in schema.get("defaults", {}).items()}
+        if not schema.get("no_id"):
+            row["id"] = str(uuid.uuid4())
+        for column in schema.get("timestamps", ("created_at",)):
+            row[column] = _now()
+        row.update({k: v for k, v in data.items() if v is not None or k not in row})
+        self._generate(table, row)
+        return row
+
+    def _conflict(self, table: str, data: dict, columns: tuple[str, ...]) -> dict | None:
+        if any(data.get(c) is None for c in columns):
+            return None
+        return next(
+            (r for r in self.rows(table) if all(r.get(c) == data.get(c) for c in columns)),
+            None,
+        )
+
+    def insert(
+        self,
+        table: str,
+        body: list[dict],
+        on_conflict: str | None = None,
+        resolution: str | None = None,
+    ) -> list[dict]:
+        schema = TABLES.get(table, {})
+        constraints = [tuple(c.strip() for c in on_conflict.split(","))] if on_conflict else schema.get("unique", [("id",)])
+
+        returned = []
+        pending = []
+        for data in body:
+            existing = None
+            for columns in constraints:
+                existing = self._conflict(table, data, columns)
+                if existing:
+                    break
+            # Like Postgres, a statement may not touch the same key twice
+            for columns in constraints:
+                if any(
+                    all(data.get(c) is not None and earlier.get(c) == data.get(c) for c in columns)
+                    for _, earlier in pending
+                ):
+                    raise PostgrestError(500, "21000", f"command cannot affect row a second time ({table})")
+
+            if existing and resolution is None:
+                raise PostgrestError(409, "23505", f"duplicate key value violates unique constraint on {table}")
+            pending.append((existing, data))
+
+        for existing, data in pending:
+            if existing is None:
+                row = self._new_row(table, data)
+                self.rows(table).append(row)
+                returned.append(row)
+            elif resolution == "merge-duplicates":
+                existing.update(data)
+                if "updated_at" in schema.get("timestamps", ()):
+                    existing["updated_at"] = _now()
+                self._generate(table, existing)
+                returned.append(existing)
+
+        return returned
+
+    def update(self, table: str, filters: list[tuple[str, str]], body: dict) -> list[dict]:
+        rows = self._filter(table, filters)
+        for row in rows:
+            row.update(body)
+            if "updated_at" in TABLES.get(table, {}).get("timestamps", ()) and "updated_at" not in body:
+                row["updated_at"] = _now()
+            self._generate(table, row)
+        return rows
+
+    def delete(self, table: str, filters: list[tuple[str, str]]) -> list[dict]:
+        doomed = self._filter(table, filters)
+        ids = {id(r) for r in doomed}
+        self.tables[table] = [r for r in self.rows(table) if id(r) not in ids]
+        return doomed
+
+    def handle(
+        self,
+        method: str,
+        table: str,
+        params: list[tuple[str, str]],
+        headers: dict[str, str],
+        body: Any,
+    ) -> tuple[int, Any]:
+        """Serve one PostgREST request; returns (status, JSON payload)."""
+        prefer = {
+            k.strip(): v.strip()
+            for k, _, v in (p.partition("=") for p in headers.get("prefer", "").split(","))
+            if k.strip()
+        }
+        query = dict(params)
+        filters = [(k, v) for k, v in params if k not in ("select", "order", "limit", "offset", "columns", "on_conflict")
+                   and "." not in k]
+
+        try:
+            with self._lock:
+                if method == "GET":
+                    rows = self.select(table, params)
+                elif method == "POST":
+                    records = body if isinstance(body, list) else [body]
+                    columns = query.get("columns")
+                    if columns:
+                        # Bulk insert: every row gets every listed column (missing = NULL)
+                        names = [c.strip().strip('"') for c in columns.split(",")]
+                        records = [{c: r.get(c) for c in names} for r in records]
+                    rows = self.insert(table, records, query.get("on_conflict"), prefer.get("resolution"))
+                    if "select" in query:
+                        rows = [self._project(table, r, query["select"]) for r in rows]
+                elif method == "PATCH":
+                    rows = self.update(table, filters, body or {})
+                elif method == "DELETE":
+                    rows = self.delete(table, filters)
+                else:
+                    return 405, {"message": f"Unsupported method {method}"}
+
+                rows = json.loads(json.dumps(rows))
+        except PostgrestError as e:
+            return e.status, {"code": e.code, "message": e.message, "details": None, "hint": None}
+
+        status = 201 if method == "POST" else 200
+        if prefer.get("return") == "minimal" and method != "GET":
+            return 204 if method != "POST" else 201, None
+        if "vnd.pgrst.object" in headers.get("accept", ""):
+            if len(rows) != 1:
+                return 406, {
+                    "code": "PGRST116",
+                    "message": "JSON object requested, multiple (or no) rows returned",
+                    "details": f"The result contains {len(rows)} rows",
+                    "hint": None,
+                }
+            return status, rows[0]
+        return status, rows
+
+
+# =============================================================================
+# HTTP server
+# =============================================================================
+
+class StandinServer:
+    """Local HTTP stand-ins for Supadata, Wikipedia, the feed, LLM APIs and PostgREST."""
+
+    def __init__(
+        self,
+        fixtures: BenchFixtures,
+        faults: dict[str, Fault] | None = None,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.fixtures = fixtures
+        self.faults = {service: Fault() for service in SERVICES}
+        self.faults.update(faults or {})
+        self.db = MemoryPostgrest()
+        self.counts: dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; don't let delayed ACKs stall keep-alive
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def _dispatch(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    status, payload, content_type = server.dispatch(
+                        self.command, self.path, {k.lower(): v for k, v in self.headers.items()}, raw
+                    )
+                except Exception as e:
+                    status, payload, content_type = 500, {"message": f"Stand-in error: {e}"}, "application/json"
+                if isinstance(payload, (bytes, str)):
+                    data = payload.encode("utf-8") if isinstance(payload, str) else payload
+                else:
+                    data = json.dumps(payload).encode("utf-8") if payload is not None else b""
+                etag = None
+                if content_type == "application/atom+xml" and status == 200:
+                    # Conditional GET, as YouTube serves feeds
+                    etag = f'"{hashlib.md5(data).hexdigest()}"'
+                    if self.headers.get("If-None-Match") == etag:
+                        status, data = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PATCH = do_DELETE = _dispatch
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+
+    def start(self) -> "StandinServer":
+        threading.Thread(target=self.httpd.serve_forever, name="standins", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def service_url(self, service: str) -> str:
+        """Base URL to configure a client with (e.g. OPENAI_BASE_URL)."""
+        return {
+            "supadata": f"{self.url}/supadata/v1",
+            "wikipedia": f"{self.url}/wikipedia/w/api.php",
+            "youtube_feed": f"{self.url}/youtube/feeds/videos.xml",
+            "openai": f"{self.url}/openai/v1",
+            "anthropic": f"{self.url}/anthropic",
+            "postgrest": f"{self.url}/supabase",
+        }[service]
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.counts = {}
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def dispatch(
+        self, method: str, path: str, headers: dict[str, str], raw: bytes
+    ) -> tuple[int, Any, str]:
+        """Route a request; returns (status, payload, content type)."""
+        url = urlsplit(path)
+        params = parse_qsl(url.query, keep_blank_values=True)
+        body = json.loads(raw) if raw else None
+        service, _, rest = url.path.lstrip("/").partition("/")
+        if service == "youtube":
+            service = "youtube_feed"
+        elif service == "supabase":
+            service = "postgrest"
+
+        fault = self.faults.get(service)
+        if fault is None:
+            return 404, {"error": f"Unknown service: {service}"}, "application/json"
+
+        endpoint = f"{service} {method} {rest.split('/')[-1] if service == 'postgrest' else rest}"
+        self._count(endpoint)
+
+        with self._lock:
+            delay = fault.latency + self._random.uniform(0, fault.jitter)
+            failed = self._random.random() < fault.error_rate
+        time.sleep(delay)
+        if failed:
+            self._count(f"{service} errors")
+            return fault.error_status, {"error": "Injected failure"}, "application/json"
+
+        if service == "postgrest":
+            table = rest.rsplit("/", 1)[-1]
+            status, payload = self.db.handle(method, table, params, headers, body)
+            return status, payload, "application/json"
+        if service == "supadata":
+            return self._supadata(dict(params))
+        if service == "wikipedia":
+            return self._wikipedia(dict(params))
+        if service == "youtube_feed":
+            return self._feed(dict(params))
+        if service == "openai":
+            return self._openai(body or {})
+        return self._anthropic(body or {})
+
+    # -------------------------------------------------------------------------
+    # Service handlers
+    # -------------------------------------------------------------------------
+
+    def _supadata(self, params: dict) -> tuple[int, Any, str]:
+        video_id = params.get("url", "").rsplit("/", 1)[-1]
+        text = self.fixtures.transcript(video_id)
+        if not text:
+            return 404, {"error": "transcript-unavailable"}, "application/json"
+
+        words = text.split()
+        segments = [
+            {"text": " ".join(words[i:i + 20]), "offset": i * 400, "duration": 8000, "lang": "en"}
+            for i in range(0, len(words), 20)
+        ]
+        return 200, {"content": segments, "lang": "en", "availableLangs": ["en"]}, "application/json"
+
+    def _wikipedia(self, params: dict) -> tuple[int, Any, str]:
+        def page(title: str, index: int = 0) -> dict:
+            return {
+                "title": title,
+                "index": index,
+                "thumbnail": {"source": f"https://upload.example/{title.replace(' ', '_')}.jpg"},
+            }
+
+        if params.get("generator") == "search":
+            term = params.get("gsrsearch", "")
+            title = self.fixtures.wikipedia_pages.get(term)
+            return 200, {"query": {"pages": [page(title, 1)]} if title else {}}, "application/json"
+
+        pages = []
+        for title in params.get("titles", "").split("|"):
+            if title in self.fixtures.wikipedia_pages:
+                pages.append(page(self.fixtures.wikipedia_pages[title]))
+            else:
+                pages.append({"title": title, "missing": True})
+        return 200, {"query": {"pages": pages}}, "application/json"
+
+    def _feed(self, params: dict) -> tuple[int, Any, str]:
+        entries = "".join(
+            "<entry>"
+            f"<yt:videoId>{escape(v['id'])}</yt:videoId>"
+            f"<title>{escape(v.get('title') or '')}</title>"
+            f"<link rel=\"alternate\" href=\"https://www.youtube.com/watch?v={escape(v['id'])}\"/>"
+            f"<published>{(v.get('upload_date') or '20240101')[:4]}-01-01T00:00:00+00:00</published>"
+            "</entry>"
+            for v in self.fixtures.videos[:15]
+        )
+        xml = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:yt="http://www.youtube.com/xml/schemas/2015">'
+            f"<yt:channelId>{escape(params.get('channel_id', ''))}</yt:channelId>{entries}</feed>"
+        )
+        return 200, xml, "application/atom+xml"
+
+    def _guest_reply(self, prompt: str, json_object: bool) -> str:
+        titles = re.findall(r"^(?:\[(\d+)\] )?Video title: (.*)$", prompt, re.MULTILINE)
+        if json_object:
+            return json.dumps({
+                key: [{"name": n, "role": "guest"} for n in self.fixtures.guests_for(title)]
+                for key, title in titles
+            })
+        guests = self.fixtures.guests_for(titles[0][1]) if titles else []
+        return json.dumps([{"name": n, "role": "guest"} for n in guests])
+
+    def _summary_reply(self, prompt: str) -> str:
+        title = re.search(r"^Video Title: (.*)$", prompt, re.MULTILINE)
+        words = re.findall(r"\w+", prompt)
+        points = "\n".join(
+            f"- **{' '.join(words[i:i + 2]).title()}:** {' '.join(words[i:i + 30])}."
+            for i in range(0, min(len(words), 180), 30)
+        )
+        return (
+            f"**Summary:**\nA stand-in summary of {title.group(1) if title else 'the video'}.\n\n"
+            f"**Key Points:**\n{points}"
+        )
+
+    def _sse(self, events: list[tuple[str | None, dict]]) -> tuple[int, Any, str]:
+        """A whole server-sent event stream as one response body."""
+        lines = []
+        for name, data in events:
+            if name:
+                lines.append(f"event: {name}")
+            lines.append(f"data: {json.dumps(data)}\n")
+        if events and events[0][0] is None:
+            lines.append("data: [DONE]\n")
+        return 200, "\n".join(lines) + "\n", "text/event-stream"
+
+    @staticmethod
+    def _pieces(content: str) -> list[str]:
+        return re.findall(r"\S+\s*|\s+", content)
+
+    def _openai(self, body: dict) -> tuple[int, Any, str]:
+        prompt = "\n".join(m.get("content", "") for m in body.get("messages", []) if m.get("role") == "user")
+        system = "\n".join(m.get("content", "") for m in body.get("messages", []) if m.get("role") == "system")
+        json_object = (body.get("response_format") or {}).get("type") == "json_object"
+        if "summariz" in system or "taking notes" in system:
+            content = self._summary_reply(prompt)
+        else:
+            content = self._guest_reply(prompt, json_object)
+        usage = {
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(content) // 4,
+            "total_tokens": (len(prompt) + len(content)) // 4,
+        }
+
+        if body.get("stream"):
+            base = {
+                "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": body.get("model", "gpt-4o-mini"),
+            }
+            events = [
+                (None, {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]})
+                for piece in self._pieces(content)
+            ]
+            events.append((None, {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}))
+            if (body.get("stream_options") or {}).get("include_usage"):
+                events.append((None, {**base, "choices": [], "usage": usage}))
+            return self._sse(events)
+
+        return 200, {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o-mini"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage,
+        }, "application/json"
+
+    def _anthropic(self, body: dict) -> tuple[int, Any, str]:
+        prompt = "\n".join(
+            m["content"] if isinstance(m.get("content"), str) else ""
+            for m in body.get("messages", [])
+        )
+        system = body.get("system") or ""
+        if "summariz" in system or "taking notes" in system:
+            content = self._summary_reply(prompt)
+        else:
+            content = self._guest_reply(prompt, json_object="JSON object" in system)
+
+        if body.get("stream"):
+            message = {
+                "id": f"msg_{uuid.uuid4().hex[:12]}",
+                "type": "message",
+                "role": "assistant",
+                "model": body.get("model", "claude-sonnet-4-20250514"),
+                "content": [],
+                "stop_reason": None,
+                "stop_sequence": None,
+                "usage": {"input_tokens": len(prompt) // 4, "output_tokens": 1},
+            }
+            events = [
+                ("message_start", {"type": "message_start", "message": message}),
+                ("content_block_start", {"type": "content_block_start", "index": 0,
+                                         "content_block": {"type": "text", "text": ""}}),
+            ]
+            events += [
+                ("content_block_delta", {"type": "content_block_delta", "index": 0,
+                                         "delta": {"type": "text_delta", "text": piece}})
+                for piece in self._pieces(content)
+            ]
+            events += [
+                ("content_block_stop", {"type": "content_block_stop", "index": 0}),
+                ("message_delta", {"type": "message_delta", "delta": {"stop_reason": "end_turn", "stop_sequence": None},
+                                   "usage": {"output_tokens": len(content) // 4}}),
+                ("message_stop", {"type": "message_stop"}),
+            ]
+            return self._sse(events)
+
+        return 200, {
+            "id": f"msg_{uuid.uuid4().hex[:12]}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "claude-sonnet-4-20250514"),
+            "content": [{"type": "text", "text": content}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": len(prompt) // 4, "output_tokens": len(content) // 4},
+        }, "application/json"
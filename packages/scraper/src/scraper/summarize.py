@@ -2,37 +2,103 @@
 Generate AI summaries for video transcripts.
 
 Supports OpenAI (default) and Anthropic Claude as providers.
+
+Long transcripts (and, with by_chapter, any video with chapters) are
+summarized chapter by chapter: each chapter chunk (see chapters.py) gets
+short notes from parallel LLM calls, and the final summary is written from
+those notes instead of from a truncated transcript.
+
+Every summary is stored with its provenance: the prompt version (a hash of
+the prompts below), the model and the hash of the transcript it was written
+from. After a prompt change or a transcript upgrade, refresh_summaries()
+(--refresh) regenerates exactly the stale summaries, newest first, until a
+spend budget is used up; summaries saved by hand are never replaced.
+
+With streaming (--stream), the final summary call streams its tokens and the
+text so far is checkpointed to videos.summary_partial every few seconds,
+where the web app can show it while the summary is pending. The final write
+sets videos.summary and clears the partial. An Anthropic summary cut short
+by a crash is resumed from its checkpoint on the next run instead of being
+generated again.
 """
 
 import argparse
+import hashlib
 import os
-from typing import Any, Literal
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Literal
 
 import anthropic
 import openai
 from dotenv import load_dotenv
 
-from .db import get_client
+from .chapters import chunk_transcript
+from .db import get_client, get_video_chapters, get_video_transcript, get_video_transcripts, transcript_hash
+from .http_client import format_http_stats, get_http_client
+from .llm_metrics import call_llm, call_llm_stream, format_llm_usage, get_llm_calls, write_llm_metrics
 
 load_dotenv()
 
 Provider = Literal["openai", "anthropic"]
 
+OPENAI_MODEL = "gpt-4o-mini"
+ANTHROPIC_MODEL = "claude-sonnet-4-20250514"
+
+# summary_model of summaries saved by hand (video_tasks.py, claude_summarize.py)
+MANUAL_MODEL = "manual"
+
+# LLM stages that count towards the refresh budget
+SUMMARY_STAGES = ("summary", "summary_chapter")
+
+# Longest transcript summarized in one call; longer ones go chapter by chapter
+MAX_TRANSCRIPT_CHARS = 100000
+
+# Chapter notes requested at once, and their length
+CHAPTER_WORKERS = 4
+CHAPTER_MAX_TOKENS = 600
+
+# LLM request timeout in seconds (the SDKs' own default). Without it the SDKs
+# take the shared HTTP client's 30 s, which long summaries exceed.
+LLM_TIMEOUT = float(os.getenv("SCRAPER_LLM_TIMEOUT", "600"))
+
+# Streamed summaries are checkpointed to videos.summary_partial at most this often
+CHECKPOINT_SECONDS = 2.0
+
+_openai_client: openai.OpenAI | None = None
+_anthropic_client: anthropic.Anthropic | None = None
+
+
+class BudgetExceededError(RuntimeError):
+    """The refresh budget ran out partway through a video's summary calls."""
+
 
 def get_openai_client() -> openai.OpenAI:
-    """Get OpenAI client."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("Missing OPENAI_API_KEY environment variable")
-    return openai.OpenAI(api_key=api_key)
+    """Get or create the OpenAI client (shares the pooled HTTP client)."""
+    global _openai_client
+
+    if _openai_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("Missing OPENAI_API_KEY environment variable")
+        _openai_client = openai.OpenAI(api_key=api_key, http_client=get_http_client(), timeout=LLM_TIMEOUT)
+
+    return _openai_client
 
 
 def get_anthropic_client() -> anthropic.Anthropic:
-    """Get Anthropic client."""
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    if not api_key:
-        raise ValueError("Missing ANTHROPIC_API_KEY environment variable")
-    return anthropic.Anthropic(api_key=api_key)
+    """Get or create the Anthropic client (shares the pooled HTTP client)."""
+    global _anthropic_client
+
+    if _anthropic_client is None:
+        api_key = os.getenv("ANTHROPIC_API_KEY")
+        if not api_key:
+            raise ValueError("Missing ANTHROPIC_API_KEY environment variable")
+        _anthropic_client = anthropic.Anthropic(
+            api_key=api_key, http_client=get_http_client(), timeout=LLM_TIMEOUT
+        )
+
+    return _anthropic_client
 
 
 SYSTEM_PROMPT = """You are an expert at summarizing video content. Generate summaries using this exact format:
@@ -63,63 +129,308 @@ GUIDELINES:
 5. Actionable Insights are practical - not restating points, but what someone should DO differently
 6. Do NOT include "Main Topics" or "Structure" sections - they are filler"""
 
+SUMMARY_REQUEST = "Please provide a comprehensive summary of the following video transcript."
 
-def generate_summary_openai(transcript: str, title: str = "") -> str:
-    """Generate summary using OpenAI."""
-    client = get_openai_client()
 
-    # Truncate transcript if too long
-    max_chars = 100000
-    if len(transcript) > max_chars:
-        transcript = transcript[:max_chars] + "\n\n[Transcript truncated due to length]"
+# =============================================================================
+# Streaming
+# =============================================================================
 
-    user_prompt = f"""Please provide a comprehensive summary of the following video transcript.
+class PartialSummary:
+    """
+    A summary being streamed, checkpointed to videos.summary_partial.
 
-{f'Video Title: {title}' if title else ''}
+    The first text is written as soon as it arrives, then at most every
+    CHECKPOINT_SECONDS. The partial goes to its own column, never to
+    videos.summary: that would fire the new-summary notification early.
+    """
 
-Transcript:
-{transcript}"""
+    def __init__(self, video_id: str, key: str, resume: str = "", echo: bool = False, verbose: bool = False):
+        """
+        Args:
+            video_id: Video UUID
+            key: partial_key() of the summary being generated
+            resume: Checkpointed text to continue from
+            echo: Print the text as it streams
+            verbose: Print a progress line at each checkpoint
+        """
+        self.video_id = video_id
+        self.key = key
+        self.text = resume
+        self.resumed = len(resume)
+        self.checkpoints = 0
+        self.echo = echo
+        self.verbose = verbose
+        self._written = len(resume)
+        self._written_at = 0.0
+
+    def add(self, delta: str) -> None:
+        """Append streamed text, checkpointing if the last checkpoint is old enough."""
+        self.text += delta
+        if self.echo:
+            print(delta, end="", flush=True)
+        if time.monotonic() - self._written_at >= CHECKPOINT_SECONDS:
+            self.checkpoint()
+
+    def checkpoint(self) -> None:
+        """Write the text so far (a failed write is skipped; the next one catches up)."""
+        if len(self.text) == self._written:
+            return
+        try:
+            get_client().table("videos").update({
+                "summary_partial": self.text,
+                "summary_partial_key": self.key,
+                "summary_partial_updated_at": "now()",
+            }).eq("id", self.video_id).execute()
+        except Exception as e:
+            if self.verbose:
+                print(f"    ! Checkpoint failed: {e}")
+            return
+        self._written = len(self.text)
+        self._written_at = time.monotonic()
+        self.checkpoints += 1
+        if self.verbose:
+            print(f"    … {len(self.text):,} chars")
+
+
+def partial_key(provenance: dict[str, str], by_chapter: bool) -> str:
+    """Identifies what a partial summary was generated with; a resume must match it."""
+    parts = [
+        provenance["summary_prompt_version"],
+        provenance["summary_model"],
+        provenance["summary_transcript_sha256"],
+        "chapters" if by_chapter else "single",
+    ]
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def _stream(
+    provider: Provider, system: str, user_prompt: str, stage: str, max_tokens: int, partial: PartialSummary
+) -> str:
+    """Streamed version of _complete(); continues partial.text when resuming (Anthropic only)."""
+    if provider == "anthropic":
+        client = get_anthropic_client()
+        messages = [{"role": "user", "content": user_prompt}]
+        # The API rejects a prefill ending in whitespace
+        partial.text = partial.text.rstrip()
+        if partial.text:
+            # Prefill: the model continues its own checkpointed text
+            messages.append({"role": "assistant", "content": partial.text})
+            max_tokens = max(max_tokens // 4, max_tokens - len(partial.text) // 4)
+        prefix = partial.text
+        text = call_llm_stream(
+            stage,
+            "anthropic",
+            ANTHROPIC_MODEL,
+            lambda: client.messages.with_raw_response.create(
+                model=ANTHROPIC_MODEL,
+                max_tokens=max_tokens,
+                messages=messages,
+                system=system,
+                stream=True,
+            ),
+            partial.add,
+        )
+        partial.checkpoint()
+        return prefix + text
 
-    response = client.chat.completions.create(
-        model="gpt-4o-mini",
-        max_tokens=2000,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt},
-        ],
+    client = get_openai_client()
+    text = call_llm_stream(
+        stage,
+        "openai",
+        OPENAI_MODEL,
+        lambda: client.chat.completions.with_raw_response.create(
+            model=OPENAI_MODEL,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user_prompt},
+            ],
+            stream=True,
+            stream_options={"include_usage": True},
+        ),
+        partial.add,
     )
+    partial.checkpoint()
+    return text
 
-    return response.choices[0].message.content or ""
 
+def _complete(
+    provider: Provider,
+    system: str,
+    user_prompt: str,
+    stage: str = "summary",
+    max_tokens: int = 2000,
+    partial: PartialSummary | None = None,
+) -> str:
+    """One instrumented completion with the provider's summary model (streamed into partial, if given)."""
+    if partial is not None:
+        return _stream(provider, system, user_prompt, stage, max_tokens, partial)
+
+    if provider == "anthropic":
+        client = get_anthropic_client()
+        message = call_llm(
+            stage,
+            "anthropic",
+            ANTHROPIC_MODEL,
+            lambda: client.messages.with_raw_response.create(
+                model=ANTHROPIC_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": user_prompt}],
+                system=system,
+            ),
+        )
+        return message.content[0].text
+
+    client = get_openai_client()
+    response = call_llm(
+        stage,
+        "openai",
+        OPENAI_MODEL,
+        lambda: client.chat.completions.with_raw_response.create(
+            model=OPENAI_MODEL,
+            max_tokens=max_tokens,
+            messages=[
+                {"role": "system", "content": system},
+                {"role": "user", "content": user_prompt},
+            ],
+        ),
+    )
+    return response.choices[0].message.content or ""
 
-def generate_summary_anthropic(transcript: str, title: str = "") -> str:
-    """Generate summary using Anthropic Claude."""
-    client = get_anthropic_client()
 
+def _summary_prompt(transcript: str, title: str) -> str:
     # Truncate transcript if too long
-    max_chars = 100000
-    if len(transcript) > max_chars:
-        transcript = transcript[:max_chars] + "\n\n[Transcript truncated due to length]"
+    if len(transcript) > MAX_TRANSCRIPT_CHARS:
+        transcript = transcript[:MAX_TRANSCRIPT_CHARS] + "\n\n[Transcript truncated due to length]"
 
-    user_prompt = f"""Please provide a comprehensive summary of the following video transcript.
+    return f"""{SUMMARY_REQUEST}
 
 {f'Video Title: {title}' if title else ''}
 
 Transcript:
 {transcript}"""
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=2000,
-        messages=[{"role": "user", "content": user_prompt}],
-        system=SYSTEM_PROMPT,
+
+def generate_summary_openai(transcript: str, title: str = "", partial: PartialSummary | None = None) -> str:
+    """Generate summary using OpenAI (streamed into partial, if given)."""
+    return _complete("openai", SYSTEM_PROMPT, _summary_prompt(transcript, title), partial=partial)
+
+
+def generate_summary_anthropic(transcript: str, title: str = "", partial: PartialSummary | None = None) -> str:
+    """Generate summary using Anthropic Claude (streamed into partial, if given)."""
+    return _complete("anthropic", SYSTEM_PROMPT, _summary_prompt(transcript, title), partial=partial)
+
+
+# =============================================================================
+# Chapter by chapter
+# =============================================================================
+
+CHAPTER_PROMPT = """You are taking notes on one chapter of a longer video. A summary of the whole video will be written later from the notes of all chapters.
+
+Write concise bullet points covering:
+- the main claims and arguments of this chapter, with the reasoning behind them
+- concrete facts, numbers and examples
+- 1-2 memorable verbatim quotes, with the speaker's name if it is clear
+
+No preamble and no summary of the video as a whole - only this chapter."""
+
+CHAPTER_SUMMARY_REQUEST = (
+    "Please provide a comprehensive summary of the following video, based on notes taken chapter by chapter."
+)
+
+
+def _timestamp(seconds: int | None) -> str:
+    if seconds is None:
+        return "?"
+    hours, rest = divmod(int(seconds), 3600)
+    return f"{hours}:{rest // 60:02d}:{rest % 60:02d}" if hours else f"{rest // 60}:{rest % 60:02d}"
+
+
+def _chapter_notes(
+    chunk: dict[str, Any], title: str, provider: Provider, check_budget: Callable[[], None] | None = None
+) -> str:
+    if check_budget:
+        check_budget()
+    user_prompt = f"""{f'Video Title: {title}' if title else ''}
+Chapter: {chunk['title']} ({_timestamp(chunk['start_seconds'])} - {_timestamp(chunk['end_seconds'])})
+
+Transcript of this chapter:
+{chunk['text']}"""
+    return _complete(provider, CHAPTER_PROMPT, user_prompt, stage="summary_chapter", max_tokens=CHAPTER_MAX_TOKENS)
+
+
+def generate_summary_by_chapter(
+    chunks: list[dict[str, Any]],
+    title: str = "",
+    provider: Provider = "openai",
+    partial: PartialSummary | None = None,
+    check_budget: Callable[[], None] | None = None,
+) -> str:
+    """
+    Summarize a video from its chapter chunks.
+
+    Notes for up to CHAPTER_WORKERS chapters are generated at once; the
+    summary (same format as generate_summary) is then written from the notes.
+
+    Args:
+        chunks: Transcript chunks from chapters.chunk_transcript()
+        title: Optional video title for context
+        provider: AI provider to use ("openai" or "anthropic")
+        partial: Stream the final summary into this
+        check_budget: Called before each chapter and before the final
+                      summary; raises (BudgetExceededError) to stop
+
+    Returns:
+        The generated summary
+    """
+    with ThreadPoolExecutor(max_workers=CHAPTER_WORKERS) as pool:
+        notes = list(pool.map(lambda chunk: _chapter_notes(chunk, title, provider, check_budget), chunks))
+
+    sections = "\n\n".join(
+        f"## {chunk['title']} ({_timestamp(chunk['start_seconds'])} - {_timestamp(chunk['end_seconds'])})\n{text}"
+        for chunk, text in zip(chunks, notes)
     )
+    user_prompt = f"""{CHAPTER_SUMMARY_REQUEST}
+
+{f'Video Title: {title}' if title else ''}
+
+Chapter notes:
+{sections}"""
+
+    if check_budget:
+        check_budget()
+    return _complete(provider, SYSTEM_PROMPT, user_prompt, partial=partial)
+
+
+def plan_chunks(
+    transcript: str,
+    chapters: list[dict[str, Any]] | None = None,
+    duration: float | None = None,
+    by_chapter: bool = False,
+) -> list[dict[str, Any]] | None:
+    """
+    Chapter chunks to summarize a transcript from, or None for a single call.
 
-    return message.content[0].text
+    Transcripts over MAX_TRANSCRIPT_CHARS are always chunked (along chapters
+    if the video has them, else in even parts), rather than truncated.
+    With by_chapter, videos with at least two chapters are chunked too.
+    """
+    if len(transcript) > MAX_TRANSCRIPT_CHARS or (by_chapter and chapters and len(chapters) >= 2):
+        chunks = chunk_transcript(transcript, chapters, duration)
+        if len(chunks) > 1:
+            return chunks
+    return None
 
 
 def generate_summary(
-    transcript: str, title: str = "", provider: Provider = "openai"
+    transcript: str,
+    title: str = "",
+    provider: Provider = "openai",
+    chapters: list[dict[str, Any]] | None = None,
+    duration: float | None = None,
+    by_chapter: bool = False,
+    partial: PartialSummary | None = None,
 ) -> str:
     """
     Generate a comprehensive summary of a video transcript.
@@ -128,42 +439,155 @@ def generate_summary(
         transcript: The full transcript text
         title: Optional video title for context
         provider: AI provider to use ("openai" or "anthropic")
+        chapters: The video's video_chapters rows, if any
+        duration: Video duration in seconds (places chapters in the transcript)
+        by_chapter: Summarize chapter by chapter whenever the video has
+                    chapters, not only when the transcript is too long
+        partial: Stream the summary into this (see PartialSummary)
 
     Returns:
         The generated summary
     """
+    chunks = plan_chunks(transcript, chapters, duration, by_chapter)
+    if chunks:
+        return generate_summary_by_chapter(chunks, title, provider, partial)
     if provider == "anthropic":
-        return generate_summary_anthropic(transcript, title)
-    return generate_summary_openai(transcript, title)
+        return generate_summary_anthropic(transcript, title, partial)
+    return generate_summary_openai(transcript, title, partial)
+
+
+# =============================================================================
+# Provenance
+# =============================================================================
+
+def prompt_version() -> str:
+    """
+    Version of the summary prompts: a short hash of all of them.
+
+    Any edit to SYSTEM_PROMPT, CHAPTER_PROMPT or the request lines changes
+    it, which marks every summary written with the old prompts as stale.
+    """
+    prompts = "\0".join([SYSTEM_PROMPT, SUMMARY_REQUEST, CHAPTER_PROMPT, CHAPTER_SUMMARY_REQUEST])
+    return hashlib.sha256(prompts.encode("utf-8")).hexdigest()[:16]
+
+
+def summary_model(provider: Provider) -> str:
+    """Model that writes summaries for a provider."""
+    return ANTHROPIC_MODEL if provider == "anthropic" else OPENAI_MODEL
+
+
+def summary_provenance(transcript: str, provider: Provider) -> dict[str, str]:
+    """videos provenance columns for a summary generated now from this transcript."""
+    return {
+        "summary_prompt_version": prompt_version(),
+        "summary_model": summary_model(provider),
+        "summary_transcript_sha256": transcript_hash(transcript),
+    }
 
 
 def get_videos_without_summary(limit: int = 10) -> list[dict[str, Any]]:
-    """Get videos that have transcripts but no summary."""
+    """Get videos that have transcripts but no summary (with their transcripts and chapters)."""
     client = get_client()
 
     result = (
         client.table("videos")
-        .select("id, external_id, title, transcript")
-        .not_.is_("transcript", "null")
+        .select("id, external_id, title, duration_seconds, transcript_sha256, summary_partial, summary_partial_key")
+        .eq("has_transcript", True)
         .is_("summary", "null")
         .limit(limit)
         .execute()
     )
 
-    return result.data
+    ids = [v["id"] for v in result.data]
+    transcripts = get_video_transcripts(ids)
+    chapters = get_video_chapters(ids)
+    return [
+        {**v, "transcript": transcripts.get(v["id"]), "chapters": chapters.get(v["id"], [])}
+        for v in result.data
+    ]
+
 
+def update_video_summary(video_id: str, summary: str, provenance: dict[str, Any] | None = None) -> None:
+    """
+    Update a video's summary in the database (and clear its partial summary).
 
-def update_video_summary(video_id: str, summary: str) -> None:
-    """Update a video's summary in the database."""
+    Args:
+        video_id: Video UUID
+        summary: The summary text
+        provenance: Extra videos columns to write with it (see
+                    summary_provenance); without it the old provenance is
+                    cleared, as it no longer describes the summary
+    """
     client = get_client()
 
-    client.table("videos").update(
-        {"summary": summary, "summary_generated_at": "now()"}
-    ).eq("id", video_id).execute()
+    row = {
+        "summary": summary,
+        "summary_generated_at": "now()",
+        "summary_partial": None,
+        "summary_partial_key": None,
+        "summary_partial_updated_at": None,
+    }
+    row.update(provenance or {"summary_prompt_version": None, "summary_model": None, "summary_transcript_sha256": None})
+    client.table("videos").update(row).eq("id", video_id).execute()
+
+
+def _summarize_video(
+    video: dict[str, Any],
+    provider: Provider,
+    by_chapter: bool,
+    stream: bool = False,
+    echo: bool = False,
+    verbose: bool = False,
+    check_budget: Callable[[], None] | None = None,
+) -> tuple[str, int]:
+    """
+    Generate and store the summary of a video from get_videos_without_summary()
+    or plan_stale_summaries() (with transcript and chapters attached).
+
+    With stream, the summary is checkpointed while it is generated (echo
+    prints it as it streams, verbose prints checkpoints). A matching
+    checkpoint of an Anthropic single-call summary is resumed. check_budget
+    is passed to generate_summary_by_chapter().
+
+    Returns:
+        Tuple of (summary, number of chapter chunks or 0)
+    """
+    transcript = video["transcript"]
+    provenance = summary_provenance(transcript, provider)
+    chunks = plan_chunks(transcript, video["chapters"], video.get("duration_seconds"), by_chapter)
+
+    partial = None
+    if stream:
+        key = partial_key(provenance, bool(chunks))
+        resume = ""
+        if provider == "anthropic" and not chunks and video.get("summary_partial_key") == key:
+            # No trailing whitespace in a prefill
+            resume = (video.get("summary_partial") or "").rstrip()
+        partial = PartialSummary(video["id"], key, resume, echo=echo, verbose=verbose)
+        if resume and verbose:
+            print(f"    ↻ Resuming from {len(resume):,} checkpointed chars")
+        if resume and echo:
+            print(resume, end="", flush=True)
+
+    if chunks:
+        summary = generate_summary_by_chapter(chunks, video.get("title", ""), provider, partial, check_budget)
+    else:
+        summary = generate_summary(transcript, video.get("title", ""), provider, partial=partial)
+
+    if not video.get("transcript_sha256"):
+        # Transcript stored before hashes were kept: hash it now, so later
+        # transcript changes are detected
+        provenance.update(transcript_sha256=provenance["summary_transcript_sha256"], transcript_length=len(transcript))
+    update_video_summary(video["id"], summary, provenance)
+    return summary, len(chunks or [])
 
 
 def summarize_videos(
-    limit: int = 10, verbose: bool = True, provider: Provider = "openai"
+    limit: int = 10,
+    verbose: bool = True,
+    provider: Provider = "openai",
+    by_chapter: bool = False,
+    stream: bool = False,
 ) -> dict[str, Any]:
     """
     Generate summaries for videos that don't have them yet.
@@ -172,6 +596,8 @@ def summarize_videos(
         limit: Maximum number of videos to summarize
         verbose: Print progress messages
         provider: AI provider to use ("openai" or "anthropic")
+        by_chapter: Summarize every video with chapters chapter by chapter
+        stream: Stream summaries, checkpointing them to summary_partial
 
     Returns:
         Stats dict with counts
@@ -202,12 +628,12 @@ def summarize_videos(
             continue
 
         try:
-            summary = generate_summary(transcript, title, provider)
-            update_video_summary(video_id, summary)
+            summary, chunks = _summarize_video(video, provider, by_chapter, stream=stream, verbose=verbose)
             stats["summaries_generated"] += 1
 
             if verbose:
-                print(f"    ✓ Generated summary ({len(summary)} chars)")
+                by = f", from {chunks} chapters" if chunks else ""
+                print(f"    ✓ Generated summary ({len(summary)} chars{by})")
 
         except Exception as e:
             stats["errors"].append(f"Error for {video_id}: {e}")
@@ -220,6 +646,214 @@ def summarize_videos(
         print(f"{'='*60}")
         print(f"Videos found: {stats['videos_found']}")
         print(f"Summaries generated: {stats['summaries_generated']}")
+        if format_llm_usage():
+            print(format_llm_usage())
+        if format_http_stats():
+            print(format_http_stats())
+        if stats["errors"]:
+            print(f"Errors: {len(stats['errors'])}")
+            for err in stats["errors"][:5]:
+                print(f"  - {err}")
+
+    return stats
+
+
+# =============================================================================
+# Refreshing stale summaries
+# =============================================================================
+
+def _stale_reason(video: dict[str, Any], version: str) -> str:
+    if not video.get("summary_prompt_version"):
+        return "unversioned"
+    if video.get("summary_transcript_changed"):
+        return "transcript"
+    if video["summary_prompt_version"] != version:
+        return "prompt"
+    return "model"
+
+
+def plan_stale_summaries(
+    limit: int = 10, provider: Provider = "openai", refresh_model: bool = False
+) -> list[dict[str, Any]]:
+    """
+    Summaries that no longer match the current prompts or transcript, newest first.
+
+    A summary is stale when it was generated with another prompt version,
+    from a transcript that has changed since, or (refresh_model) by another
+    model than the provider's. Summaries from before provenance was recorded
+    count as stale; summaries saved by hand never do.
+
+    Args:
+        limit: Maximum number of videos to return
+        provider: Provider the summaries would be regenerated with
+        refresh_model: Also treat summaries by another model as stale
+
+    Returns:
+        Videos (id, external_id, title, duration_seconds, published_at,
+        provenance columns) with a stale_reason of "unversioned", "prompt",
+        "transcript" or "model"
+    """
+    client = get_client()
+    version = prompt_version()
+
+    stale = [
+        "summary_prompt_version.is.null",
+        f"summary_prompt_version.neq.{version}",
+        "summary_transcript_changed.is.true",
+    ]
+    if refresh_model:
+        stale.append(f"summary_model.neq.{summary_model(provider)}")
+
+    result = (
+        client.table("videos")
+        .select(
+            "id, external_id, title, duration_seconds, published_at, transcript_sha256, "
+            "summary_prompt_version, summary_model, summary_transcript_changed, summary_partial, summary_partial_key"
+        )
+        .not_.is_("summary", "null")
+        .eq("has_transcript", True)
+        .or_(f"summary_model.is.null,summary_model.neq.{MANUAL_MODEL}")
+        .or_(",".join(stale))
+        .order("published_at", desc=True, nullsfirst=False)
+        .limit(limit)
+        .execute()
+    )
+
+    return [{**v, "stale_reason": _stale_reason(v, version)} for v in result.data]
+
+
+def _summary_spend(since: int) -> float:
+    """USD spent on summary LLM calls recorded after the first `since` calls (unpriced calls count 0)."""
+    return sum(
+        call["cost"] or 0.0 for call in get_llm_calls()[since:] if call["stage"] in SUMMARY_STAGES
+    )
+
+
+def refresh_summaries(
+    limit: int = 10,
+    max_cost: float | None = None,
+    provider: Provider = "openai",
+    by_chapter: bool = False,
+    refresh_model: bool = False,
+    dry_run: bool = False,
+    verbose: bool = True,
+    stream: bool = False,
+) -> dict[str, Any]:
+    """
+    Regenerate stale summaries (see plan_stale_summaries), newest first.
+
+    The old summary stays in place until its replacement is written, so a
+    video never goes without one (and the new-summary notification doesn't
+    fire again).
+
+    Args:
+        limit: Maximum number of videos to refresh
+        max_cost: Stop once this many USD have been spent on summary calls,
+                  checked before each video and each chapter call (None: no
+                  budget, only the limit)
+        provider: AI provider to use ("openai" or "anthropic")
+        by_chapter: Summarize every video with chapters chapter by chapter
+        refresh_model: Also refresh summaries written by another model
+        dry_run: Only print the plan
+        verbose: Print progress messages
+        stream: Stream summaries, checkpointing them to summary_partial
+
+    Returns:
+        Stats dict with counts, spend and stale reasons
+    """
+    stats: dict[str, Any] = {
+        "videos_found": 0,
+        "summaries_refreshed": 0,
+        "skipped_budget": 0,
+        "cost": 0.0,
+        "reasons": {},
+        "errors": [],
+    }
+
+    videos = plan_stale_summaries(limit, provider, refresh_model)
+    stats["videos_found"] = len(videos)
+    for video in videos:
+        stats["reasons"][video["stale_reason"]] = stats["reasons"].get(video["stale_reason"], 0) + 1
+
+    if not videos:
+        if verbose:
+            print(f"No stale summaries (prompt version {prompt_version()})")
+        return stats
+
+    if verbose:
+        budget = f", budget ${max_cost:.2f}" if max_cost is not None else ""
+        print(f"Found {len(videos)} stale summaries (prompt version {prompt_version()}, using {provider}{budget})\n")
+
+    if dry_run:
+        for video in videos:
+            print(f"  {(video.get('published_at') or '')[:10]:10}  {video['stale_reason']:11}  {(video.get('title') or '')[:60]}")
+        return stats
+
+    chapters = get_video_chapters([v["id"] for v in videos])
+    start = len(get_llm_calls())
+
+    def check_budget() -> None:
+        if max_cost is not None and _summary_spend(start) >= max_cost:
+            raise BudgetExceededError(f"Budget of ${max_cost:.2f} reached")
+
+    for i, video in enumerate(videos):
+        try:
+            check_budget()
+        except BudgetExceededError as e:
+            stats["skipped_budget"] = len(videos) - i
+            if verbose:
+                print(f"\n{e}, {stats['skipped_budget']} videos left for the next run")
+            break
+
+        video_id = video["id"]
+        if verbose:
+            print(f"[{i+1}/{len(videos)}] ({video['stale_reason']}) {(video.get('title') or 'Unknown')[:60]}...")
+
+        try:
+            transcript = get_video_transcript(video_id)
+            if not transcript:
+                stats["errors"].append(f"No transcript for {video_id}")
+                continue
+            summary, chunks = _summarize_video(
+                {**video, "transcript": transcript, "chapters": chapters.get(video_id, [])},
+                provider,
+                by_chapter,
+                stream=stream,
+                verbose=verbose,
+                check_budget=check_budget,
+            )
+            stats["summaries_refreshed"] += 1
+
+            if verbose:
+                by = f", from {chunks} chapters" if chunks else ""
+                print(f"    ✓ Refreshed summary ({len(summary)} chars{by})")
+
+        except BudgetExceededError as e:
+            # Between chapters: the old summary stays, the video is retried next run
+            stats["skipped_budget"] = len(videos) - i
+            if verbose:
+                print(f"    ✗ {e}, {stats['skipped_budget']} videos left for the next run")
+            break
+
+        except Exception as e:
+            stats["errors"].append(f"Error for {video_id}: {e}")
+            if verbose:
+                print(f"    ✗ Failed: {e}")
+
+    stats["cost"] = _summary_spend(start)
+
+    if verbose:
+        print(f"\n{'='*60}")
+        print("SUMMARY")
+        print(f"{'='*60}")
+        print(f"Stale summaries found: {stats['videos_found']}")
+        print("Reasons: " + ", ".join(f"{reason} {count}" for reason, count in sorted(stats["reasons"].items())))
+        print(f"Summaries refreshed: {stats['summaries_refreshed']}")
+        if stats["skipped_budget"]:
+            print(f"Left for the next run (budget): {stats['skipped_budget']}")
+        print(f"Spent: ${stats['cost']:.4f}")
+        if format_llm_usage():
+            print(format_llm_usage())
         if stats["errors"]:
             print(f"Errors: {len(stats['errors'])}")
             for err in stats["errors"][:5]:
@@ -251,6 +885,41 @@ def main():
         default="openai",
         help="AI provider to use (default: openai)",
     )
+    parser.add_argument(
+        "--by-chapter",
+        action="store_true",
+        help="Summarize videos with chapters chapter by chapter (long transcripts always are)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Stream summaries, checkpointing partial output to summary_partial",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Regenerate stale summaries (prompt or transcript changed since), newest first",
+    )
+    parser.add_argument(
+        "--max-cost",
+        type=float,
+        help="With --refresh: stop once this many USD have been spent",
+    )
+    parser.add_argument(
+        "--refresh-model",
+        action="store_true",
+        help="With --refresh: also regenerate summaries written by another model",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --refresh: only list the stale summaries",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        help="Write LLM token/cost/latency metrics here (.prom = Prometheus text, else JSON lines)",
+    )
 
     args = parser.parse_args()
 
@@ -259,7 +928,7 @@ def main():
         client = get_client()
         result = (
             client.table("videos")
-            .select("id, title, transcript")
+            .select("id, title, duration_seconds, transcript_sha256, summary_partial, summary_partial_key")
             .eq("id", args.video_id)
             .single()
             .execute()
@@ -270,18 +939,51 @@ def main():
             print(f"Video not found: {args.video_id}")
             return
 
-        if not video.get("transcript"):
+        transcript = get_video_transcript(args.video_id)
+        if not transcript:
             print("Video has no transcript")
             return
 
         print(f"Generating summary for: {video['title']} (using {args.provider})")
-        summary = generate_summary(video["transcript"], video["title"], args.provider)
-        update_video_summary(args.video_id, summary)
-        print(f"\nSummary ({len(summary)} chars):\n")
-        print(summary)
+        if args.stream:
+            print()
+        summary, _ = _summarize_video(
+            {**video, "transcript": transcript, "chapters": get_video_chapters([args.video_id]).get(args.video_id, [])},
+            args.provider,
+            args.by_chapter,
+            stream=args.stream,
+            echo=args.stream,
+        )
+        if args.stream:
+            # Already printed as it streamed
+            print(f"\n\nSummary saved ({len(summary)} chars)")
+        else:
+            print(f"\nSummary ({len(summary)} chars):\n")
+            print(summary)
+        if format_llm_usage():
+            print(f"\n{format_llm_usage()}")
+    elif args.refresh:
+        refresh_summaries(
+            limit=args.limit,
+            max_cost=args.max_cost,
+            provider=args.provider,
+            by_chapter=args.by_chapter,
+            refresh_model=args.refresh_model,
+            dry_run=args.dry_run,
+            verbose=not args.quiet,
+            stream=args.stream,
+        )
     else:
         # Batch mode
-        summarize_videos(limit=args.limit, verbose=not args.quiet, provider=args.provider)
+        summarize_videos(
+            limit=args.limit,
+            verbose=not args.quiet,
+            provider=args.provider,
+            by_chapter=args.by_chapter,
+            stream=args.stream,
+        )
+
+    write_llm_metrics(args.metrics_file)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,426 @@
+"""
+Per-channel title and description template learning.
+
+Most channels title their videos the same way every time:
+    Triggernometry: "Topic - Guest Name"
+    Lex Fridman:    "Guest Name: Topic | Lex Fridman Podcast #NNN"
+    JRE:            "Joe Rogan Experience #NNNN - Guest Name"
+
+Templates are learned from each channel's already-processed videos (titles
+plus the guests linked to them): where the guest's name sits in the title
+and which text anchors it. Each template's weight is its precision on that
+history, so a reliable channel template is enough on its own for the
+heuristic tier (extract_people --heuristics) to skip the LLM. Description
+rules (bio line, "joins us", ...) get per-channel weights the same way.
+
+Learned templates are cached per source_id in memory and in SQLite, so
+parsing a title is a lookup plus a few regex matches. Each channel also
+tracks how often its templates still match new titles, and flags a
+"template broke" signal when that rate collapses (e.g. the channel changed
+its title format).
+
+Usage:
+    # Learn and show templates for every channel
+    uv run python -m scraper.templates
+
+    # One channel, ignoring the cache
+    uv run python -m scraper.templates --source-id <uuid> --refresh
+
+    # Heuristic benchmark with templates learned leave-one-out per channel
+    uv run python -m scraper.templates --benchmark fixtures/guest_labels.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any
+
+from dotenv import load_dotenv
+
+from .db import get_client
+from .heuristics import DESCRIPTION_PATTERNS, TITLE_TEMPLATES, clean_name, names_match, run_benchmark
+
+load_dotenv()
+
+CACHE_DIR = Path(os.getenv("SCRAPER_CACHE_DIR", Path(__file__).parent.parent.parent / ".cache"))
+
+# Labelled videos used to learn a channel's templates
+HISTORY_LIMIT = 200
+
+# A template needs this many supporting videos to be used
+MIN_SUPPORT = 5
+
+# Learned weights are capped below 1 so description evidence still counts
+MAX_WEIGHT = 0.95
+
+# Re-learn templates after this long
+TEMPLATE_TTL_SECONDS = 7 * 24 * 60 * 60
+
+# "Template broke": over the last BROKEN_WINDOW titles, the match rate fell
+# below BROKEN_RATIO of the rate seen while learning
+BROKEN_WINDOW = 10
+BROKEN_RATIO = 0.5
+
+# Text immediately left / right of the guest name that can anchor a template
+_LEFT_ANCHOR = re.compile(
+    r"(?:#\d+\s*[-–—|:]\s*|\s[-–—|]\s+|:\s+|\b(?:with|With|WITH|ft\.|feat\.)\s+)$"
+)
+_RIGHT_ANCHOR = re.compile(r"^(?:\s*[:|]\s|\s[-–—]\s|\s+on\s)")
+
+_NAME_BODY = r"(?P<name>[^:|–—]+?)"
+
+_db: sqlite3.Connection | None = None
+_db_lock = threading.Lock()
+
+_templates: dict[str, "ChannelTemplates"] = {}
+
+
+class ChannelTemplates:
+    """A channel's learned title templates and description rule weights."""
+
+    def __init__(
+        self,
+        source_id: str,
+        title_specs: list[dict[str, Any]] | None = None,
+        description_weights: dict[str, float] | None = None,
+        match_rate: float = 0.0,
+        support: int = 0,
+        learned_at: float | None = None,
+    ):
+        self.source_id = source_id
+        self.title_specs = title_specs or []
+        self.description_weights = description_weights or {}
+        self.match_rate = match_rate
+        self.support = support
+        self.learned_at = learned_at or time.time()
+        self.title_templates = [
+            (f"learned:{spec['key']}", re.compile(spec["pattern"]), spec["weight"])
+            for spec in self.title_specs
+        ]
+        self._recent: deque[bool] = deque(maxlen=BROKEN_WINDOW)
+        self._lock = threading.Lock()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "title_specs": self.title_specs,
+            "description_weights": self.description_weights,
+            "match_rate": self.match_rate,
+            "support": self.support,
+        }
+
+    def heuristic_templates(self) -> list[tuple[str, re.Pattern, float]]:
+        """Title templates for extract_guests_heuristic: learned first, then generic."""
+        return self.title_templates + TITLE_TEMPLATES
+
+    def candidates(self, title: str) -> list[tuple[str, float]]:
+        """Guest-name candidates from the learned title templates, best first."""
+        found = []
+        for _, pattern, weight in self.title_templates:
+            match = pattern.search(title)
+            name = clean_name(match.group("name")) if match else None
+            if name:
+                found.append((name, weight))
+        return found
+
+    def observe(self, title: str) -> bool:
+        """Record whether a new title still fits the learned templates."""
+        matched = bool(self.candidates(title))
+        if self.title_templates:
+            with self._lock:
+                self._recent.append(matched)
+        return matched
+
+    @property
+    def recent_match_rate(self) -> float | None:
+        with self._lock:
+            if len(self._recent) < BROKEN_WINDOW:
+                return None
+            return sum(self._recent) / len(self._recent)
+
+    @property
+    def broken(self) -> bool:
+        """True if recent titles stopped matching the channel's templates."""
+        recent = self.recent_match_rate
+        return recent is not None and recent < self.match_rate * BROKEN_RATIO
+
+
+# =============================================================================
+# Learning
+# =============================================================================
+
+def _anchors(title: str, guest: str) -> tuple[str, str] | None:
+    """
+    Left/right anchor text around the guest's name in a title, if any.
+
+    Digits in anchors are replaced by {n} ("#475 - " -> "#{n} - ").
+    """
+    start = title.lower().find(guest.lower())
+    if start < 0:
+        return None
+    end = start + len(guest)
+
+    before, after = title[:start], title[end:]
+    if before:
+        match = _LEFT_ANCHOR.search(before)
+        if not match:
+            return None
+        left = re.sub(r"\d+", "{n}", match.group(0))
+    else:
+        left = "^"
+
+    if after:
+        match = _RIGHT_ANCHOR.match(after)
+        if not match:
+            return None
+        right = match.group(0)
+    else:
+        right = "$"
+
+    return left, right
+
+
+def _literal(text: str) -> str:
+    """Regex for anchor text: escaped, flexible whitespace, {n} as digits."""
+    return r"\d+".join(
+        re.sub(r"(?:\\ )+", r"\\s+", re.escape(part)) for part in text.split("{n}")
+    )
+
+
+def _anchor_pattern(left: str, right: str) -> str:
+    """Compile anchors back into a title regex with a name group."""
+    prefix = "^" if left == "^" else _literal(left)
+    suffix = r"\s*$" if right == "$" else _literal(right)
+    return prefix + _NAME_BODY + suffix
+
+
+def _precision(correct: int, matched: int) -> float:
+    """Pessimistically smoothed precision, so a template seen 5/5 times isn't treated as certain."""
+    return min((correct + 1) / (matched + 3), MAX_WEIGHT)
+
+
+def learn_channel_templates(
+    source_id: str,
+    videos: list[dict[str, Any]],
+    host_names: list[str] | None = None,
+) -> ChannelTemplates:
+    """
+    Learn templates from a channel's labelled videos.
+
+    Args:
+        source_id: Channel (source) ID
+        videos: Dicts with title, description and guests (list of names;
+                empty for videos known to have no guest)
+        host_names: Channel hosts; template matches on a host's name (solo
+                    episodes) don't count against a template's precision
+
+    Returns:
+        ChannelTemplates (with no title templates if nothing was regular enough)
+    """
+    host_names = host_names or []
+
+    def score(name: str | None, guests: list[str]) -> tuple[int, int]:
+        """(matched, correct) for one candidate name."""
+        if not name or names_match(name, host_names):
+            return 0, 0
+        return 1, int(names_match(name, guests))
+
+    anchors: Counter[tuple[str, str]] = Counter()
+    for video in videos:
+        for guest in video["guests"]:
+            found = _anchors(video["title"], guest)
+            if found:
+                anchors[found] += 1
+
+    title_specs = []
+    for (left, right), support in anchors.most_common():
+        if support < MIN_SUPPORT:
+            break
+        pattern = re.compile(_anchor_pattern(left, right))
+
+        matched = correct = 0
+        for video in videos:
+            match = pattern.search(video["title"])
+            hit, ok = score(clean_name(match.group("name")) if match else None, video["guests"])
+            matched += hit
+            correct += ok
+
+        title_specs.append({
+            "key": f"{left.strip() or 'start'}…{right.strip() or 'end'}",
+            "pattern": pattern.pattern,
+            "weight": _precision(correct, matched),
+            "support": support,
+        })
+
+    title_specs.sort(key=lambda spec: spec["weight"], reverse=True)
+
+    description_weights = {}
+    for rule, pattern, _ in DESCRIPTION_PATTERNS:
+        matched = correct = 0
+        for video in videos:
+            for match in pattern.finditer((video.get("description") or "")[:2000]):
+                hit, ok = score(clean_name(match.group("name")), video["guests"])
+                matched += hit
+                correct += ok
+        if matched >= MIN_SUPPORT:
+            description_weights[rule] = _precision(correct, matched)
+
+    templates = ChannelTemplates(source_id, title_specs, description_weights, support=len(videos))
+    if videos and templates.title_templates:
+        templates.match_rate = sum(1 for v in videos if templates.candidates(v["title"])) / len(videos)
+
+    return templates
+
+
+def load_host_names(source_id: str) -> list[str]:
+    """Names of a channel's hosts (verified or not)."""
+    client = get_client()
+    result = (
+        client.table("source_people")
+        .select("person:people(name)")
+        .eq("source_id", source_id)
+        .eq("role", "host")
+        .execute()
+    )
+    return [row["person"]["name"] for row in result.data or [] if row.get("person")]
+
+
+def load_labelled_videos(source_id: str, limit: int = HISTORY_LIMIT) -> list[dict[str, Any]]:
+    """Recent processed videos for a channel with their linked guests."""
+    client = get_client()
+    result = (
+        client.table("videos")
+        .select("title, description, video_people(role, person:people(name))")
+        .eq("source_id", source_id)
+        .not_.is_("people_extracted_at", "null")
+        .order("published_at", desc=True)
+        .limit(limit)
+        .execute()
+    )
+
+    videos = []
+    for row in result.data or []:
+        guests = [
+            link["person"]["name"]
+            for link in row.get("video_people") or []
+            if link.get("role") == "guest" and link.get("person")
+        ]
+        videos.append({"title": row["title"] or "", "description": row.get("description") or "", "guests": guests})
+    return videos
+
+
+# =============================================================================
+# Cache
+# =============================================================================
+
+def _get_db() -> sqlite3.Connection:
+    """Get or create the SQLite template cache."""
+    global _db
+
+    if _db is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _db = sqlite3.connect(CACHE_DIR / "templates.sqlite", check_same_thread=False)
+        _db.execute(
+            """CREATE TABLE IF NOT EXISTS channel_templates (
+                source_id TEXT PRIMARY KEY,
+                spec TEXT NOT NULL,
+                learned_at REAL NOT NULL
+            )"""
+        )
+        _db.commit()
+
+    return _db
+
+
+def get_channel_templates(source_id: str, refresh: bool = False) -> ChannelTemplates:
+    """
+    Get a channel's templates: memory, then SQLite cache, then learn from the DB.
+
+    Args:
+        source_id: Channel (source) ID
+        refresh: Re-learn even if cached templates are still fresh
+    """
+    now = time.time()
+    cached = _templates.get(source_id)
+    if cached and not refresh and now - cached.learned_at < TEMPLATE_TTL_SECONDS:
+        return cached
+
+    if not refresh:
+        with _db_lock:
+            row = _get_db().execute(
+                "SELECT spec, learned_at FROM channel_templates WHERE source_id = ?", (source_id,)
+            ).fetchone()
+        if row and now - row[1] < TEMPLATE_TTL_SECONDS:
+            templates = ChannelTemplates(source_id, learned_at=row[1], **json.loads(row[0]))
+            _templates[source_id] = templates
+            return templates
+
+    templates = learn_channel_templates(
+        source_id, load_labelled_videos(source_id), load_host_names(source_id)
+    )
+    with _db_lock:
+        db = _get_db()
+        db.execute(
+            "INSERT OR REPLACE INTO channel_templates VALUES (?, ?, ?)",
+            (source_id, json.dumps(templates.to_dict()), templates.learned_at),
+        )
+        db.commit()
+    _templates[source_id] = templates
+    return templates
+
+
+def broken_templates() -> list[ChannelTemplates]:
+    """Channels (seen this run) whose recent titles stopped matching their templates."""
+    return [t for t in _templates.values() if t.broken]
+
+
+def leave_one_out(videos: list[dict[str, Any]], index: int) -> ChannelTemplates:
+    """Templates learned from every other labelled video of the same channel."""
+    video = videos[index]
+    history = [
+        v for i, v in enumerate(videos)
+        if i != index and v.get("channel") == video.get("channel")
+    ]
+    return learn_channel_templates(video.get("channel") or "", history, video.get("hosts"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Learn per-channel title templates")
+    parser.add_argument("--source-id", help="Only this channel (source UUID)")
+    parser.add_argument("--refresh", action="store_true", help="Re-learn even if cached")
+    parser.add_argument(
+        "--benchmark",
+        type=Path,
+        metavar="FIXTURE",
+        help="Score heuristics with leave-one-out learned templates on a labelled fixture (no database)",
+    )
+    args = parser.parse_args()
+
+    if args.benchmark:
+        run_benchmark(args.benchmark, templates_for=leave_one_out)
+        return
+
+    client = get_client()
+    query = client.table("sources").select("id, name").eq("type", "youtube_channel")
+    if args.source_id:
+        query = query.eq("id", args.source_id)
+    sources = query.execute().data or []
+
+    for source in sources:
+        templates = get_channel_templates(source["id"], refresh=args.refresh)
+        print(f"\n{source['name']} ({templates.support} labelled videos)")
+        if not templates.title_specs:
+            print("  No regular title format")
+        for spec in templates.title_specs:
+            print(f"  {spec['key']:<24} weight {spec['weight']:.2f}  support {spec['support']}")
+        for rule, weight in templates.description_weights.items():
+            print(f"  description/{rule:<13} weight {weight:.2f}")
+
+
+if __name__ == "__main__":
+    main()
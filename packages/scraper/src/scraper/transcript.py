@@ -5,20 +5,54 @@ This module provides a unified interface for fetching video transcripts
 from various providers. Currently supports:
 - Supadata API (primary)
 - YouTube Transcript API (fallback, if enabled)
+
+Providers are tried with one of three strategies (set_transcript_strategy):
+- sequential: strictly in order, each after the previous one failed (default)
+- hedged: start the next provider if the current one hasn't answered within
+  the hedge delay (or as soon as it fails); the first valid transcript wins
+- race: start all providers at once; the first valid transcript wins
+
+Each provider has a circuit breaker (circuit.py): while a provider is down or
+throttling, it is skipped straight to the next one instead of waiting out its
+timeout for every video. Supadata timeouts, 429s and 5xx are retried once
+with backoff (retry.py) before counting as a failure.
+
+In hedged and race mode providers are reordered by their observed latency and
+success rate in this run (see ProviderTracker), so a slow or failing provider
+stops being the one everybody waits on.
 """
 
 import logging
 import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any
 
 import httpx
 from dotenv import load_dotenv
 
+from .circuit import get_breaker
+from .http_client import get_http_client
+from .metrics import count, timer
+from .retry import call_with_retry, raise_for_retryable
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
 load_dotenv()
 
+# Overridable so benchmarks can point transcripts at a local stand-in
+SUPADATA_API_URL = os.getenv("SUPADATA_API_URL", "https://api.supadata.ai/v1")
+
+STRATEGIES = ["sequential", "hedged", "race"]
+
+# How long hedged mode waits on a provider before starting the next one
+DEFAULT_HEDGE_DELAY = 5.0
+
+_strategy = os.getenv("SCRAPER_TRANSCRIPT_STRATEGY", "sequential")
+_hedge_delay = float(os.getenv("SCRAPER_TRANSCRIPT_HEDGE_DELAY", str(DEFAULT_HEDGE_DELAY)))
+
 
 class TranscriptResult:
     """Result of a transcript fetch operation."""
@@ -29,11 +63,14 @@ class TranscriptResult:
         language: str | None = None,
         provider: str | None = None,
         error: str | None = None,
+        provider_error: bool = False,
     ):
         self.content = content
         self.language = language
         self.provider = provider
         self.error = error
+        # The provider itself failed (timeout, 429, 5xx), as opposed to having no transcript
+        self.provider_error = provider_error
 
     @property
     def success(self) -> bool:
@@ -63,13 +100,12 @@ def fetch_transcript_supadata(
         )
 
     video_url = f"https://youtu.be/{video_id}"
-    api_url = f"https://api.supadata.ai/v1/transcript?url={video_url}&lang={lang}"
+    api_url = f"{SUPADATA_API_URL}/transcript?url={video_url}&lang={lang}"
 
     try:
-        response = httpx.get(
-            api_url,
-            headers={"x-api-key": api_key},
-            timeout=30.0,
+        response = call_with_retry(
+            lambda: raise_for_retryable(get_http_client().get(api_url, headers={"x-api-key": api_key})),
+            "supadata",
         )
 
         if response.status_code == 200:
@@ -122,20 +158,43 @@ def fetch_transcript_supadata(
             return TranscriptResult(
                 content=None,
                 error=f"Supadata API error: {response.status_code} - {response.text}",
+                provider_error=response.status_code == 429 or response.status_code >= 500,
             )
 
     except httpx.TimeoutException:
         return TranscriptResult(
             content=None,
             error="Supadata API timeout",
+            provider_error=True,
+        )
+    except httpx.HTTPStatusError as e:
+        # 429 / 5xx that outlasted the retries
+        return TranscriptResult(
+            content=None,
+            error=f"Supadata API error: {e.response.status_code} - {e.response.text}",
+            provider_error=True,
         )
     except Exception as e:
         return TranscriptResult(
             content=None,
             error=f"Supadata API error: {str(e)}",
+            provider_error=isinstance(e, httpx.TransportError),
         )
 
 
+# youtube-transcript-api / requests exceptions that mean YouTube is blocking or unreachable
+YOUTUBE_API_PROVIDER_ERRORS = {
+    "RequestBlocked",
+    "IpBlocked",
+    "TooManyRequests",
+    "YouTubeRequestFailed",
+    "ConnectionError",
+    "Timeout",
+    "ReadTimeout",
+    "ConnectTimeout",
+}
+
+
 def fetch_transcript_youtube_api(
     video_id: str, lang: str = "en", require_english: bool = True
 ) -> TranscriptResult:
@@ -191,7 +250,80 @@ def fetch_transcript_youtube_api(
         return TranscriptResult(
             content=None,
             error=f"YouTube Transcript API error: {error_msg}",
+            provider_error=type(e).__name__ in YOUTUBE_API_PROVIDER_ERRORS or "429" in error_msg,
+        )
+
+
+# =============================================================================
+# Provider tracking
+# =============================================================================
+
+class ProviderTracker:
+    """
+    Per-provider latency and success rate for this run.
+
+    Latency is an exponentially weighted average over all attempts; the
+    success rate starts from a weak prior so one early failure doesn't bury
+    a provider.
+    """
+
+    # Weight of the newest observation in the latency average
+    ALPHA = 0.2
+
+    # Attempts per provider before its observed numbers override the configured order
+    MIN_ATTEMPTS = 5
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: dict[str, dict[str, float]] = {}
+
+    def record(self, provider: str, latency: float, success: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(provider, {"attempts": 0, "successes": 0, "latency": latency})
+            stats["attempts"] += 1
+            stats["successes"] += 1 if success else 0
+            stats["latency"] += self.ALPHA * (latency - stats["latency"])
+
+    def expected_cost(self, provider: str) -> float | None:
+        """Expected seconds per transcript (latency / success rate), or None if too few attempts."""
+        with self._lock:
+            stats = self._stats.get(provider)
+            if stats is None or stats["attempts"] < self.MIN_ATTEMPTS:
+                return None
+            rate = (stats["successes"] + 1) / (stats["attempts"] + 1)
+            return stats["latency"] / rate
+
+    def order(self, providers: list[str]) -> list[str]:
+        """Providers cheapest first, or the configured order until each has enough attempts."""
+        costs = {p: self.expected_cost(p) for p in providers}
+        if any(cost is None for cost in costs.values()):
+            return list(providers)
+        return sorted(providers, key=lambda p: costs[p])
+
+    def snapshot(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            return {p: dict(s) for p, s in self._stats.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+
+provider_tracker = ProviderTracker()
+
+
+def format_provider_stats() -> str | None:
+    """Per-provider success rate and latency for SUMMARY blocks, or None if no attempts."""
+    stats = provider_tracker.snapshot()
+    if not stats:
+        return None
+    lines = ["Transcript providers:"]
+    for provider, s in sorted(stats.items()):
+        lines.append(
+            f"  {provider}: {s['successes']:.0f}/{s['attempts']:.0f} ok, "
+            f"{s['latency']:.1f}s avg latency"
         )
+    return "\n".join(lines)
 
 
 # Available transcript providers
@@ -204,18 +336,135 @@ PROVIDERS = {
 DEFAULT_PROVIDERS = ["supadata", "youtube_api"]
 
 
+def set_transcript_strategy(strategy: str, hedge_delay: float | None = None) -> None:
+    """
+    Choose how fetch_transcript combines providers.
+
+    Args:
+        strategy: "sequential", "hedged" or "race" (see module docstring)
+        hedge_delay: Hedged mode: seconds to wait before starting the next provider
+    """
+    global _strategy, _hedge_delay
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown transcript strategy: {strategy} (choose from {', '.join(STRATEGIES)})")
+    _strategy = strategy
+    if hedge_delay is not None:
+        _hedge_delay = hedge_delay
+
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="transcript")
+    return _executor
+
+
+def _try_provider(video_id: str, provider: str) -> TranscriptResult:
+    """One timed and tracked provider attempt (skipped while its circuit is open)."""
+    breaker = get_breaker(provider)
+    if not breaker.allow():
+        return TranscriptResult(
+            content=None,
+            error=f"{provider} circuit open (retry in {breaker.retry_in():.0f}s)",
+            provider_error=True,
+        )
+
+    logger.debug(f"[{video_id}] Trying provider: {provider}")
+    start = time.perf_counter()
+    with timer("transcript", provider=provider) as timing:
+        try:
+            result = PROVIDERS[provider](video_id)
+        except Exception as e:
+            result = TranscriptResult(content=None, error=f"{type(e).__name__}: {e}", provider_error=True)
+        timing.labels["outcome"] = "ok" if result.success else "miss"
+    breaker.record(success=not result.provider_error)
+    provider_tracker.record(provider, time.perf_counter() - start, result.success)
+    return result
+
+
+def _fetch_sequential(video_id: str, providers: list[str], errors: list[str]) -> TranscriptResult | None:
+    for provider in providers:
+        if errors:
+            # Falling back to the next provider is a retry of the transcript stage
+            count("retries", stage="transcript")
+
+        result = _try_provider(video_id, provider)
+        if result.success:
+            return result
+        if result.error:
+            logger.debug(f"[{video_id}] {provider} failed: {result.error}")
+            errors.append(f"{provider}: {result.error}")
+    return None
+
+
+def _fetch_hedged(
+    video_id: str, providers: list[str], hedge_delay: float, errors: list[str]
+) -> TranscriptResult | None:
+    """
+    Start providers one by one, each after the hedge delay or the previous failure.
+
+    Providers that haven't started when a transcript arrives are never
+    started. Ones already in flight can't be interrupted mid-request; they
+    finish in the background (still feeding the tracker) and their result is
+    discarded.
+    """
+    waiting = list(providers)
+    running: dict[Future, str] = {}
+
+    def launch() -> None:
+        provider = waiting.pop(0)
+        running[_get_executor().submit(_try_provider, video_id, provider)] = provider
+
+    launch()
+    while running:
+        done, _ = wait(running, timeout=hedge_delay if waiting else None, return_when=FIRST_COMPLETED)
+
+        if not done:
+            # Slow answer: hedge with the next provider
+            count("hedges", stage="transcript")
+            launch()
+            continue
+
+        for future in done:
+            provider = running.pop(future)
+            result = future.result()
+            if result.success:
+                for other in running:
+                    other.cancel()
+                return result
+            if result.error:
+                logger.debug(f"[{video_id}] {provider} failed: {result.error}")
+                errors.append(f"{provider}: {result.error}")
+            if waiting:
+                count("retries", stage="transcript")
+                launch()
+
+    return None
+
+
 def fetch_transcript(
     video_id: str,
     providers: list[str] | None = None,
+    strategy: str | None = None,
+    hedge_delay: float | None = None,
 ) -> TranscriptResult:
     """
-    Fetch transcript using configured providers in order.
+    Fetch transcript using configured providers.
 
     Args:
         video_id: YouTube video ID
-        providers: List of provider names to try in order.
+        providers: List of provider names, in preference order.
                    Available: "supadata", "youtube_api"
                    Default: ["supadata", "youtube_api"] (supadata first, youtube_api fallback)
+        strategy: "sequential", "hedged" or "race" (default: set_transcript_strategy,
+                  SCRAPER_TRANSCRIPT_STRATEGY, else sequential)
+        hedge_delay: Hedged mode: seconds before starting the next provider
 
     Returns:
         TranscriptResult from the first successful provider
@@ -227,29 +476,34 @@ def fetch_transcript(
         # Use only supadata
         fetch_transcript("dQw4w9WgXcQ", providers=["supadata"])
 
-        # Use only youtube_api
-        fetch_transcript("dQw4w9WgXcQ", providers=["youtube_api"])
+        # Start youtube_api too if supadata takes longer than 3 seconds
+        fetch_transcript("dQw4w9WgXcQ", strategy="hedged", hedge_delay=3)
     """
     if providers is None:
         providers = DEFAULT_PROVIDERS
+    strategy = strategy or _strategy
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown transcript strategy: {strategy}")
 
-    errors = []
-
+    known = []
     for provider in providers:
-        if provider not in PROVIDERS:
+        if provider in PROVIDERS:
+            known.append(provider)
+        else:
             logger.warning(f"[{video_id}] Unknown provider: {provider}")
-            continue
-
-        logger.debug(f"[{video_id}] Trying provider: {provider}")
-        result = PROVIDERS[provider](video_id)
 
-        if result.success:
-            logger.info(f"[{video_id}] Success with {provider} ({len(result.content)} chars)")
-            return result
+    errors: list[str] = []
+    result = None
+    if known:
+        if strategy == "sequential":
+            result = _fetch_sequential(video_id, known, errors)
+        else:
+            delay = 0.0 if strategy == "race" else (hedge_delay if hedge_delay is not None else _hedge_delay)
+            result = _fetch_hedged(video_id, provider_tracker.order(known), delay, errors)
 
-        if result.error:
-            logger.debug(f"[{video_id}] {provider} failed: {result.error}")
-            errors.append(f"{provider}: {result.error}")
+    if result is not None:
+        logger.info(f"[{video_id}] Success with {result.provider} ({len(result.content)} chars)")
+        return result
 
     # All providers failed
     logger.warning(f"[{video_id}] All providers failed: {'; '.join(errors)}")
@@ -0,0 +1,259 @@
+"""
+Batched Wikipedia resolution for people.
+
+Resolves person names to (wikipedia_url, image_url) with as few MediaWiki
+requests as possible:
+1. Exact-title lookup for up to 50 names per request (pipe-joined titles,
+   following redirects, with page images in the same response)
+2. A combined search + image request (generator=search) for names that have
+   no exact, non-disambiguation page
+
+Results, including misses, are persisted in a local SQLite cache so the same
+guest appearing across many videos is only looked up once.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import quote
+
+from dotenv import load_dotenv
+
+from .http_client import get_http_client
+from .retry import retrying
+
+load_dotenv()
+
+# Overridable so benchmarks can point lookups at a local stand-in
+API_URL = os.getenv("WIKIPEDIA_API_URL", "https://en.wikipedia.org/w/api.php")
+
+# MediaWiki allows at most 50 titles per query for regular clients
+TITLES_PER_REQUEST = 50
+
+THUMBNAIL_SIZE = 500
+
+# Misses are retried after this long (people get Wikipedia pages over time)
+NEGATIVE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+CACHE_DIR = Path(os.getenv("SCRAPER_CACHE_DIR", Path(__file__).parent.parent.parent / ".cache"))
+
+WikipediaResult = tuple[str | None, str | None]
+
+_db: sqlite3.Connection | None = None
+_db_lock = threading.Lock()
+
+
+# =============================================================================
+# Local cache
+# =============================================================================
+
+def _get_db() -> sqlite3.Connection:
+    """Get or create the SQLite cache connection."""
+    global _db
+
+    if _db is None:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _db = sqlite3.connect(CACHE_DIR / "wikipedia.sqlite", check_same_thread=False)
+        _db.execute(
+            """CREATE TABLE IF NOT EXISTS wikipedia_people (
+                name_key TEXT PRIMARY KEY,
+                wikipedia_url TEXT,
+                image_url TEXT,
+                resolved_at REAL NOT NULL
+            )"""
+        )
+        _db.commit()
+
+    return _db
+
+
+def _name_key(name: str) -> str:
+    return " ".join(name.split()).casefold()
+
+
+def _cache_get(names: list[str]) -> dict[str, WikipediaResult]:
+    """Look up cached results; expired negative entries are treated as missing."""
+    # Names that differ only in case or spacing share a cache entry
+    keys: dict[str, list[str]] = {}
+    for name in names:
+        keys.setdefault(_name_key(name), []).append(name)
+    found: dict[str, WikipediaResult] = {}
+    now = time.time()
+
+    with _db_lock:
+        db = _get_db()
+        key_list = list(keys)
+        for i in range(0, len(key_list), 500):
+            chunk = key_list[i:i + 500]
+            rows = db.execute(
+                f"SELECT name_key, wikipedia_url, image_url, resolved_at FROM wikipedia_people "
+                f"WHERE name_key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            ).fetchall()
+            for key, url, image, resolved_at in rows:
+                if url is None and now - resolved_at > NEGATIVE_TTL_SECONDS:
+                    continue
+                for name in keys[key]:
+                    found[name] = (url, image)
+
+    return found
+
+
+def _cache_put(results: dict[str, WikipediaResult]) -> None:
+    if not results:
+        return
+    now = time.time()
+    with _db_lock:
+        db = _get_db()
+        db.executemany(
+            "INSERT OR REPLACE INTO wikipedia_people VALUES (?, ?, ?, ?)",
+            [(_name_key(name), url, image, now) for name, (url, image) in results.items()],
+        )
+        db.commit()
+
+
+# =============================================================================
+# MediaWiki lookups
+# =============================================================================
+
+def _page_url(title: str) -> str:
+    return f"https://en.wikipedia.org/wiki/{quote(title.replace(' ', '_'))}"
+
+
+@retrying("wikipedia")
+def _lookup_titles(names: list[str]) -> dict[str, WikipediaResult]:
+    """
+    Exact-title lookup for a batch of names in one request.
+
+    Returns results only for names with an existing, non-disambiguation page.
+    """
+    response = get_http_client().get(
+        API_URL,
+        params={
+            "action": "query",
+            "titles": "|".join(names),
+            "redirects": 1,
+            "prop": "pageimages|pageprops",
+            "ppprop": "disambiguation",
+            "pithumbsize": THUMBNAIL_SIZE,
+            "pilimit": TITLES_PER_REQUEST,
+            "format": "json",
+            "formatversion": 2,
+        },
+    )
+    response.raise_for_status()
+    query = response.json().get("query", {})
+
+    # Follow normalisation (case, underscores) and redirects back to the input name
+    aliases: dict[str, str] = {}
+    for mapping in query.get("normalized", []) + query.get("redirects", []):
+        aliases[mapping["from"]] = mapping["to"]
+
+    pages = {
+        page["title"]: page
+        for page in query.get("pages", [])
+        if not page.get("missing") and not page.get("invalid")
+        and "disambiguation" not in page.get("pageprops", {})
+    }
+
+    results: dict[str, WikipediaResult] = {}
+    for name in names:
+        title = name
+        for _ in range(3):  # normalized -> redirect -> (redirect)
+            if title in pages or title not in aliases:
+                break
+            title = aliases[title]
+        page = pages.get(title)
+        if page:
+            results[name] = (_page_url(page["title"]), page.get("thumbnail", {}).get("source"))
+
+    return results
+
+
+@retrying("wikipedia")
+def _search_one(name: str) -> WikipediaResult:
+    """Full-text search with the page image in the same request."""
+    response = get_http_client().get(
+        API_URL,
+        params={
+            "action": "query",
+            "generator": "search",
+            "gsrsearch": name,
+            "gsrlimit": 1,
+            "prop": "pageimages",
+            "pithumbsize": THUMBNAIL_SIZE,
+            "format": "json",
+            "formatversion": 2,
+        },
+    )
+    response.raise_for_status()
+    pages = response.json().get("query", {}).get("pages", [])
+
+    if not pages:
+        return None, None
+
+    page = min(pages, key=lambda p: p.get("index", 0))
+    return _page_url(page["title"]), page.get("thumbnail", {}).get("source")
+
+
+def resolve_wikipedia_batch(
+    names: list[str],
+    verbose: bool = False,
+    max_workers: int = 1,
+) -> dict[str, WikipediaResult]:
+    """
+    Resolve many names to (wikipedia_url, image_url).
+
+    Args:
+        names: Person names (duplicates are looked up once)
+        verbose: Print lookup failures
+        max_workers: Concurrent MediaWiki requests (title batches and searches)
+
+    Returns:
+        Dict mapping each input name to (wikipedia_url, image_url); both are
+        None for names with no page. Names whose lookup failed (network
+        errors) map to (None, None) but are not cached.
+    """
+    unique = list(dict.fromkeys(n.strip() for n in names if n and n.strip()))
+    results = _cache_get(unique)
+    pending = [n for n in unique if n not in results]
+
+    resolved: dict[str, WikipediaResult] = {}
+
+    def lookup_titles(batch: list[str]) -> dict[str, WikipediaResult]:
+        try:
+            return _lookup_titles(batch)
+        except Exception as e:
+            if verbose:
+                print(f"    Wikipedia title lookup failed for {len(batch)} names: {e}")
+            return {}
+
+    def search_one(name: str) -> dict[str, WikipediaResult]:
+        try:
+            return {name: _search_one(name)}
+        except Exception as e:
+            if verbose:
+                print(f"    Wikipedia search failed for {name}: {e}")
+            return {}
+
+    with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+        # 1. Exact titles, many per request
+        batches = [pending[i:i + TITLES_PER_REQUEST] for i in range(0, len(pending), TITLES_PER_REQUEST)]
+        for found in executor.map(lookup_titles, batches):
+            resolved.update(found)
+
+        # 2. Search for the rest, one combined request each
+        for found in executor.map(search_one, [n for n in pending if n not in resolved]):
+            resolved.update(found)
+
+    _cache_put(resolved)
+    results.update(resolved)
+
+    return {
+        name.strip(): results.get(name.strip(), (None, None))
+        for name in names
+        if name and name.strip()
+    }
@@ -0,0 +1,107 @@
+"""
+Chapter rows and chapter-based transcript chunking (scraper.chapters).
+
+Run from packages/scraper:
+    uv run python -m unittest discover -s tests
+"""
+
+import unittest
+
+from scraper.chapters import MIN_CHUNK_CHARS, _snap, _split, chunk_transcript, normalize_chapters
+
+SENTENCE = "This is one sentence of the episode. "
+
+
+def transcript(chars: int) -> str:
+    return (SENTENCE * (chars // len(SENTENCE) + 1))[:chars].strip()
+
+
+class NormalizeChaptersTest(unittest.TestCase):
+    def test_end_times_from_next_start_and_duration(self):
+        rows = normalize_chapters([
+            {"start_time": 300.0, "title": " Guest story "},
+            {"start_time": 0.0, "end_time": 300.0, "title": ""},
+        ], 600.4)
+        self.assertEqual(rows, [
+            {"title": "Chapter 1", "start_seconds": 0, "end_seconds": 300, "display_order": 0},
+            {"title": "Guest story", "start_seconds": 300, "end_seconds": 600, "display_order": 1},
+        ])
+
+    def test_chapters_past_duration_are_dropped(self):
+        rows = normalize_chapters([
+            {"start_time": 0.0, "title": "Intro"},
+            {"start_time": 500.0, "title": "Main"},
+            {"start_time": 700.0, "end_time": 800.0, "title": "Outro"},
+        ], 600)
+        self.assertEqual([r["title"] for r in rows], ["Intro", "Main"])
+        self.assertEqual(rows[-1]["end_seconds"], 600)
+
+
+class SnapTest(unittest.TestCase):
+    def test_prefers_sentence_end(self):
+        text = "First sentence here. Second one follows"
+        self.assertEqual(_snap(text, 17), text.index("Second"))
+
+    def test_falls_back_to_space(self):
+        text = "no sentence ends anywhere in this text"
+        self.assertEqual(_snap(text, 13), text.index("ends"))
+
+    def test_clamps_to_text(self):
+        self.assertEqual(_snap("short", -5), 0)
+        self.assertEqual(_snap("short", 99), 5)
+
+
+class SplitTest(unittest.TestCase):
+    def test_parts_fit_and_times_are_proportional(self):
+        chunk = {"title": "Main", "start_seconds": 100, "end_seconds": 400, "text": transcript(10000)}
+        parts = _split(chunk, 4000)
+
+        self.assertEqual([p["title"] for p in parts], ["Main (part 1)", "Main (part 2)", "Main (part 3)"])
+        self.assertTrue(all(len(p["text"]) <= 4000 for p in parts))
+        self.assertEqual(parts[0]["start_seconds"], 100)
+        self.assertEqual(parts[-1]["end_seconds"], 400)
+        self.assertTrue(all(a["end_seconds"] == b["start_seconds"] for a, b in zip(parts, parts[1:])))
+
+    def test_short_chunk_is_kept(self):
+        chunk = {"title": "Main", "start_seconds": None, "end_seconds": None, "text": "Hello."}
+        self.assertEqual(_split(chunk, 4000), [chunk])
+
+
+class ChunkTranscriptTest(unittest.TestCase):
+    def test_no_chapters_gives_even_parts(self):
+        chunks = chunk_transcript(transcript(10000), None, 600, max_chars=4000)
+        self.assertEqual([c["title"] for c in chunks], ["Part 1", "Part 2", "Part 3"])
+        self.assertEqual(chunk_transcript(transcript(100), None, None)[0]["title"], "Full transcript")
+
+    def test_first_chapter_after_zero_keeps_the_intro(self):
+        text = transcript(3 * MIN_CHUNK_CHARS)
+        rows = normalize_chapters([{"start_time": 60.0, "title": "Main"}, {"start_time": 300.0, "title": "End"}], 600)
+        chunks = chunk_transcript(text, rows, 600)
+
+        self.assertEqual([c["title"] for c in chunks], ["Main", "End"])
+        self.assertEqual(chunks[0]["start_seconds"], 60)
+        self.assertTrue(text.startswith(chunks[0]["text"]))
+        self.assertEqual(len(" ".join(c["text"] for c in chunks)), len(text))
+
+    def test_chapters_past_duration_add_no_chunks(self):
+        rows = normalize_chapters([
+            {"start_time": 0.0, "title": "Intro"},
+            {"start_time": 300.0, "title": "Main"},
+            {"start_time": 900.0, "title": "Stale"},
+        ], 600)
+        chunks = chunk_transcript(transcript(3 * MIN_CHUNK_CHARS), rows, 600)
+        self.assertEqual([(c["title"], c["end_seconds"]) for c in chunks], [("Intro", 300), ("Main", 600)])
+
+    def test_all_short_chapters_merge_into_one(self):
+        rows = normalize_chapters([{"start_time": float(s), "title": f"C{s}"} for s in range(0, 600, 100)], 600)
+        text = transcript(MIN_CHUNK_CHARS)
+        chunks = chunk_transcript(text, rows, 600)
+
+        self.assertEqual(len(chunks), 1)
+        self.assertEqual(chunks[0]["title"], " / ".join(f"C{s}" for s in range(0, 600, 100)))
+        self.assertEqual((chunks[0]["start_seconds"], chunks[0]["end_seconds"]), (0, 600))
+        self.assertEqual(len(chunks[0]["text"]), len(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Feed fast path against the local stand-in feed server (scraper.standins).
+
+Run from packages/scraper:
+    uv run python -m unittest discover -s tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from scraper import bench, feed
+from scraper.filters import VideoFilter
+from scraper.standins import BenchFixtures, StandinServer
+
+
+class FeedTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.fixtures = BenchFixtures()
+        cls.server = StandinServer(cls.fixtures).start()
+        cls.server.faults["youtube_feed"].latency = 0.0
+        cls.channel_id = cls.fixtures.channel_id
+        cls.feed_ids = [v["id"] for v in cls.fixtures.videos[:feed.FEED_MAX_ENTRIES]]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self._cache = tempfile.TemporaryDirectory()
+        bench.configure(self.server, Path(self._cache.name))
+        self.server.faults["youtube_feed"].error_rate = 0.0
+        self.server.reset_counts()
+
+    def tearDown(self):
+        if feed._db is not None:
+            feed._db.close()
+            feed._db = None
+        self._cache.cleanup()
+
+    def test_conditional_get(self):
+        first = feed.fetch_channel_feed(self.channel_id)
+        self.assertTrue(first.success)
+        self.assertFalse(first.not_modified)
+        self.assertEqual([e["id"] for e in first.entries], self.feed_ids)
+
+        second = feed.fetch_channel_feed(self.channel_id)
+        self.assertTrue(second.not_modified)
+        self.assertEqual(second.entries, first.entries)
+
+    def test_no_new_videos(self):
+        known = set(self.feed_ids)
+        self.assertFalse(feed.feed_has_new_videos(self.channel_id, known))
+        # Unchanged feed: a 304, still nothing new
+        self.assertFalse(feed.feed_has_new_videos(self.channel_id, known))
+
+    def test_unseen_video(self):
+        known = set(self.feed_ids[1:])
+        self.assertTrue(feed.feed_has_new_videos(self.channel_id, known))
+
+    def test_overflow(self):
+        self.assertTrue(feed.feed_has_new_videos(self.channel_id, set()))
+
+    def test_feed_error_falls_back_to_listing(self):
+        self.server.faults["youtube_feed"].error_rate = 1.0
+        self.assertTrue(feed.feed_has_new_videos(self.channel_id, set(self.feed_ids)))
+
+    def test_rejected_upload_is_not_new(self):
+        short = {"id": self.feed_ids[0], "title": "Clip", "duration": 60}
+        known = set(self.feed_ids[1:])
+
+        video_filter = VideoFilter()
+        self.assertEqual(video_filter.apply([short], "listing"), [])
+        feed.save_rejected(video_filter)
+        self.assertFalse(feed.feed_has_new_videos(self.channel_id, known, video_filter))
+
+        # A later run (fresh filter) remembers it too
+        self.assertFalse(feed.feed_has_new_videos(self.channel_id, known, VideoFilter()))
+
+        # Another filter spec doesn't reuse the verdict
+        self.assertTrue(feed.feed_has_new_videos(self.channel_id, known, VideoFilter(min_duration=30)))
+
+    def test_upcoming_stream_is_not_remembered(self):
+        upcoming = {"id": self.feed_ids[0], "title": "Live", "duration": None, "live_status": "is_upcoming"}
+        video_filter = VideoFilter()
+        self.assertEqual(video_filter.apply([upcoming], "listing"), [])
+        feed.save_rejected(video_filter)
+        self.assertTrue(feed.feed_has_new_videos(self.channel_id, set(self.feed_ids[1:]), video_filter))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,29 @@
+"""
+Prometheus export of scraper metrics (scraper.metrics).
+
+Run from packages/scraper:
+    uv run python -m unittest discover -s tests
+"""
+
+import unittest
+
+from scraper import metrics
+
+
+class PrometheusTextTest(unittest.TestCase):
+    def setUp(self):
+        metrics.reset_metrics()
+
+    def tearDown(self):
+        metrics.reset_metrics()
+
+    def test_label_values_are_escaped(self):
+        metrics.count("errors", stage="scrape", error='bad "id"\\n\nretry')
+        self.assertIn(
+            'scraper_errors_total{error="bad \\"id\\"\\\\n\\nretry",stage="scrape"} 1',
+            metrics.prometheus_text(),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
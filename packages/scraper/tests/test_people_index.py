@@ -0,0 +1,107 @@
+"""
+Person identity resolution (scraper.people_index), in memory only.
+
+Run from packages/scraper:
+    uv run python -m unittest discover -s tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from scraper import bench, people_index
+from scraper.extract_people import link_resolved_people
+from scraper.people_index import PersonIndex, canonicalize_links
+from scraper.standins import BenchFixtures, StandinServer
+
+WIKI = "https://en.wikipedia.org/wiki/"
+
+
+class PersonIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.index = PersonIndex()
+        self.index.add({
+            "id": "p1", "name": "Andrew Huberman", "slug": "andrew-huberman",
+            "social_links": {"wikipedia": WIKI + "Andrew_Huberman"}, "aliases": [],
+        })
+        self.index.add({"id": "p2", "name": "John Smith", "slug": "john-smith", "social_links": {}, "aliases": []})
+
+    def test_normalised_name(self):
+        self.assertEqual(self.index.resolve("Dr. Andrew Huberman, PhD")["id"], "p1")
+
+    def test_core_name_needs_wikipedia(self):
+        self.assertIsNone(self.index.resolve("John Q. Smith"))
+        self.assertEqual(self.index.resolve("John Q. Smith", WIKI + "John_Smith_(author)")["id"], "p2")
+        self.assertIsNone(self.index.resolve("John Q. Smith", WIKI + "John_Quincy_Adams"))
+
+    def test_other_wikipedia_page_is_a_namesake(self):
+        self.assertIsNone(self.index.resolve("Andrew Huberman", WIKI + "Andrew_Huberman_(footballer)"))
+
+    def test_canonicalize_links_sets_person_id(self):
+        links = [
+            {"name": "Dr. Andrew Huberman", "video_id": "v1", "role": "guest"},
+            {"name": "Jane Doe", "video_id": "v1", "role": "guest"},
+            {"name": "Dr. Jane Doe", "video_id": "v2", "role": "guest"},
+        ]
+        aliases = canonicalize_links(links, self.index)
+
+        self.assertEqual(links[0]["person_id"], "p1")
+        self.assertEqual(links[0]["name"], "Dr. Andrew Huberman")
+        self.assertEqual(aliases, {})
+        # New names in one batch share a row
+        self.assertNotIn("person_id", links[1])
+        self.assertEqual(links[2]["name"], "Jane Doe")
+
+    def test_variant_becomes_alias(self):
+        links = [{"name": "Andrew D. Huberman", "wikipedia_url": WIKI + "Andrew_Huberman", "video_id": "v1", "role": "guest"}]
+        self.assertEqual(canonicalize_links(links, self.index), {"p1": ["Andrew D. Huberman"]})
+        self.assertEqual(links[0]["person_id"], "p1")
+
+
+class LinkResolvedPeopleTest(unittest.TestCase):
+    """link_resolved_people against the local PostgREST stand-in."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandinServer(BenchFixtures()).start()
+        cls.server.faults["postgrest"].latency = 0.0
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self._cache = tempfile.TemporaryDirectory()
+        bench.configure(self.server, Path(self._cache.name))
+        people_index._index = None
+        self.people = self.server.db.rows("people")
+        self.people.append({
+            "id": "p1", "name": "Jane Doe", "slug": "jane-doe",
+            "social_links": {"website": "https://janedoe.example"}, "photo_url": None, "aliases": [],
+        })
+
+    def tearDown(self):
+        self.people.clear()
+        self.server.db.rows("video_people").clear()
+        people_index._index = None
+        self._cache.cleanup()
+
+    def test_matched_person_gets_missing_links(self):
+        results = link_resolved_people([{
+            "name": "Dr. Jane Doe",
+            "wikipedia_url": WIKI + "Jane_Doe",
+            "website_url": "https://other.example",
+            "photo_url": "https://img.example/jane.jpg",
+            "video_id": "v1",
+            "role": "guest",
+        }], verbose=False)
+
+        self.assertEqual(len(self.people), 1)
+        person = self.people[0]
+        self.assertEqual(person["social_links"], {"website": "https://janedoe.example", "wikipedia": WIKI + "Jane_Doe"})
+        self.assertEqual(person["photo_url"], "https://img.example/jane.jpg")
+        self.assertEqual(results[0]["person"]["social_links"]["wikipedia"], WIKI + "Jane_Doe")
+
+
+if __name__ == "__main__":
+    unittest.main()
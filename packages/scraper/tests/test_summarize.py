@@ -0,0 +1,74 @@
+"""
+Stale summary planning (scraper.summarize) against the local PostgREST stand-in.
+
+Run from packages/scraper:
+    uv run python -m unittest discover -s tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from scraper import bench, summarize
+from scraper.db import transcript_hash
+from scraper.standins import BenchFixtures, StandinServer
+
+TRANSCRIPT = "Welcome back to the show."
+
+
+class PlanStaleSummariesTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = StandinServer(BenchFixtures()).start()
+        cls.server.faults["postgrest"].latency = 0.0
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self._cache = tempfile.TemporaryDirectory()
+        bench.configure(self.server, Path(self._cache.name))
+        self.videos = self.server.db.rows("videos")
+        self._saved = list(self.videos)
+        self.videos.clear()
+
+        version = summarize.prompt_version()
+        sha = transcript_hash(TRANSCRIPT)
+        summarized = {
+            "summary": "## Summary", "has_transcript": True, "transcript": TRANSCRIPT,
+            "transcript_sha256": sha, "summary_transcript_sha256": sha,
+        }
+        self.server.db.insert("videos", [
+            {**summarized, "external_id": "current", "published_at": "2026-10-03T00:00:00Z",
+             "summary_prompt_version": version, "summary_model": summarize.OPENAI_MODEL},
+            {**summarized, "external_id": "old-prompt", "published_at": "2026-10-02T00:00:00Z",
+             "summary_prompt_version": "0" * 16, "summary_model": summarize.OPENAI_MODEL},
+            {**summarized, "external_id": "manual", "published_at": "2026-10-01T00:00:00Z",
+             "summary_prompt_version": "0" * 16, "summary_model": summarize.MANUAL_MODEL},
+        ])
+
+    def tearDown(self):
+        self.videos[:] = self._saved
+        self._cache.cleanup()
+
+    def _plan(self) -> dict[str, str]:
+        return {v["external_id"]: v["stale_reason"] for v in summarize.plan_stale_summaries()}
+
+    def test_old_prompt_is_stale(self):
+        self.assertEqual(self._plan(), {"old-prompt": "prompt"})
+
+    def test_prompt_edit_marks_summaries_stale(self):
+        with mock.patch.object(summarize, "SYSTEM_PROMPT", summarize.SYSTEM_PROMPT + "\nBe brief."):
+            self.assertEqual(self._plan(), {"current": "prompt", "old-prompt": "prompt"})
+
+    def test_changed_transcript_is_stale(self):
+        current = next(v for v in self.videos if v["external_id"] == "current")
+        changed = {"transcript_sha256": transcript_hash("New transcript.")}
+        self.server.db.update("videos", [("id", f"eq.{current['id']}")], changed)
+        self.assertEqual(self._plan(), {"current": "transcript", "old-prompt": "prompt"})
+
+
+if __name__ == "__main__":
+    unittest.main()
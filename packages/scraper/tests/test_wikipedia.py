@@ -0,0 +1,35 @@
+"""
+Wikipedia lookup cache (scraper.wikipedia), on a temporary SQLite file.
+
+Run from packages/scraper:
+    uv run python -m unittest discover -s tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from scraper import wikipedia
+
+URL = "https://en.wikipedia.org/wiki/Jane_Doe"
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self._cache = tempfile.TemporaryDirectory()
+        wikipedia.CACHE_DIR = Path(self._cache.name)
+        wikipedia._db = None
+
+    def tearDown(self):
+        wikipedia._db.close()
+        wikipedia._db = None
+        self._cache.cleanup()
+
+    def test_names_differing_in_case_share_an_entry(self):
+        wikipedia._cache_put({"Jane Doe": (URL, None)})
+        found = wikipedia._cache_get(["Jane Doe", "jane doe", "JANE  DOE", "John Doe"])
+        self.assertEqual(found, {"Jane Doe": (URL, None), "jane doe": (URL, None), "JANE  DOE": (URL, None)})
+
+
+if __name__ == "__main__":
+    unittest.main()
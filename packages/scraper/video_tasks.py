@@ -27,36 +27,56 @@ Usage:
 import sys
 import json
 import argparse
-import time
 from pathlib import Path
 from datetime import datetime, timezone
-from src.scraper.db import get_client
+from src.scraper.circuit import CircuitOpenError
+from src.scraper.db import (
+    get_client,
+    get_video_transcript,
+    replace_video_chapters,
+    update_video_transcript,
+)
 from src.scraper.transcript import fetch_transcript
 from src.scraper.channel import get_channel_video_ids, get_video_metadata
+from src.scraper.chapters import normalize_chapters
+from src.scraper.feed import feed_has_new_videos, save_rejected
+from src.scraper.filters import VideoFilter
+from src.scraper.retry import RetryableError, call_with_retry
+from src.scraper.summarize import MANUAL_MODEL
 
 
-def fetch_metadata_with_retry(video_id: str, max_retries: int = 3, base_delay: float = 1.0) -> dict | None:
-    """Fetch video metadata with exponential backoff retry."""
-    for attempt in range(max_retries):
-        try:
-            metadata = get_video_metadata(video_id)
-            # Check if we got meaningful data (thumbnail is a good indicator)
-            if metadata.get("thumbnail"):
-                return metadata
-            # If no thumbnail, treat as partial failure and retry
-            if attempt < max_retries - 1:
-                delay = base_delay * (2 ** attempt)
-                print(f"    ⚠ metadata incomplete, retrying in {delay}s...")
-                time.sleep(delay)
-        except Exception as e:
-            if attempt < max_retries - 1:
-                delay = base_delay * (2 ** attempt)
-                print(f"    ⚠ metadata failed ({e}), retrying in {delay}s...")
-                time.sleep(delay)
-            else:
-                print(f"    ✗ metadata failed after {max_retries} attempts: {e}")
-                return None
-    return metadata if 'metadata' in dir() else None
+def fetch_metadata_with_retry(video_id: str) -> dict | None:
+    """
+    Fetch video metadata, retrying incomplete results.
+
+    Throttling is already retried inside get_video_metadata; an incomplete
+    result (no thumbnail) is retried here under the same "youtube" policy,
+    so both share its backoff and retry budget. If YouTube is still
+    throttling after the inner retries the video is skipped (None) without
+    retrying again; if results stay incomplete, the last one is returned.
+    """
+    last: dict[str, dict] = {}
+
+    def attempt() -> dict:
+        metadata = get_video_metadata(video_id, raise_throttled=True)
+        # Check if we got meaningful data (thumbnail is a good indicator)
+        if not metadata.get("thumbnail"):
+            last["metadata"] = metadata
+            raise RetryableError("metadata incomplete", reason="incomplete")
+        return metadata
+
+    try:
+        return call_with_retry(attempt, "youtube")
+    except CircuitOpenError as e:
+        print(f"    ○ metadata deferred: {e}")
+    except RetryableError as e:
+        if e.reason == "incomplete":
+            print(f"    ⚠ metadata still incomplete, saving what we have")
+            return last["metadata"]
+        print(f"    ✗ metadata failed: {e}")
+    except Exception as e:
+        print(f"    ✗ metadata failed: {e}")
+    return None
 
 
 def get_status():
@@ -70,7 +90,7 @@ def get_status():
     with_transcript = (
         client.table("videos")
         .select("id", count="exact")
-        .not_.is_("transcript", "null")
+        .eq("has_transcript", True)
         .execute()
     )
 
@@ -78,7 +98,7 @@ def get_status():
     without_transcript = (
         client.table("videos")
         .select("id", count="exact")
-        .is_("transcript", "null")
+        .eq("has_transcript", False)
         .execute()
     )
 
@@ -94,7 +114,7 @@ def get_status():
     needs_summary = (
         client.table("videos")
         .select("id", count="exact")
-        .not_.is_("transcript", "null")
+        .eq("has_transcript", True)
         .is_("summary", "null")
         .execute()
     )
@@ -118,7 +138,7 @@ def get_next_transcript():
     result = (
         client.table("videos")
         .select("id, external_id, title, url")
-        .is_("transcript", "null")
+        .eq("has_transcript", False)
         .order("published_at", desc=True)
         .limit(1)
         .execute()
@@ -168,12 +188,7 @@ def fetch_and_save_transcript(video_id: str):
         return False
 
     # Save to database
-    client.table("videos").update({
-        "transcript": transcript_result.content,
-        "transcript_language": transcript_result.language or "en",
-        "has_transcript": True,
-        "transcript_scraped_at": datetime.now(timezone.utc).isoformat(),
-    }).eq("id", video_id).execute()
+    update_video_transcript(video_id, transcript_result.content, transcript_result.language or "en")
 
     print(f"SUCCESS: Saved transcript ({len(transcript_result.content)} chars)")
     print(f"Provider: {transcript_result.provider}")
@@ -188,7 +203,7 @@ def fetch_all_transcripts(limit: int = 100):
     result = (
         client.table("videos")
         .select("id, external_id, title")
-        .is_("transcript", "null")
+        .eq("has_transcript", False)
         .order("published_at", desc=True)
         .limit(limit)
         .execute()
@@ -212,12 +227,7 @@ def fetch_all_transcripts(limit: int = 100):
 
         if transcript_result.success:
             # Save to database
-            client.table("videos").update({
-                "transcript": transcript_result.content,
-                "transcript_language": transcript_result.language or "en",
-                "has_transcript": True,
-                "transcript_scraped_at": datetime.now(timezone.utc).isoformat(),
-            }).eq("id", video['id']).execute()
+            update_video_transcript(video['id'], transcript_result.content, transcript_result.language or "en")
 
             print(f"  ✓ Saved ({len(transcript_result.content)} chars)")
             success_count += 1
@@ -237,8 +247,8 @@ def get_next_summary():
 
     result = (
         client.table("videos")
-        .select("id, title, transcript")
-        .not_.is_("transcript", "null")
+        .select("id, title")
+        .eq("has_transcript", True)
         .is_("summary", "null")
         .limit(1)
         .execute()
@@ -249,7 +259,7 @@ def get_next_summary():
         print("All videos with transcripts have summaries!")
         return None
 
-    video = result.data[0]
+    video = {**result.data[0], "transcript": get_video_transcript(result.data[0]["id"]) or ""}
     print(f"VIDEO_ID: {video['id']}")
     print(f"TITLE: {video['title']}")
     print(f"TRANSCRIPT_LENGTH: {len(video['transcript'])} chars")
@@ -266,7 +276,7 @@ def list_pending_summaries(limit: int = 5):
     result = (
         client.table("videos")
         .select("id, title, external_id, duration_seconds")
-        .not_.is_("transcript", "null")
+        .eq("has_transcript", True)
         .is_("summary", "null")
         .order("published_at", desc=True)
         .limit(limit)
@@ -294,7 +304,7 @@ def get_transcript(video_id: str):
 
     result = (
         client.table("videos")
-        .select("id, title, transcript")
+        .select("id, title")
         .eq("id", video_id)
         .limit(1)
         .execute()
@@ -304,7 +314,7 @@ def get_transcript(video_id: str):
         print(f"ERROR: Video {video_id} not found")
         return None
 
-    video = result.data[0]
+    video = {**result.data[0], "transcript": get_video_transcript(video_id)}
     if not video.get('transcript'):
         print(f"ERROR: Video {video_id} has no transcript")
         return None
@@ -325,6 +335,10 @@ def save_summary(video_id: str, summary: str):
     client.table("videos").update({
         "summary": summary,
         "summary_generated_at": datetime.now(timezone.utc).isoformat(),
+        # Written by hand: never replaced by summarize --refresh
+        "summary_model": MANUAL_MODEL,
+        "summary_prompt_version": None,
+        "summary_transcript_sha256": None,
     }).eq("id", video_id).execute()
 
     print(f"Saved summary for video {video_id} ({len(summary)} chars)")
@@ -348,14 +362,16 @@ def sync_new_videos(limit_per_channel: int = 20, new_channel_limit: int = 10):
         channels = json.load(f)
 
     # Get all sources with their latest video date
-    sources_result = client.table("sources").select("id, handle").execute()
+    sources_result = client.table("sources").select("id, handle, youtube_channel_id").execute()
     source_by_handle = {s["handle"]: s["id"] for s in sources_result.data}
+    channel_id_by_handle = {s["handle"]: s.get("youtube_channel_id") for s in sources_result.data}
 
     print(f"=== SYNC NEW VIDEOS ===")
     print(f"Channels: {len(channels)}")
     print()
 
-    MIN_DURATION_SECONDS = 20 * 60  # 20 minutes minimum
+    # >= 20 min, not live/upcoming, no shorts; checked as early as the data allows
+    video_filter = VideoFilter()
 
     total_new = 0
     total_transcripts = 0
@@ -391,6 +407,13 @@ def sync_new_videos(limit_per_channel: int = 20, new_channel_limit: int = 10):
 
         channel_url = f"https://www.youtube.com/{channel_handle}"
 
+        # Fast path: skip the yt-dlp listing when the Atom feed shows nothing new
+        youtube_channel_id = channel_id_by_handle.get(channel_handle)
+        if not is_new_channel and youtube_channel_id:
+            if not feed_has_new_videos(youtube_channel_id, existing_ids, video_filter):
+                print("  0 new (feed)")
+                continue
+
         try:
             # Get video list from YouTube
             _, videos = get_channel_video_ids(channel_url)
@@ -399,8 +422,9 @@ def sync_new_videos(limit_per_channel: int = 20, new_channel_limit: int = 10):
                 print("  No videos found")
                 continue
 
-            # Filter: duration >= 20 min
-            videos = [v for v in videos if (v.get("duration") or 0) >= MIN_DURATION_SECONDS]
+            # Filter on listing data (duration, live status, title) before any enrichment
+            videos = video_filter.apply(videos, "listing")
+            save_rejected(video_filter)
 
             # Find new videos: iterate in order (newest first from YouTube) and stop
             # when we hit an existing video. This ensures we only get truly NEW videos,
@@ -443,10 +467,10 @@ def sync_new_videos(limit_per_channel: int = 20, new_channel_limit: int = 10):
                     print(f"    ✗ skipping video due to metadata failure")
                     continue
 
-                # Skip live/upcoming videos (no transcript available)
-                live_status = video.get("live_status")
-                if live_status in ("is_live", "is_upcoming"):
-                    print(f"    - skipping: {live_status}")
+                # Skip live/upcoming videos (no transcript available) and anything
+                # else only detectable from full metadata
+                if not video_filter.accepts(video, "metadata"):
+                    print(f"    - skipping: {video_filter.rejection_reason(video)}")
                     continue
 
                 # Fetch transcript
@@ -487,16 +511,21 @@ def sync_new_videos(limit_per_channel: int = 20, new_channel_limit: int = 10):
                     db_video["published_at"] = f"{today}T00:00:00Z"
                     print(f"    ⚠ No upload_date from YouTube, using today: {today}")
 
-                # Add transcript if available
-                if video.get("transcript"):
-                    db_video["transcript"] = video["transcript"]
-                    db_video["transcript_language"] = video.get("transcript_language", "en")
-                    db_video["has_transcript"] = True
-                    db_video["transcript_scraped_at"] = now
+                inserted = client.table("videos").insert(db_video).execute()
 
-                client.table("videos").insert(db_video).execute()
+                # Add transcript if available (with its hash and length, see scraper.db)
+                if video.get("transcript"):
+                    update_video_transcript(
+                        inserted.data[0]["id"], video["transcript"], video.get("transcript_language") or "en"
+                    )
+                if video.get("chapters"):
+                    chapters = normalize_chapters(video["chapters"], video.get("duration"))
+                    replace_video_chapters({inserted.data[0]["id"]: chapters})
+                    print(f"    ✓ {len(chapters)} chapters")
                 total_new += 1
 
+            save_rejected(video_filter)
+
         except Exception as e:
             print(f"  ERROR: {e}")
 
@@ -504,6 +533,10 @@ def sync_new_videos(limit_per_channel: int = 20, new_channel_limit: int = 10):
     print(f"=== COMPLETE ===")
     print(f"New videos added: {total_new}")
     print(f"Transcripts fetched: {total_transcripts}")
+    if video_filter.total_rejections:
+        print(f"Filtered out (no metadata/transcript fetched): {video_filter.total_rejections}")
+        for line in video_filter.summary():
+            print(f"  - {line}")
 
 
 def fix_missing_dates():